@@ -2,25 +2,57 @@
 
 from __future__ import annotations
 
-import json
+import contextlib
+import hashlib
 import logging
+import random
+import socket
+import sys
+import threading
 import time
-from typing import Any, Generator
+from collections import OrderedDict, deque
+from contextlib import AbstractContextManager
+from typing import Any, Generator, Iterable
 
 import requests
-from tqdm import tqdm
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 
 from grok_mccodin.config import Config
+from grok_mccodin.utils import json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 
 # Status codes that trigger automatic retry
 _RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
-# Retry configuration
-_MAX_RETRIES = 3
+# Retry configuration (attempt count comes from Config.max_retries)
 _BASE_DELAY = 1.0  # seconds
 _BACKOFF_FACTOR = 2.0
+_MAX_DELAY = 60.0  # ceiling for any single retry wait
+
+# Adaptive concurrency (AIMD) and rate-limit configuration
+_MIN_CONCURRENCY = 1
+_MAX_CONCURRENCY = 4
+_TARGET_LATENCY = 30.0  # seconds; slower successes don't grow the window
+_RATE_WINDOW = 60.0  # seconds covered by the requests-per-minute counter
+_LOW_QUOTA_RATIO = 0.1  # pre-pause when less than 10% of the quota remains
+
+# Keep-alive connections held per host — enough for a streaming reply plus
+# concurrent blocking calls without queueing behind one socket.
+_POOL_CONNECTIONS = 4
+_POOL_MAXSIZE = 16
+
+# Connecting should be quick; only the read side waits on generation
+_CONNECT_TIMEOUT = 5.0
+
+# No Nagle delay on small POST bodies; OS keepalive probes so idle pooled
+# connections aren't silently dropped by middleboxes between turns.
+_SOCKET_OPTIONS = [
+    *HTTPConnection.default_socket_options,
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
 
 # System prompt that instructs Grok to behave as a coding assistant
 SYSTEM_PROMPT = (
@@ -43,6 +75,226 @@ SYSTEM_PROMPT = (
     "When suggesting actions, you can reference these tools."
 )
 
+# Shared by every build_messages() call — treat as read-only
+_SYSTEM_MESSAGE: dict[str, str] = {"role": "system", "content": SYSTEM_PROMPT}
+
+
+def _spinner(desc: str) -> AbstractContextManager[Any]:
+    """Return a tqdm spinner on an interactive stderr, or a no-op context otherwise.
+
+    tqdm is imported lazily so headless runs never pay for it.
+    """
+    if sys.stderr is None or not sys.stderr.isatty():
+        return contextlib.nullcontext()
+    from tqdm import tqdm
+
+    bar: AbstractContextManager[Any] = tqdm(total=0, desc=desc, bar_format="{desc}...", leave=False)
+    return bar
+
+
+def _fingerprint(payload: dict[str, Any]) -> str:
+    """Return a stable cache key for a request payload."""
+    return hashlib.blake2b(json_dumps(payload, sort_keys=True), digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe LRU cache with per-entry TTL for chat replies.
+
+    Only successful (HTTP 200) replies are stored.  A *default_ttl* of 0
+    disables caching entirely.  With a non-zero *stale_ttl*, entries stay
+    servable for that long after they expire so callers can return them
+    immediately and revalidate in the background (stale-while-revalidate).
+    """
+
+    def __init__(
+        self, max_size: int = 128, default_ttl: float = 300.0, stale_ttl: float = 0.0
+    ) -> None:
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        # key -> (value, fresh_until, stale_until)
+        self._entries: OrderedDict[str, tuple[str, float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.default_ttl > 0 and self.max_size > 0
+
+    def lookup(self, key: str) -> tuple[str | None, bool]:
+        """Return ``(value, is_stale)``; value is None if missing or past the stale window."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            value, fresh_until, stale_until = entry
+            now = time.monotonic()
+            if now >= stale_until:
+                del self._entries[key]
+                return None, False
+            self._entries.move_to_end(key)
+            return value, now >= fresh_until
+
+    def get(self, key: str) -> str | None:
+        """Return the cached value for *key*, or None if missing/expired."""
+        value, stale = self.lookup(key)
+        return None if stale else value
+
+    def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        """Store *value* under *key*, evicting the least recently used entry."""
+        if not self.enabled:
+            return
+        fresh_until = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, fresh_until, fresh_until + self.stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_SSE_DATA_PREFIX = b"data:"
+_UTF8_BOM = b"\xef\xbb\xbf"
+_SSE_CHUNK_SIZE = 8192
+
+
+def _iter_sse_data(chunks: Iterable[bytes]) -> Generator[bytes, None, None]:
+    """Yield the payload of every SSE ``data:`` line in a raw byte stream.
+
+    Lines are split on raw bytes and carried across chunk boundaries in a
+    single reusable buffer, so nothing is decoded until the payload reaches
+    the JSON parser.  Handles CRLF line endings and a leading UTF-8 BOM.
+    """
+    buf = bytearray()
+    at_start = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buf += chunk
+        if at_start:
+            if len(buf) < len(_UTF8_BOM) and _UTF8_BOM.startswith(buf):
+                continue  # Not enough bytes yet to rule out a BOM
+            if buf.startswith(_UTF8_BOM):
+                del buf[: len(_UTF8_BOM)]
+            at_start = False
+
+        start = 0
+        while (end := buf.find(b"\n", start)) != -1:
+            if buf.startswith(_SSE_DATA_PREFIX, start):
+                yield _sse_payload(buf[start + len(_SSE_DATA_PREFIX) : end])
+            start = end + 1
+        if start:
+            del buf[:start]
+
+    # Stream ended without a trailing newline
+    if buf.startswith(_SSE_DATA_PREFIX):
+        yield _sse_payload(buf[len(_SSE_DATA_PREFIX) :])
+
+
+def _sse_payload(field: bytearray) -> bytes:
+    """Strip the optional leading space and trailing CR from an SSE field value."""
+    if field.endswith(b"\r"):
+        del field[-1:]
+    if field.startswith(b" "):
+        del field[:1]
+    return bytes(field)
+
+
+def _header_float(headers: Any, name: str) -> float | None:
+    """Parse a numeric response header, returning None if absent or malformed."""
+    value = headers.get(name)
+    if not isinstance(value, str):
+        return None
+    try:
+        return float(value.strip().rstrip("s"))
+    except ValueError:
+        return None
+
+
+class _AdaptiveLimiter:
+    """AIMD concurrency window plus a sliding-window requests-per-minute cap.
+
+    The window halves on 429/5xx/transport errors and grows by 0.5 on fast
+    successes, so sustained throttling collapses to one request at a time.
+    Retry-After and ``x-ratelimit-*`` headers pause all new requests.
+    """
+
+    def __init__(self, max_concurrency: int = _MAX_CONCURRENCY, rpm: int = 0) -> None:
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(max_concurrency)
+        self.rpm = rpm
+        self._in_flight = 0
+        self._timestamps: deque[float] = deque()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self, *, retry: bool = False) -> None:
+        """Block until a concurrency slot is free and the rate limit allows a request.
+
+        Retries skip the shared header-driven pause — the retry loop has
+        already slept for at least the server's Retry-After.
+        """
+        with self._cond:
+            while self._in_flight >= max(_MIN_CONCURRENCY, int(self.concurrency)):
+                self._cond.wait()
+            self._in_flight += 1
+        self._wait_if_throttled(honor_pause=not retry)
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def _wait_if_throttled(self, honor_pause: bool = True) -> None:
+        with self._cond:
+            now = time.monotonic()
+            while self._timestamps and now - self._timestamps[0] >= _RATE_WINDOW:
+                self._timestamps.popleft()
+            delay = self._paused_until - now if honor_pause else 0.0
+            if self.rpm and len(self._timestamps) >= self.rpm:
+                delay = max(delay, self._timestamps[0] + _RATE_WINDOW - now)
+            delay = max(delay, 0.0)
+            self._timestamps.append(now + delay)
+        if delay > 0:
+            logger.info("Client-side rate limit: pausing %.1fs", delay)
+            time.sleep(delay)
+
+    def record(self, status_code: int | None, latency: float, headers: Any = None) -> None:
+        """Adjust the window from a completed request (*status_code* None = transport error)."""
+        with self._cond:
+            if status_code is None or status_code in _RETRYABLE_STATUS_CODES:
+                self.concurrency = max(float(_MIN_CONCURRENCY), self.concurrency * 0.5)
+            elif latency <= _TARGET_LATENCY:
+                self.concurrency = min(float(self.max_concurrency), self.concurrency + 0.5)
+            if headers is not None:
+                self._apply_headers(headers)
+            self._cond.notify_all()
+
+    def _apply_headers(self, headers: Any) -> None:
+        now = time.monotonic()
+        retry_after = _header_float(headers, "Retry-After")
+        if retry_after is not None:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+        remaining = _header_float(headers, "x-ratelimit-remaining-requests")
+        limit = _header_float(headers, "x-ratelimit-limit-requests")
+        if remaining is not None and limit and remaining / limit < _LOW_QUOTA_RATIO:
+            reset = _header_float(headers, "x-ratelimit-reset-requests") or 1.0
+            self._paused_until = max(self._paused_until, now + reset)
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets use :data:`_SOCKET_OPTIONS`."""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault("socket_options", list(dict.fromkeys(_SOCKET_OPTIONS)))
+        super().init_poolmanager(*args, **kwargs)
+
 
 class GrokClient:
     """Thin wrapper around the xAI chat-completions endpoint."""
@@ -51,6 +303,17 @@ class GrokClient:
         self.config = config
         self.base_url = config.grok_base_url.rstrip("/")
         self.model = config.grok_model
+        self.cache = ResponseCache(default_ttl=config.cache_ttl, stale_ttl=config.cache_stale_ttl)
+        # In-flight identical requests: key -> Event set once the leader finishes
+        self._pending: dict[str, threading.Event] = {}
+        # Keys with a background stale-while-revalidate refresh running
+        self._refreshing: set[str] = set()
+        self._pending_lock = threading.Lock()
+        self._limiter = _AdaptiveLimiter(rpm=config.rate_limit_rpm)
+        # Set on a 429 and cleared on the next success; while set, retries
+        # from concurrent callers are serialized behind _ratelimit_lock
+        self._ratelimited = threading.Event()
+        self._ratelimit_lock = threading.Lock()
         self.session = requests.Session()
         self.session.headers.update(
             {
@@ -58,6 +321,16 @@ class GrokClient:
                 "Content-Type": "application/json",
             }
         )
+        # Retries are handled by _request_with_retry, not urllib3
+        adapter = _KeepAliveAdapter(
+            pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE, max_retries=0
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
 
     def _request_with_retry(
         self,
@@ -70,50 +343,94 @@ class GrokClient:
     ) -> requests.Response:
         """Execute an HTTP request with retry logic for transient errors.
 
-        Retries on 429/500/502/503/504 with exponential backoff.
-        Respects the Retry-After header for 429 responses.
+        Retries on 429/500/502/503/504 with full-jitter exponential backoff,
+        so concurrent clients don't retry in lockstep.  Respects the
+        Retry-After header on any retryable response.  Every attempt
+        passes through the adaptive limiter, which throttles concurrency
+        and request rate before the provider has to.  The payload is
+        serialized once and the same bytes are reused across retries.
         """
+        body = json_dumps(json_payload) if json_payload is not None else None
+        max_retries = max(0, self.config.max_retries)
         last_resp: requests.Response | None = None
-
-        for attempt in range(_MAX_RETRIES + 1):
-            resp = self.session.request(
-                method, url, json=json_payload, stream=stream, timeout=timeout
+        delay = 0.0
+
+        for attempt in range(max_retries + 1):
+            # While the endpoint is rate limiting us, concurrent callers retry
+            # one at a time (backoff + attempt) instead of all at once.
+            gate: AbstractContextManager[Any] = (
+                self._ratelimit_lock
+                if attempt and self._ratelimited.is_set()
+                else contextlib.nullcontext()
             )
+            with gate:
+                if delay:
+                    time.sleep(delay)
+                resp = self._send(
+                    method, url, body, stream=stream, timeout=timeout, retry=attempt > 0
+                )
 
-            if resp.status_code not in _RETRYABLE_STATUS_CODES:
+            if resp.status_code == 429:
+                self._ratelimited.set()
+            elif resp.status_code not in _RETRYABLE_STATUS_CODES:
+                self._ratelimited.clear()
                 return resp
 
             last_resp = resp
 
-            if attempt >= _MAX_RETRIES:
+            if attempt >= max_retries:
                 break
 
-            # Calculate delay
-            delay = _BASE_DELAY * (_BACKOFF_FACTOR**attempt)
+            # Release the connection back to the pool before retrying
+            resp.close()
 
-            # Respect Retry-After header for 429
-            if resp.status_code == 429:
-                retry_after = resp.headers.get("Retry-After")
-                if retry_after:
-                    try:
-                        delay = max(delay, float(retry_after))
-                    except ValueError:
-                        pass  # Non-numeric Retry-After; use calculated delay
+            # Full jitter: uniform over [0, exponential cap]
+            delay = random.uniform(0, _BASE_DELAY * (_BACKOFF_FACTOR**attempt))
+
+            # Non-numeric Retry-After values are ignored
+            retry_after = _header_float(resp.headers, "Retry-After")
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            delay = min(delay, _MAX_DELAY)
 
             logger.warning(
                 "Retryable error %d from %s (attempt %d/%d, retrying in %.1fs)",
                 resp.status_code,
                 url,
                 attempt + 1,
-                _MAX_RETRIES,
+                max_retries,
                 delay,
             )
-            time.sleep(delay)
 
         # All retries exhausted — return last response (caller will handle the error)
         assert last_resp is not None
         return last_resp
 
+    def _send(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None,
+        *,
+        stream: bool,
+        timeout: int,
+        retry: bool,
+    ) -> requests.Response:
+        """Issue one request through the adaptive limiter."""
+        self._limiter.acquire(retry=retry)
+        t0 = time.monotonic()
+        try:
+            resp = self.session.request(
+                method, url, data=body, stream=stream, timeout=(_CONNECT_TIMEOUT, timeout)
+            )
+        except requests.RequestException:
+            self._limiter.record(None, time.monotonic() - t0)
+            raise
+        finally:
+            self._limiter.release()
+        self._limiter.record(resp.status_code, time.monotonic() - t0, resp.headers)
+        return resp
+
     def chat(
         self,
         messages: list[dict[str, str]],
@@ -123,20 +440,85 @@ class GrokClient:
     ) -> str:
         """Send a chat completion request and return the assistant reply.
 
-        Shows a tqdm spinner while waiting for the API response.
+        Identical payloads are served from the response cache, and concurrent
+        identical requests share a single in-flight API call.
+        Shows a tqdm spinner while waiting when stderr is a terminal.
         """
-        url = f"{self.base_url}/chat/completions"
         payload: dict[str, Any] = {
             "model": self.model,
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
         }
+        if not self.cache.enabled:
+            return self._chat_uncached(payload)
+
+        key = _fingerprint(payload)
+        if not self.config.use_cache:
+            # Forced refresh: skip the lookup but keep the new reply
+            reply = self._chat_uncached(payload)
+            self.cache.set(key, reply)
+            return reply
+
+        cached, stale = self.cache.lookup(key)
+        if cached is not None:
+            if stale:
+                logger.debug("X-Cache: STALE %s", key)
+                self._revalidate(key, payload)
+            else:
+                logger.debug("X-Cache: HIT %s", key)
+            return cached
+
+        with self._pending_lock:
+            event = self._pending.get(key)
+            leader = event is None
+            if event is None:
+                event = self._pending[key] = threading.Event()
+
+        if not leader:
+            event.wait()
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug("X-Cache: HIT (coalesced) %s", key)
+                return cached
+            # The leader failed — issue our own request so the error surfaces here too
+            return self._chat_uncached(payload)
+
+        logger.debug("X-Cache: MISS %s", key)
+        try:
+            reply = self._chat_uncached(payload)
+            self.cache.set(key, reply)
+            return reply
+        finally:
+            with self._pending_lock:
+                del self._pending[key]
+            event.set()
+
+    def _revalidate(self, key: str, payload: dict[str, Any]) -> None:
+        """Refresh a stale cache entry in a background thread (one per key)."""
+        with self._pending_lock:
+            if key in self._refreshing or key in self._pending:
+                return
+            self._refreshing.add(key)
+        threading.Thread(target=self._refresh, args=(key, payload), daemon=True).start()
+
+    def _refresh(self, key: str, payload: dict[str, Any]) -> None:
+        try:
+            self.cache.set(key, self._chat_uncached(payload, show_spinner=False))
+            logger.debug("X-Cache: REFRESHED %s", key)
+        except (GrokAPIError, requests.RequestException) as exc:
+            # Keep serving the stale entry; the next lookup will try again
+            logger.debug("Background refresh failed for %s: %s", key, exc)
+        finally:
+            with self._pending_lock:
+                self._refreshing.discard(key)
+
+    def _chat_uncached(self, payload: dict[str, Any], *, show_spinner: bool = True) -> str:
+        """POST *payload* to the chat endpoint and return the reply text."""
+        url = f"{self.base_url}/chat/completions"
+        logger.debug("POST %s  model=%s  msgs=%d", url, self.model, len(payload["messages"]))
 
-        logger.debug("POST %s  model=%s  msgs=%d", url, self.model, len(messages))
-
-        # Use tqdm as a simple spinner for the blocking request
-        with tqdm(total=0, desc="Thinking", bar_format="{desc}...", leave=False):
+        with _spinner("Thinking") if show_spinner else contextlib.nullcontext():
             resp = self._request_with_retry("POST", url, json_payload=payload)
 
         if resp.status_code != 200:
@@ -144,9 +526,9 @@ class GrokClient:
             raise GrokAPIError(resp.status_code, resp.text)
 
         try:
-            data = resp.json()
+            data = json_loads(resp.content)
             reply: str = data["choices"][0]["message"]["content"]
-        except (KeyError, IndexError, ValueError) as exc:
+        except (KeyError, IndexError, TypeError, ValueError) as exc:
             logger.error("Unexpected API response structure: %s", exc)
             raise GrokAPIError(resp.status_code, f"Malformed response: {resp.text[:300]}") from exc
         logger.debug("Reply length: %d chars", len(reply))
@@ -162,7 +544,9 @@ class GrokClient:
         """Send a streaming chat completion request, yielding content chunks.
 
         Uses SSE (Server-Sent Events) to stream tokens as they are generated.
-        Each yielded string is a content delta (partial token).
+        Each yielded string is a content delta (partial token).  A cached
+        reply (shared with :meth:`chat`) is yielded as a single chunk, and a
+        fully received stream is added to the cache.
         """
         url = f"{self.base_url}/chat/completions"
         payload: dict[str, Any] = {
@@ -170,39 +554,52 @@ class GrokClient:
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
-            "stream": True,
         }
 
+        key: str | None = None
+        if self.cache.enabled:
+            key = _fingerprint(payload)
+            cached = self.cache.get(key) if self.config.use_cache else None
+            if cached is not None:
+                logger.debug("X-Cache: HIT (stream) %s", key)
+                yield cached
+                return
+
         logger.debug("POST %s (stream) model=%s msgs=%d", url, self.model, len(messages))
 
+        payload["stream"] = True
         resp = self._request_with_retry("POST", url, json_payload=payload, stream=True)
 
         if resp.status_code != 200:
             logger.error("Grok API error %d: %s", resp.status_code, resp.text[:500])
             raise GrokAPIError(resp.status_code, resp.text)
 
-        for raw_line in resp.iter_lines(decode_unicode=True):
-            if not raw_line:
-                continue
-
+        parts: list[str] = []
+        try:
             # SSE format: "data: {json}" or "data: [DONE]"
-            if not raw_line.startswith("data: "):
-                continue
-
-            data_str = raw_line[len("data: ") :]
-
-            if data_str.strip() == "[DONE]":
-                break
-
-            try:
-                chunk = json.loads(data_str)
-                delta = chunk["choices"][0]["delta"]
-                content = delta.get("content", "")
-                if content:
-                    yield content
-            except (json.JSONDecodeError, KeyError, IndexError) as exc:
-                logger.debug("Skipping unparseable SSE chunk: %s", exc)
-                continue
+            for data in _iter_sse_data(resp.iter_content(chunk_size=_SSE_CHUNK_SIZE)):
+                if data.strip() == b"[DONE]":
+                    break
+
+                try:
+                    chunk = json_loads(data)
+                    delta = chunk["choices"][0]["delta"]
+                    content = delta.get("content", "")
+                    if content:
+                        parts.append(content)
+                        yield content
+                except (KeyError, IndexError, TypeError, ValueError) as exc:
+                    logger.debug("Skipping unparseable SSE chunk: %s", exc)
+                    continue
+        finally:
+            # Return the keep-alive connection to the pool even if the caller
+            # stops iterating early (e.g. Ctrl-C during streaming)
+            resp.close()
+
+        # Not reached if the caller abandoned the stream, so partial replies
+        # are never cached
+        if key is not None and parts:
+            self.cache.set(key, "".join(parts))
 
     def build_messages(
         self,
@@ -216,18 +613,13 @@ class GrokClient:
         If *memory_context* is provided it replaces *history* — used by the
         ConversationMemory system to inject summaries + recalled + recent messages.
         """
-        messages: list[dict[str, str]] = [{"role": "system", "content": SYSTEM_PROMPT}]
-
+        source = memory_context if memory_context is not None else history
+        user_message = {"role": "user", "content": user_input}
+        # Single list display per call instead of append/extend reallocations
         if context:
-            messages.append({"role": "system", "content": f"Project context:\n{context}"})
-
-        if memory_context is not None:
-            messages.extend(memory_context)
-        else:
-            messages.extend(history)
-
-        messages.append({"role": "user", "content": user_input})
-        return messages
+            context_message = {"role": "system", "content": f"Project context:\n{context}"}
+            return [_SYSTEM_MESSAGE, context_message, *source, user_message]
+        return [_SYSTEM_MESSAGE, *source, user_message]
 
 
 class GrokAPIError(Exception):
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 
-from dotenv import load_dotenv
+from dotenv import dotenv_values, load_dotenv
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +26,10 @@ def _safe_int(env_var: str, default: int) -> int:
         return default
 
 
-def _find_dotenv() -> Path | None:
-    """Walk up from cwd looking for a .env file."""
-    current = Path.cwd()
+@functools.lru_cache(maxsize=8)
+def _find_dotenv_from(cwd: str) -> Path | None:
+    """Walk up from *cwd* looking for a .env file (memoized per directory)."""
+    current = Path(cwd)
     for parent in [current, *current.parents]:
         candidate = parent / ".env"
         if candidate.is_file():
@@ -34,6 +37,47 @@ def _find_dotenv() -> Path | None:
     return None
 
 
+def _find_dotenv() -> Path | None:
+    """Walk up from cwd looking for a .env file."""
+    return _find_dotenv_from(os.getcwd())
+
+
+# .env files already applied to os.environ in this process
+_loaded_dotenvs: set[Path] = set()
+
+# Variables set before any .env was loaded; a .env file never overrides these
+_shell_env: frozenset[str] | None = None
+
+
+def _load_dotenv_once(path: Path) -> None:
+    """Load *path* into the environment unless it was already loaded."""
+    global _shell_env
+    if path in _loaded_dotenvs:
+        return
+    if _shell_env is None:
+        _shell_env = frozenset(os.environ)
+    load_dotenv(path)
+    _loaded_dotenvs.add(path)
+
+
+def reload_dotenv() -> None:
+    """Re-read the nearest .env, replacing values it set earlier in this process.
+
+    Variables that came from the shell still take precedence, as on first load.
+    """
+    _find_dotenv_from.cache_clear()
+    path = _find_dotenv()
+    if path is None:
+        return
+    if path not in _loaded_dotenvs:
+        _load_dotenv_once(path)
+        return
+    shell = _shell_env or frozenset()
+    for key, value in dotenv_values(path).items():
+        if value is not None and key not in shell:
+            os.environ[key] = value
+
+
 @dataclass(slots=True)
 class Config:
     """Runtime configuration populated from environment variables."""
@@ -57,6 +101,7 @@ class Config:
 
     # Runtime
     safe_lock: bool = False
+    use_cache: bool = True  # toggled with /nocache
     log_file: str = "grok_mccodin_log.json"
     working_dir: str = field(default_factory=lambda: str(Path.cwd()))
 
@@ -66,17 +111,28 @@ class Config:
     keep_recent: int = 10
     memory_top_k: int = 3
 
+    # API client
+    cache_ttl: int = 300
+    cache_stale_ttl: int = 0
+    rate_limit_rpm: int = 0
+    max_retries: int = 3
+
     @classmethod
     def from_env(cls) -> "Config":
-        """Build a Config from the process environment (loads .env first)."""
+        """Build a Config from the process environment (loads .env first).
+
+        The .env lookup and parse happen once per process; every call still
+        returns a fresh Config, since sessions mutate their copy.
+        """
         dotenv_path = _find_dotenv()
         if dotenv_path:
-            load_dotenv(dotenv_path)
+            _load_dotenv_once(dotenv_path)
 
         return cls(
             grok_api_key=os.getenv("GROK_API_KEY", ""),
-            grok_base_url=os.getenv("GROK_BASE_URL", "https://api.x.ai/v1"),
-            grok_model=os.getenv("GROK_MODEL", "grok-3"),
+            # Interned: used as request-payload values and cache-key components
+            grok_base_url=sys.intern(os.getenv("GROK_BASE_URL", "https://api.x.ai/v1")),
+            grok_model=sys.intern(os.getenv("GROK_MODEL", "grok-3")),
             x_api_key=os.getenv("X_API_KEY", ""),
             x_api_secret=os.getenv("X_API_SECRET", ""),
             x_access_token=os.getenv("X_ACCESS_TOKEN", ""),
@@ -87,6 +143,10 @@ class Config:
             token_budget=_safe_int("GROK_TOKEN_BUDGET", 6000),
             keep_recent=_safe_int("GROK_KEEP_RECENT", 10),
             memory_top_k=_safe_int("GROK_MEMORY_TOP_K", 3),
+            cache_ttl=_safe_int("GROK_CACHE_TTL", 300),
+            cache_stale_ttl=_safe_int("GROK_CACHE_STALE_TTL", 0),
+            rate_limit_rpm=_safe_int("GROK_RPM", 0),
+            max_retries=_safe_int("GROK_MAX_RETRIES", 3),
         )
 
     @property
@@ -3,13 +3,44 @@
 from __future__ import annotations
 
 import logging
-import re
+import os
 import sqlite3
+import threading
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per lock acquisition in SQLiteDB.iter_query
+_ITER_BATCH_SIZE = 256
+
+# Applied to every new SQLite connection; they last only as long as it does.
+_SQLITE_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MiB page cache
+    "PRAGMA mmap_size=268435456",  # 256 MiB memory-mapped I/O
+)
+
+# Applied only to database files SQLiteDB creates itself.  WAL lets readers
+# run alongside a writer and, with synchronous=NORMAL, skips the per-commit
+# journal fsync — but journal_mode sticks to the file, so a user's existing
+# database keeps whatever durability settings it already had.
+_SQLITE_NEW_DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+)
+
+# Remote connection pools, keyed by DSN, so repeated queries skip the
+# TCP/TLS/auth handshake.  Both open connections only as they are needed
+# and keep at most _POOL_SIZE of them.
+_POOL_SIZE = 8
+_PG_POOLS: dict[str, Any] = {}
+# MySQLConnectionPool opens all of its connections up front, so MySQL keeps
+# a plain list of idle connections per DSN instead
+_MYSQL_IDLE: dict[str, list[Any]] = {}
+_POOLS_LOCK = threading.Lock()
+
 
 class DatabaseError(Exception):
     """Raised when a database operation fails."""
@@ -35,41 +66,79 @@ class SQLiteDB:
     def __init__(self, db_path: str | Path) -> None:
         self.db_path = str(db_path)
         self._conn: sqlite3.Connection | None = None
+        # The connection may be shared across threads; serialize access to it
+        self._lock = threading.RLock()
 
     def _get_conn(self) -> sqlite3.Connection:
         if self._conn is None:
-            self._conn = sqlite3.connect(self.db_path)
-            self._conn.row_factory = sqlite3.Row
+            created = not os.path.exists(self.db_path)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            pragmas = _SQLITE_NEW_DB_PRAGMAS + _SQLITE_PRAGMAS if created else _SQLITE_PRAGMAS
+            for pragma in pragmas:
+                try:
+                    self._conn.execute(pragma)
+                except sqlite3.Error as exc:
+                    # e.g. read-only databases can't switch journal mode
+                    logger.debug("Skipping %r on %s: %s", pragma, self.db_path, exc)
         return self._conn
 
     def query(self, sql: str, params: tuple[Any, ...] = ()) -> list[dict[str, Any]]:
         """Execute a SELECT query and return rows as dicts."""
-        conn = self._get_conn()
+        with self._lock:
+            conn = self._get_conn()
+            try:
+                cursor = conn.execute(sql, params)
+                columns = tuple(desc[0] for desc in cursor.description or ())
+                return [dict(zip(columns, row)) for row in cursor]
+            except sqlite3.Error as exc:
+                raise DatabaseError(f"Query failed: {exc}") from exc
+
+    def iter_query(self, sql: str, params: tuple[Any, ...] = ()) -> Iterator[dict[str, Any]]:
+        """Like :meth:`query`, but yield rows one at a time.
+
+        Rows are fetched in small batches, so only a slice of a large result
+        set is ever held in memory.
+        """
+        with self._lock:
+            try:
+                cursor = self._get_conn().execute(sql, params)
+            except sqlite3.Error as exc:
+                raise DatabaseError(f"Query failed: {exc}") from exc
+            columns = tuple(desc[0] for desc in cursor.description or ())
         try:
-            cursor = conn.execute(sql, params)
-            columns = [desc[0] for desc in cursor.description] if cursor.description else []
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
-        except sqlite3.Error as exc:
-            raise DatabaseError(f"Query failed: {exc}") from exc
+            while True:
+                with self._lock:
+                    try:
+                        batch = cursor.fetchmany(_ITER_BATCH_SIZE)
+                    except sqlite3.Error as exc:
+                        raise DatabaseError(f"Query failed: {exc}") from exc
+                if not batch:
+                    return
+                for row in batch:
+                    yield dict(zip(columns, row))
+        finally:
+            cursor.close()
 
     def execute(self, sql: str, params: tuple[Any, ...] = ()) -> int:
         """Execute a write statement (INSERT/UPDATE/DELETE). Returns rowcount."""
-        conn = self._get_conn()
-        try:
-            cursor = conn.execute(sql, params)
-            conn.commit()
-            return cursor.rowcount
-        except sqlite3.Error as exc:
-            conn.rollback()
-            raise DatabaseError(f"Execute failed: {exc}") from exc
+        with self._lock:
+            conn = self._get_conn()
+            try:
+                cursor = conn.execute(sql, params)
+                conn.commit()
+                return cursor.rowcount
+            except sqlite3.Error as exc:
+                conn.rollback()
+                raise DatabaseError(f"Execute failed: {exc}") from exc
 
     def execute_script(self, sql: str) -> None:
         """Execute a multi-statement SQL script."""
-        conn = self._get_conn()
-        try:
-            conn.executescript(sql)
-        except sqlite3.Error as exc:
-            raise DatabaseError(f"Script failed: {exc}") from exc
+        with self._lock:
+            conn = self._get_conn()
+            try:
+                conn.executescript(sql)
+            except sqlite3.Error as exc:
+                raise DatabaseError(f"Script failed: {exc}") from exc
 
     def schema(self) -> str:
         """Return the database schema (all CREATE statements)."""
@@ -81,26 +150,30 @@ class SQLiteDB:
 
     def tables(self) -> list[str]:
         """Return a list of table names."""
-        rows = self.query("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
+        # main.sqlite_master rather than pragma_table_list (SQLite 3.37+), which
+        # older builds bundled with Python 3.10 (e.g. Ubuntu 20.04's 3.31) lack
+        rows = self.query("SELECT name FROM main.sqlite_master WHERE type='table' ORDER BY name")
         return [row["name"] for row in rows]
 
     def table_info(self, table: str) -> list[dict[str, Any]]:
         """Return column info for a table."""
-        # Validate table exists via parameterized query to avoid injection
-        if table not in self.tables():
+        # One statement: pragma_table_info takes the name as a bound parameter,
+        # and the EXISTS clause restricts it to tables (see tables()).
+        rows = self.query(
+            "SELECT * FROM pragma_table_info(?, 'main') WHERE EXISTS "
+            "(SELECT 1 FROM main.sqlite_master WHERE type='table' AND name=?)",
+            (table, table),
+        )
+        if not rows:
             raise DatabaseError(f"Table not found: {table}")
-        # PRAGMA doesn't support parameterized queries, so we must sanitize.
-        # Since we validated against the actual table list above, we also
-        # enforce identifier-safe characters as defense in depth.
-        if not re.match(r"^[A-Za-z_][A-Za-z0-9_]*$", table):
-            raise DatabaseError(f"Invalid table name: {table}")
-        return self.query(f"PRAGMA table_info({table})")
+        return rows
 
     def close(self) -> None:
         """Close the database connection."""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
 
     def __enter__(self) -> "SQLiteDB":
         return self
@@ -147,11 +220,21 @@ def _query_postgres(dsn: str, sql: str, params: tuple[Any, ...] = ()) -> list[di
     try:
         import psycopg2  # type: ignore[import-untyped]
         import psycopg2.extras  # type: ignore[import-untyped]
+        import psycopg2.pool  # type: ignore[import-untyped]
     except ImportError as exc:
         raise DatabaseError("psycopg2 not installed — run: pip install psycopg2-binary") from exc
 
     try:
-        conn = psycopg2.connect(dsn)
+        with _POOLS_LOCK:
+            pool = _PG_POOLS.get(dsn)
+            if pool is None:
+                pool = psycopg2.pool.ThreadedConnectionPool(1, _POOL_SIZE, dsn)
+                _PG_POOLS[dsn] = pool
+        conn = pool.getconn()
+    except psycopg2.Error as exc:
+        raise DatabaseError(f"PostgreSQL error: {exc}") from exc
+
+    try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
             cur.execute(sql, params)
             if cur.description:
@@ -161,7 +244,8 @@ def _query_postgres(dsn: str, sql: str, params: tuple[Any, ...] = ()) -> list[di
     except psycopg2.Error as exc:
         raise DatabaseError(f"PostgreSQL error: {exc}") from exc
     finally:
-        conn.close()
+        # The pool rolls back any open transaction and drops broken connections
+        pool.putconn(conn)
 
 
 def _query_mysql(dsn: str, sql: str, params: tuple[Any, ...] = ()) -> list[dict[str, Any]]:
@@ -185,8 +269,19 @@ def _query_mysql(dsn: str, sql: str, params: tuple[Any, ...] = ()) -> list[dict[
         "database": parsed.path.lstrip("/"),
     }
 
+    conn = None
+    with _POOLS_LOCK:
+        idle = _MYSQL_IDLE.get(dsn)
+        if idle:
+            conn = idle.pop()
+    try:
+        # is_connected() pings the server; a dropped connection is replaced
+        if conn is None or not conn.is_connected():
+            conn = mysql.connector.connect(**config)
+    except mysql.connector.Error as exc:
+        raise DatabaseError(f"MySQL error: {exc}") from exc
+
     try:
-        conn = mysql.connector.connect(**config)
         cursor = conn.cursor(dictionary=True)
         cursor.execute(sql, params)
         if cursor.description:
@@ -197,4 +292,19 @@ def _query_mysql(dsn: str, sql: str, params: tuple[Any, ...] = ()) -> list[dict[
     except mysql.connector.Error as exc:
         raise DatabaseError(f"MySQL error: {exc}") from exc
     finally:
-        conn.close()
+        try:
+            conn.rollback()  # never hand an open transaction to the next query
+        except mysql.connector.Error:
+            conn.close()
+        else:
+            _park_mysql(dsn, conn)
+
+
+def _park_mysql(dsn: str, conn: Any) -> None:
+    """Return *conn* to the idle list for *dsn*, or close it if that is full."""
+    with _POOLS_LOCK:
+        idle = _MYSQL_IDLE.setdefault(dsn, [])
+        if len(idle) < _POOL_SIZE:
+            idle.append(conn)
+            return
+    conn.close()
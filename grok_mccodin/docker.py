@@ -2,15 +2,34 @@
 
 from __future__ import annotations
 
-import json
 import logging
+import os
+import shlex
 import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
+
+from grok_mccodin.utils import json_loads
 
 logger = logging.getLogger(__name__)
 
+# Python opens fds non-inheritable (PEP 446), so children only ever get
+# stdin/stdout/stderr; on Linux skip subprocess's per-spawn fd-closing pass.
+_CLOSE_FDS = sys.platform != "linux"
+
 DEFAULT_TIMEOUT = 60
 
+# Output of read-only commands (ps, images, info) is reused for a short TTL,
+# keyed by (args, cwd), so rapid repeated calls skip the fork+exec.
+_DEFAULT_CACHE_TTL = 2.0
+_CACHE: dict[tuple[tuple[str, ...], str], tuple[float, str]] = {}
+_CACHE_LOCK = threading.Lock()
+
 
 class DockerError(Exception):
     """Raised when a Docker operation fails."""
@@ -27,6 +46,7 @@ def _run_docker(args: list[str], *, cwd: str | Path = ".", timeout: int = DEFAUL
             text=True,
             cwd=str(cwd),
             timeout=timeout,
+            close_fds=_CLOSE_FDS,
         )
     except FileNotFoundError as exc:
         raise DockerError("Docker is not installed or not on PATH") from exc
@@ -41,6 +61,57 @@ def _run_docker(args: list[str], *, cwd: str | Path = ".", timeout: int = DEFAUL
     return result.stdout
 
 
+def _cache_ttl() -> float:
+    """Return the read-cache TTL in seconds from GROK_DOCKER_TTL (0 disables)."""
+    raw = os.environ.get("GROK_DOCKER_TTL", "")
+    if not raw:
+        return _DEFAULT_CACHE_TTL
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        logger.warning("Invalid GROK_DOCKER_TTL=%r, using %.1f", raw, _DEFAULT_CACHE_TTL)
+        return _DEFAULT_CACHE_TTL
+
+
+def _cached_run_docker(
+    args: list[str], *, cwd: str | Path = ".", timeout: int = DEFAULT_TIMEOUT
+) -> str:
+    """Like _run_docker, but reuse output younger than the cache TTL.
+
+    Failures are not cached.
+    """
+    ttl = _cache_ttl()
+    if ttl <= 0:
+        return _run_docker(args, cwd=cwd, timeout=timeout)
+
+    key = (tuple(args), str(cwd))
+    with _CACHE_LOCK:
+        hit = _CACHE.get(key)
+    if hit is not None and time.monotonic() - hit[0] < ttl:
+        return hit[1]
+
+    output = _run_docker(args, cwd=cwd, timeout=timeout)
+    with _CACHE_LOCK:
+        _CACHE[key] = (time.monotonic(), output)
+    return output
+
+
+def _run_docker_mutating(
+    args: list[str], *, cwd: str | Path = ".", timeout: int = DEFAULT_TIMEOUT
+) -> str:
+    """Run a state-changing subcommand and drop the cached read output."""
+    try:
+        return _run_docker(args, cwd=cwd, timeout=timeout)
+    finally:
+        clear_cache()
+
+
+def clear_cache() -> None:
+    """Forget cached ps/images/info output."""
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
 # ---------------------------------------------------------------------------
 # Container operations
 # ---------------------------------------------------------------------------
@@ -51,23 +122,47 @@ def ps(*, all_: bool = False, cwd: str | Path = ".") -> str:
     args = ["ps", "--format", "table {{.ID}}\t{{.Image}}\t{{.Status}}\t{{.Names}}"]
     if all_:
         args.insert(1, "-a")
-    return _run_docker(args, cwd=cwd)
+    return _cached_run_docker(args, cwd=cwd)
 
 
-def ps_json(*, all_: bool = False, cwd: str | Path = ".") -> list[dict]:
-    """List containers as structured data."""
+def _ps_rows(*, all_: bool, cwd: str | Path) -> Iterator[dict]:
+    """Yield one dict per container from ``docker ps --format json``."""
     args = ["ps", "--format", "json"]
     if all_:
         args.insert(1, "-a")
-    output = _run_docker(args, cwd=cwd)
-    results: list[dict] = []
-    for line in output.strip().split("\n"):
-        if line.strip():
-            try:
-                results.append(json.loads(line))
-            except json.JSONDecodeError:
-                continue
-    return results
+    output = _cached_run_docker(args, cwd=cwd)
+    # NDJSON: one object per line; orjson parses each when installed
+    for line in output.splitlines():
+        if not line or line.isspace():
+            continue
+        try:
+            yield json_loads(line)
+        except ValueError:
+            continue
+
+
+def ps_json(*, all_: bool = False, cwd: str | Path = ".") -> list[dict]:
+    """List containers as structured data, one dict per container."""
+    return list(_ps_rows(all_=all_, cwd=cwd))
+
+
+def ps_columns(
+    *,
+    cols: tuple[str, ...] = ("ID", "Image", "Status", "Names"),
+    all_: bool = False,
+    cwd: str | Path = ".",
+) -> dict[str, list[Any]]:
+    """List containers column-wise: ``{"ID": [...], "Image": [...], ...}``.
+
+    Prefer this over :func:`ps_json` when only a few fields are needed (e.g.
+    container names): rows are not kept, only the requested columns.  Index
+    ``i`` of every list refers to the same container; missing fields are None.
+    """
+    columns: dict[str, list[Any]] = {col: [] for col in cols}
+    for row in _ps_rows(all_=all_, cwd=cwd):
+        for col in cols:
+            columns[col].append(row.get(col))
+    return columns
 
 
 _BLOCKED_RAW_PREFIXES = ("/etc", "/var", "/root", "/home", "/proc", "/sys")
@@ -111,6 +206,16 @@ def _validate_volume(vol: str) -> None:
         )
 
 
+def _command_argv(command: str | list[str]) -> list[str]:
+    """Tokenize a container command; lists are used as-is."""
+    if isinstance(command, list):
+        return command
+    try:
+        return shlex.split(command)
+    except ValueError as exc:
+        raise DockerError(f"Cannot parse command {command!r}: {exc}") from exc
+
+
 def run(
     image: str,
     *,
@@ -119,10 +224,13 @@ def run(
     env: dict[str, str] | None = None,
     volumes: list[str] | None = None,
     detach: bool = True,
-    command: str = "",
+    command: str | list[str] = "",
     cwd: str | Path = ".",
 ) -> str:
-    """Run a container."""
+    """Run a container.
+
+    *command* may be a string (split with shell quoting rules) or an argv list.
+    """
     args = ["run"]
     if detach:
         args.append("-d")
@@ -136,14 +244,13 @@ def run(
         _validate_volume(vol)
         args.extend(["-v", vol])
     args.append(image)
-    if command:
-        args.extend(command.split())
-    return _run_docker(args, cwd=cwd).strip()
+    args.extend(_command_argv(command))
+    return _run_docker_mutating(args, cwd=cwd).strip()
 
 
 def stop(container: str, *, timeout: int = 10, cwd: str | Path = ".") -> str:
     """Stop a running container."""
-    return _run_docker(["stop", "-t", str(timeout), container], cwd=cwd)
+    return _run_docker_mutating(["stop", "-t", str(timeout), container], cwd=cwd)
 
 
 def rm(container: str, *, force: bool = False, cwd: str | Path = ".") -> str:
@@ -152,7 +259,7 @@ def rm(container: str, *, force: bool = False, cwd: str | Path = ".") -> str:
     if force:
         args.append("-f")
     args.append(container)
-    return _run_docker(args, cwd=cwd)
+    return _run_docker_mutating(args, cwd=cwd)
 
 
 def logs(container: str, *, tail: int = 100, cwd: str | Path = ".") -> str:
@@ -160,10 +267,13 @@ def logs(container: str, *, tail: int = 100, cwd: str | Path = ".") -> str:
     return _run_docker(["logs", "--tail", str(tail), container], cwd=cwd)
 
 
-def exec_(container: str, command: str, *, cwd: str | Path = ".") -> str:
-    """Execute a command inside a running container."""
-    args = ["exec", container, *command.split()]
-    return _run_docker(args, cwd=cwd)
+def exec_(container: str, command: str | list[str], *, cwd: str | Path = ".") -> str:
+    """Execute a command inside a running container.
+
+    *command* may be a string (split with shell quoting rules) or an argv list.
+    """
+    args = ["exec", container, *_command_argv(command)]
+    return _run_docker_mutating(args, cwd=cwd)
 
 
 # ---------------------------------------------------------------------------
@@ -173,7 +283,7 @@ def exec_(container: str, command: str, *, cwd: str | Path = ".") -> str:
 
 def images(*, cwd: str | Path = ".") -> str:
     """List Docker images."""
-    return _run_docker(
+    return _cached_run_docker(
         ["images", "--format", "table {{.Repository}}\t{{.Tag}}\t{{.Size}}\t{{.CreatedSince}}"],
         cwd=cwd,
     )
@@ -193,12 +303,12 @@ def build(
     if dockerfile:
         args.extend(["-f", dockerfile])
     args.append(path)
-    return _run_docker(args, cwd=cwd, timeout=300)
+    return _run_docker_mutating(args, cwd=cwd, timeout=300)
 
 
 def pull(image: str, *, cwd: str | Path = ".") -> str:
     """Pull a Docker image."""
-    return _run_docker(["pull", image], cwd=cwd, timeout=300)
+    return _run_docker_mutating(["pull", image], cwd=cwd, timeout=300)
 
 
 def push(image: str, *, cwd: str | Path = ".") -> str:
@@ -224,7 +334,7 @@ def compose_up(
     args.append("up")
     if detach:
         args.append("-d")
-    return _run_docker(args, cwd=cwd, timeout=300)
+    return _run_docker_mutating(args, cwd=cwd, timeout=300)
 
 
 def compose_down(*, file: str = "", cwd: str | Path = ".") -> str:
@@ -233,7 +343,7 @@ def compose_down(*, file: str = "", cwd: str | Path = ".") -> str:
     if file:
         args.extend(["-f", file])
     args.append("down")
-    return _run_docker(args, cwd=cwd)
+    return _run_docker_mutating(args, cwd=cwd)
 
 
 def compose_ps(*, file: str = "", cwd: str | Path = ".") -> str:
@@ -253,7 +363,7 @@ def compose_ps(*, file: str = "", cwd: str | Path = ".") -> str:
 def is_docker_available() -> bool:
     """Check if Docker is installed and the daemon is running."""
     try:
-        _run_docker(["info"], timeout=10)
+        _cached_run_docker(["info"], timeout=10)
         return True
     except DockerError:
         return False
@@ -261,16 +371,19 @@ def is_docker_available() -> bool:
 
 def summary(cwd: str | Path = ".") -> str:
     """Return a quick Docker status summary."""
+    # ps and images wait on the daemon, not the CPU; run them side by side
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        ps_future = pool.submit(ps, cwd=cwd)
+        images_future = pool.submit(images, cwd=cwd)
+
     parts: list[str] = []
     try:
-        containers = ps(cwd=cwd)
-        parts.append(f"Running containers:\n{containers}")
+        parts.append(f"Running containers:\n{ps_future.result()}")
     except DockerError:
         return "[Docker not available]"
 
     try:
-        imgs = images(cwd=cwd)
-        parts.append(f"\nImages:\n{imgs}")
+        parts.append(f"\nImages:\n{images_future.result()}")
     except DockerError:
         pass
 
@@ -3,17 +3,56 @@
 from __future__ import annotations
 
 import difflib
+import errno
+import functools
 import logging
+import mmap
+import os
 import re
 import shutil
-from datetime import datetime, timezone
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from rich.console import Console
-from rich.syntax import Syntax
+if TYPE_CHECKING:
+    from rich.console import Console
+
+try:
+    from cdifflib import CSequenceMatcher as _SequenceMatcher  # type: ignore[import-untyped]
+except ImportError:
+    _SequenceMatcher = difflib.SequenceMatcher
 
 logger = logging.getLogger(__name__)
-console = Console()
+_console: Console | None = None
+
+
+def _get_console() -> Console:
+    """Return the shared Console, importing rich on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
+
+# Every reply directive in one alternation, compiled once.  The outer named
+# group of each alternative is what ``match.lastgroup`` reports.  Fences are
+# matched as a whole, so RUN:/DELETE: lines inside a code block are file
+# content rather than directives.
+_ACTION_RE = re.compile(
+    r"(?P<create>CREATE:\s*(?P<path>\S+)\s*\n```(?P<create_lang>\w*)\n(?P<create_code>.*?)```)"
+    r"|(?P<block>```(?P<lang>\w*)?(?::(?P<filename>[^\n]+))?\n(?P<code>.*?)```)"
+    r"|(?P<delete>^DELETE:\s*(?P<delete_path>\S+)$)"
+    r"|(?P<run>^RUN:\s*(?P<command>[^\n]+)$)",
+    re.DOTALL | re.MULTILINE,
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _resolved_base(abs_base: str) -> Path:
+    """Resolve a base directory once; keyed on its absolute path."""
+    return Path(abs_base).resolve()
 
 
 def _safe_resolve(filepath: str | Path, base_dir: str | Path) -> Path | None:
@@ -22,11 +61,10 @@ def _safe_resolve(filepath: str | Path, base_dir: str | Path) -> Path | None:
     Returns the resolved Path if it stays within *base_dir*, or None if it
     would escape (e.g. ``../../etc/passwd``).
     """
-    base = Path(base_dir).resolve()
+    base = _resolved_base(os.path.abspath(base_dir))
+    # The target is still fully resolved so symlinks can't escape the base
     target = (base / filepath).resolve()
-    try:
-        target.relative_to(base)
-    except ValueError:
+    if not target.is_relative_to(base):
         logger.warning("Path traversal blocked: %s escapes %s", filepath, base)
         return None
     return target
@@ -43,46 +81,115 @@ def extract_code_blocks(text: str) -> list[dict[str, str]]:
         ```python
         ```
     """
-    pattern = r"```(\w*)?(?::([^\n]+))?\n(.*?)```"
-    blocks = []
-    for match in re.finditer(pattern, text, re.DOTALL):
-        lang = match.group(1) or ""
-        filename = match.group(2) or ""
-        code = match.group(3).rstrip("\n")
-        blocks.append({"lang": lang, "filename": filename.strip(), "code": code})
+    blocks: list[dict[str, str]] = extract_all(text)["blocks"]
     return blocks
 
 
 def extract_commands(text: str) -> list[str]:
     """Extract RUN: <command> lines from a Grok response."""
-    return re.findall(r"^RUN:\s*(.+)$", text, re.MULTILINE)
+    commands: list[str] = extract_all(text)["commands"]
+    return commands
 
 
 def extract_creates(text: str) -> list[dict[str, str]]:
     """Extract CREATE: <path> directives followed by code blocks."""
-    creates = []
-    pattern = r"CREATE:\s*(\S+)\s*\n```\w*\n(.*?)```"
-    for match in re.finditer(pattern, text, re.DOTALL):
-        creates.append({"path": match.group(1).strip(), "code": match.group(2).rstrip("\n")})
+    creates: list[dict[str, str]] = extract_all(text)["creates"]
     return creates
 
 
 def extract_deletes(text: str) -> list[str]:
     """Extract DELETE: <path> directives."""
-    return re.findall(r"^DELETE:\s*(\S+)$", text, re.MULTILINE)
+    deletes: list[str] = extract_all(text)["deletes"]
+    return deletes
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a hunk range the way ``difflib.unified_diff`` does."""
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    if not length:
+        return f"{start},0"
+    return f"{start + 1},{length}"
+
+
+def extract_all(text: str) -> dict[str, list[Any]]:
+    """Extract every action from a Grok response in a single regex pass.
+
+    Returns ``{"blocks": ..., "creates": ..., "deletes": ..., "commands": ...}``
+    in the formats of the individual ``extract_*`` functions.  A CREATE:
+    block is also reported (without a filename) under ``"blocks"``.
+    """
+    blocks: list[dict[str, str]] = []
+    creates: list[dict[str, str]] = []
+    deletes: list[str] = []
+    commands: list[str] = []
+    for match in _ACTION_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == "create":
+            code = match.group("create_code").rstrip("\n")
+            creates.append({"path": match.group("path").strip(), "code": code})
+            blocks.append({"lang": match.group("create_lang"), "filename": "", "code": code})
+        elif kind == "block":
+            blocks.append(
+                {
+                    "lang": match.group("lang") or "",
+                    "filename": (match.group("filename") or "").strip(),
+                    "code": match.group("code").rstrip("\n"),
+                }
+            )
+        elif kind == "delete":
+            deletes.append(match.group("delete_path"))
+        else:
+            commands.append(match.group("command"))
+    return {"blocks": blocks, "creates": creates, "deletes": deletes, "commands": commands}
 
 
 def show_diff(original: str, modified: str, filename: str = "") -> str:
-    """Generate a unified diff between two strings."""
+    """Generate a unified diff between two strings.
+
+    Output matches ``difflib.unified_diff``; the line matching runs in C when
+    the optional ``cdifflib`` package is installed.
+    """
+    if original == modified:
+        return ""
     orig_lines = original.splitlines(keepends=True)
     mod_lines = modified.splitlines(keepends=True)
-    diff = difflib.unified_diff(
-        orig_lines,
-        mod_lines,
-        fromfile=f"a/{filename}" if filename else "a/original",
-        tofile=f"b/{filename}" if filename else "b/modified",
-    )
-    return "".join(diff)
+    out: list[str] = []
+    matcher = _SequenceMatcher(None, orig_lines, mod_lines)
+    for group in matcher.get_grouped_opcodes(3):
+        if not out:
+            out.append(f"--- a/{filename}\n" if filename else "--- a/original\n")
+            out.append(f"+++ b/{filename}\n" if filename else "+++ b/modified\n")
+        first, last = group[0], group[-1]
+        out.append(
+            f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@\n"
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                out.extend(" " + line for line in orig_lines[i1:i2])
+                continue
+            if tag in ("replace", "delete"):
+                out.extend("-" + line for line in orig_lines[i1:i2])
+            if tag in ("replace", "insert"):
+                out.extend("+" + line for line in mod_lines[j1:j2])
+    return "".join(out)
+
+
+def _file_equals(path: Path, data: bytes) -> bool:
+    """Compare a file's bytes with *data* through a read-only mapping.
+
+    The memoryview comparison is a memcmp against the page cache, so the
+    common no-op edit never copies the file into a Python object.
+    """
+    if not data:
+        return True  # caller already checked the sizes match
+    with (
+        path.open("rb") as fh,
+        mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        memoryview(mm) as view,
+    ):
+        return view == data
 
 
 def apply_edit(filepath: str | Path, new_content: str, *, base_dir: str | Path = ".") -> str:
@@ -96,18 +203,33 @@ def apply_edit(filepath: str | Path, new_content: str, *, base_dir: str | Path =
 
     resolved.parent.mkdir(parents=True, exist_ok=True)
 
+    # Encode once, translating newlines as text mode would
+    if os.linesep != "\n":
+        data = new_content.replace("\n", os.linesep).encode("utf-8")
+    else:
+        data = new_content.encode("utf-8")
+
     if resolved.is_file():
+        # Byte-identical files need neither a diff nor a write; a size
+        # mismatch rules that out without reading the file
+        if resolved.stat().st_size == len(data) and _file_equals(resolved, data):
+            return f"No changes needed for {filepath}"
         original = resolved.read_text(encoding="utf-8", errors="replace")
         diff = show_diff(original, new_content, filename=str(filepath))
         if not diff:
             return f"No changes needed for {filepath}"
-        console.print(f"\n[bold yellow]Diff for {filepath}:[/bold yellow]")
-        console.print(Syntax(diff, "diff", theme="monokai"))
+        from rich.syntax import Syntax
+
+        # One print call keeps header and diff together when edits run in parallel
+        _get_console().print(
+            f"\n[bold yellow]Diff for {filepath}:[/bold yellow]",
+            Syntax(diff, "diff", theme="monokai"),
+        )
     else:
-        console.print(f"\n[bold green]Creating new file: {filepath}[/bold green]")
+        _get_console().print(f"\n[bold green]Creating new file: {filepath}[/bold green]")
 
-    resolved.write_text(new_content, encoding="utf-8")
-    logger.info("Wrote %s (%d bytes)", resolved, len(new_content))
+    resolved.write_bytes(data)
+    logger.info("Wrote %s (%d bytes)", resolved, len(data))
     return f"Updated {filepath}"
 
 
@@ -121,7 +243,7 @@ def apply_create(filepath: str | Path, content: str, *, base_dir: str | Path = "
         return f"[skip] {filepath} already exists — use edit instead"
     resolved.parent.mkdir(parents=True, exist_ok=True)
     resolved.write_text(content, encoding="utf-8")
-    console.print(f"[bold green]Created {filepath}[/bold green]")
+    _get_console().print(f"[bold green]Created {filepath}[/bold green]")
     return f"Created {filepath}"
 
 
@@ -140,8 +262,14 @@ def apply_delete(filepath: str | Path, *, base_dir: str | Path = ".") -> str:
 
     trash_dir = Path(base_dir).resolve() / ".trash"
     trash_dir.mkdir(exist_ok=True)
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
     dest = trash_dir / f"{timestamp}_{resolved.name}"
-    shutil.move(str(resolved), str(dest))
-    console.print(f"[bold red]Deleted {filepath}[/bold red] (backed up to .trash/)")
+    try:
+        # Same filesystem in the common case: a plain rename, no data copied
+        os.replace(resolved, dest)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        shutil.move(str(resolved), str(dest))
+    _get_console().print(f"[bold red]Deleted {filepath}[/bold red] (backed up to .trash/)")
     return f"Deleted {filepath}"
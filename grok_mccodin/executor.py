@@ -2,16 +2,39 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import os
+import re
+import select
+import shlex
+import shutil
+import signal
 import subprocess
 import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from rich.console import Console
-from rich.panel import Panel
+if TYPE_CHECKING:
+    from rich.console import Console
 
 logger = logging.getLogger(__name__)
-console = Console()
+_console: Console | None = None
+
+
+def _get_console() -> Console:
+    """Return the shared Console, importing rich on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
 
 # Commands that are always blocked
 BLOCKED_COMMANDS = {
@@ -25,20 +48,63 @@ BLOCKED_COMMANDS = {
 # Max seconds a subprocess is allowed to run
 DEFAULT_TIMEOUT = 30
 
+# Characters that need a real shell: pipes, redirects, globs, expansions,
+# command separators, comments.  Anything else can be exec'd directly.
+_NEEDS_SHELL_RE = re.compile(r"[|&;<>$`*?(){}\[\]~#!\\\n]")
+
+
+def _compile_blocklist(blocked: set[str]) -> re.Pattern[str]:
+    """Compile the blocklist into one alternation, scanned in a single pass."""
+    if not blocked:
+        return re.compile(r"(?!)")  # never matches
+    return re.compile("|".join(re.escape(entry.lower()) for entry in blocked))
+
+
+# (identity, size) of the set the pattern was built from, and the pattern itself
+_blocked_cache: tuple[tuple[int, int], re.Pattern[str]] = (
+    (id(BLOCKED_COMMANDS), len(BLOCKED_COMMANDS)),
+    _compile_blocklist(BLOCKED_COMMANDS),
+)
+
+
+def _blocked_pattern() -> re.Pattern[str]:
+    """Return the compiled blocklist, rebuilding it only if the set was replaced or resized."""
+    global _blocked_cache
+    key = (id(BLOCKED_COMMANDS), len(BLOCKED_COMMANDS))
+    if _blocked_cache[0] != key:
+        _blocked_cache = (key, _compile_blocklist(BLOCKED_COMMANDS))
+    return _blocked_cache[1]
+
 
 def is_safe(command: str) -> bool:
     """Return False if the command matches a known-dangerous pattern."""
     normalized = command.strip().lower()
-    for blocked in BLOCKED_COMMANDS:
-        if blocked in normalized:
-            return False
-    return True
+    return _blocked_pattern().search(normalized) is None
+
+
+def _simple_argv(command: str) -> list[str] | None:
+    """Return argv for *command* if it can run without ``/bin/sh``, else None."""
+    if os.name != "posix" or _NEEDS_SHELL_RE.search(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:  # unbalanced quotes — let the shell report it
+        return None
+    return argv or None
+
+
+def _print_panel(body: str, *, title: str, border_style: str) -> None:
+    from rich.panel import Panel
+
+    _get_console().print(Panel(body, title=title, border_style=border_style))
 
 
 def _confirm(prompt: str) -> bool:
     """Ask the user for y/n confirmation via the console."""
     try:
-        answer = console.input(f"[bold yellow]{prompt} [y/N]:[/bold yellow] ").strip().lower()
+        answer = (
+            _get_console().input(f"[bold yellow]{prompt} [y/N]:[/bold yellow] ").strip().lower()
+        )
         return answer in ("y", "yes")
     except (EOFError, KeyboardInterrupt):
         return False
@@ -71,23 +137,39 @@ def run_shell(
         }
 
     if confirm:
-        console.print(Panel(command, title="Command to run", border_style="cyan"))
+        _print_panel(command, title="Command to run", border_style="cyan")
         if not _confirm("Execute this command?"):
             return {"stdout": "", "stderr": "[SKIPPED] User declined.", "returncode": -1}
     else:
-        console.print(Panel(command, title="Running", border_style="cyan"))
+        _print_panel(command, title="Running", border_style="cyan")
 
     logger.info("Executing: %s", command)
 
     try:
-        result = subprocess.run(
-            command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            cwd=str(cwd),
-            timeout=timeout,
-        )
+        result = None
+        argv = _simple_argv(command)
+        if argv is not None:
+            # No shell syntax: exec directly and skip the extra /bin/sh process
+            try:
+                result = subprocess.run(
+                    argv,
+                    capture_output=True,
+                    text=True,
+                    cwd=str(cwd),
+                    timeout=timeout,
+                    check=False,
+                )
+            except FileNotFoundError:
+                pass  # shell builtin, alias or VAR=value prefix — retry via sh
+        if result is None:
+            result = subprocess.run(
+                command,
+                shell=True,
+                capture_output=True,
+                text=True,
+                cwd=str(cwd),
+                timeout=timeout,
+            )
         return {
             "stdout": result.stdout,
             "stderr": result.stderr,
@@ -103,6 +185,168 @@ def run_shell(
         return {"stdout": "", "stderr": f"[ERROR] {exc}", "returncode": -1}
 
 
+# Runs in the persistent worker interpreter, which is only a fork server:
+# each request runs in a fresh forked child, so imported modules, os.environ,
+# sys.path and other globals never carry over from one snippet to the next,
+# and the interpreter start-up is all that is saved.  Requests and replies
+# are length-prefixed JSON on private copies of stdin/stdout.  The child's
+# fds 1 and 2 point at temp files, so output from processes it starts is
+# captured too.
+_WORKER_BOOTSTRAP = r"""
+import json, os, sys, tempfile, traceback
+proto_in = os.fdopen(os.dup(0), "rb")
+proto_out = os.fdopen(os.dup(1), "wb")
+os.dup2(os.open(os.devnull, os.O_RDWR), 0)
+os.dup2(2, 1)
+while True:
+    header = proto_in.readline()
+    if not header:
+        break
+    req = json.loads(proto_in.read(int(header)))
+    out, err = tempfile.TemporaryFile(), tempfile.TemporaryFile()
+    pid = os.fork()
+    if pid == 0:
+        proto_in.close()
+        proto_out.close()
+        os.dup2(out.fileno(), 1)
+        os.dup2(err.fileno(), 2)
+        try:
+            os.chdir(req["cwd"])
+            os.environ.clear()
+            os.environ.update(req["env"])
+            code = compile(req.pop("code"), "<run_python>", "exec")
+            exec(code, {"__name__": "__main__", "__file__": os.path.join(os.getcwd(), "<run_python>")})
+        except SystemExit:
+            raise
+        except BaseException:
+            traceback.print_exc()
+            sys.exit(1)
+        # Normal interpreter exit: joins threads, runs atexit hooks, flushes
+        sys.exit(0)
+    status = os.waitpid(pid, 0)[1]
+    out.seek(0)
+    err.seek(0)
+    body = json.dumps({
+        "stdout": out.read().decode("utf-8", errors="replace"),
+        "stderr": err.read().decode("utf-8", errors="replace"),
+        "returncode": os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status),
+    })
+    out.close()
+    err.close()
+    data = body.encode()
+    proto_out.write(b"%d\n" % len(data) + data)
+    proto_out.flush()
+"""
+
+
+class _PyWorker:
+    """A long-lived ``python`` fork server that executes snippets sent over a pipe.
+
+    Every snippet runs in its own forked child, as isolated as a fresh
+    ``python`` process but without paying the interpreter start-up.  The
+    worker uses the ``python`` found on PATH (as the temp-file fallback does)
+    and is restarted if that changes.  Calls are serialized.  POSIX only
+    (uses ``fork`` and ``select`` on pipes).
+    """
+
+    def __init__(self) -> None:
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._python: str | None = None
+        self._lock = threading.Lock()
+
+    def run(self, code: str, *, cwd: str | Path, timeout: int) -> dict[str, str | int] | None:
+        """Execute *code* in the worker.
+
+        Returns None if the worker could not take the request, in which case
+        nothing was executed and the caller should use a fresh interpreter.
+        """
+        python = shutil.which("python")
+        if python is None:
+            return None
+        request = {"code": code, "cwd": str(Path(cwd).resolve()), "env": dict(os.environ)}
+        body = json.dumps(request).encode()
+        with self._lock:
+            try:
+                proc = self._ensure_started(python)
+                assert proc.stdin is not None
+                proc.stdin.write(b"%d\n" % len(body) + body)
+                proc.stdin.flush()
+            except OSError as exc:
+                logger.debug("Python worker unavailable: %s", exc)
+                self._close()
+                return None
+
+            try:
+                reply: dict[str, str | int] = json.loads(self._read_reply(proc, timeout))
+                return reply
+            except TimeoutError:
+                self._close()
+                return {
+                    "stdout": "",
+                    "stderr": f"[TIMEOUT] Command exceeded {timeout}s",
+                    "returncode": -1,
+                }
+            except (EOFError, OSError, ValueError) as exc:
+                # Snippets run in forked children, so this is the worker itself
+                # failing (e.g. an incompatible python on PATH), not the snippet
+                logger.debug("Python worker failed: %s", exc)
+                self._close()
+                return None
+
+    def close(self) -> None:
+        """Stop the worker; the next run() starts a new one."""
+        with self._lock:
+            self._close()
+
+    def _ensure_started(self, python: str) -> subprocess.Popen[bytes]:
+        if self._proc is not None and (self._proc.poll() is not None or self._python != python):
+            self._close()
+        if self._proc is None:
+            self._proc = subprocess.Popen(
+                [python, "-u", "-c", _WORKER_BOOTSTRAP],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                # Own process group, so a timeout kills the running snippet too
+                start_new_session=True,
+            )
+            self._python = python
+        return self._proc
+
+    @staticmethod
+    def _read_reply(proc: subprocess.Popen[bytes], timeout: int) -> bytes:
+        assert proc.stdout is not None
+        fd = proc.stdout.fileno()
+        deadline = time.monotonic() + timeout
+        buf = bytearray()
+        need = -1
+        while need < 0 or len(buf) < need:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise TimeoutError
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise EOFError
+            buf += chunk
+            if need < 0 and b"\n" in buf:
+                header, _, rest = buf.partition(b"\n")
+                need = int(header)
+                buf = rest
+        return bytes(buf[:need])
+
+    def _close(self) -> None:
+        if self._proc is not None:
+            try:
+                os.killpg(self._proc.pid, signal.SIGKILL)
+            except OSError:
+                self._proc.kill()
+            self._proc.wait()
+            self._proc = None
+
+
+_py_worker = _PyWorker()
+
+
 def run_python(
     code: str,
     *,
@@ -110,16 +354,25 @@ def run_python(
     timeout: int = DEFAULT_TIMEOUT,
     confirm: bool = True,
 ) -> dict[str, str | int]:
-    """Write *code* to a temp file and execute it with ``python``.
+    """Execute *code* with Python and return its output.
+
+    On POSIX the code runs in a persistent worker interpreter, skipping the
+    interpreter start-up on every call; elsewhere, or if the worker can't be
+    started, it is written to a temp file and run with ``python``.
 
     Args:
         confirm: If True (default), show the code and prompt before running.
     """
     if confirm:
-        console.print(Panel(code, title="Python code to execute", border_style="magenta"))
+        _print_panel(code, title="Python code to execute", border_style="magenta")
         if not _confirm("Run this Python code?"):
             return {"stdout": "", "stderr": "[SKIPPED] User declined.", "returncode": -1}
 
+    if os.name == "posix":
+        result = _py_worker.run(code, cwd=cwd, timeout=timeout)
+        if result is not None:
+            return result
+
     with tempfile.NamedTemporaryFile(
         mode="w", suffix=".py", dir=str(cwd), delete=False, encoding="utf-8"
     ) as tmp:
@@ -138,7 +391,39 @@ def run_python(
     return result
 
 
-def spawn_agent(task: str, *, cwd: str | Path = ".") -> dict[str, str | int]:
+def spawn_agent(task: str, *, cwd: str | Path = ".", confirm: bool = True) -> dict[str, str | int]:
     """Spawn a background sub-task (runs as a detached subprocess)."""
     logger.info("Spawning agent for: %s", task)
-    return run_shell(task, cwd=cwd, timeout=60)
+    return run_shell(task, cwd=cwd, timeout=60, confirm=confirm)
+
+
+_MAX_AGENTS = 8
+
+
+def spawn_agents(
+    tasks: list[str], *, cwd: str | Path = ".", confirm: bool = True
+) -> Iterator[tuple[str, dict[str, str | int]]]:
+    """Run several sub-tasks concurrently, yielding ``(task, result)`` as each finishes.
+
+    The whole batch is confirmed once up front; each task then runs through
+    :func:`run_shell`, so blocked commands are still refused individually.
+    """
+    if confirm:
+        _print_panel("\n".join(tasks), title="Commands to run", border_style="cyan")
+        if not _confirm(f"Execute these {len(tasks)} commands?"):
+            skipped: dict[str, str | int] = {
+                "stdout": "",
+                "stderr": "[SKIPPED] User declined.",
+                "returncode": -1,
+            }
+            for task in tasks:
+                yield task, dict(skipped)
+            return
+
+    logger.info("Spawning %d agents", len(tasks))
+    with ThreadPoolExecutor(max_workers=min(_MAX_AGENTS, len(tasks))) as pool:
+        futures = {
+            pool.submit(run_shell, task, cwd=cwd, timeout=60, confirm=False): task for task in tasks
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
@@ -3,25 +3,52 @@
 from __future__ import annotations
 
 import logging
+import os
 import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Inheriting fds is opt-in since PEP 446, so on Linux the close-fds scan
+# subprocess does before every exec buys nothing.
+_CLOSE_FDS = sys.platform != "linux"
+
 DEFAULT_TIMEOUT = 30
 
+# is_git_repo/current_branch answers, keyed by (query, resolved cwd).  The chat
+# loop asks these repeatedly; commands that can change them clear the cache.
+_REPO_CACHE_TTL = 5.0
+_REPO_CACHE: dict[tuple[str, Path], tuple[float, Any]] = {}
+_REPO_CACHE_LOCK = threading.Lock()
+
 
 class GitError(Exception):
     """Raised when a git operation fails."""
 
 
-def _run_git(args: list[str], *, cwd: str | Path = ".", timeout: int = DEFAULT_TIMEOUT) -> str:
+def _run_git(
+    args: list[str],
+    *,
+    cwd: str | Path = ".",
+    timeout: int = DEFAULT_TIMEOUT,
+    read_only: bool = False,
+) -> str:
     """Run a git subcommand and return stdout.
 
+    ``read_only`` sets ``GIT_OPTIONAL_LOCKS=0`` so commands like ``status``
+    don't take the index lock just to refresh stat info.
+
     Raises GitError on non-zero exit.
     """
     cmd = ["git", *args]
     logger.debug("git: %s", " ".join(cmd))
+    env = {**os.environ, "GIT_OPTIONAL_LOCKS": "0"} if read_only else None
     try:
         result = subprocess.run(
             cmd,
@@ -29,6 +56,8 @@ def _run_git(args: list[str], *, cwd: str | Path = ".", timeout: int = DEFAULT_T
             text=True,
             cwd=str(cwd),
             timeout=timeout,
+            close_fds=_CLOSE_FDS,
+            env=env,
         )
     except FileNotFoundError as exc:
         raise GitError("git is not installed or not on PATH") from exc
@@ -42,6 +71,28 @@ def _run_git(args: list[str], *, cwd: str | Path = ".", timeout: int = DEFAULT_T
     return result.stdout
 
 
+def _repo_cached(query: str, cwd: str | Path, fetch: Callable[[], Any]) -> Any:
+    """Return a cached answer for *query* in *cwd*, calling *fetch* on a miss.
+
+    Exceptions from *fetch* propagate and are not cached.
+    """
+    key = (query, Path(cwd).resolve())
+    with _REPO_CACHE_LOCK:
+        hit = _REPO_CACHE.get(key)
+    if hit is not None and time.monotonic() - hit[0] < _REPO_CACHE_TTL:
+        return hit[1]
+    value = fetch()
+    with _REPO_CACHE_LOCK:
+        _REPO_CACHE[key] = (time.monotonic(), value)
+    return value
+
+
+def clear_repo_cache() -> None:
+    """Forget cached is_git_repo/current_branch answers."""
+    with _REPO_CACHE_LOCK:
+        _REPO_CACHE.clear()
+
+
 # ---------------------------------------------------------------------------
 # Porcelain commands
 # ---------------------------------------------------------------------------
@@ -49,7 +100,7 @@ def _run_git(args: list[str], *, cwd: str | Path = ".", timeout: int = DEFAULT_T
 
 def status(cwd: str | Path = ".") -> str:
     """Return ``git status`` output."""
-    return _run_git(["status", "--short", "--branch"], cwd=cwd)
+    return _run_git(["status", "--short", "--branch"], cwd=cwd, read_only=True)
 
 
 def diff(cwd: str | Path = ".", *, staged: bool = False, path: str = "") -> str:
@@ -59,20 +110,21 @@ def diff(cwd: str | Path = ".", *, staged: bool = False, path: str = "") -> str:
         args.append("--cached")
     if path:
         args.extend(["--", path])
-    return _run_git(args, cwd=cwd)
+    return _run_git(args, cwd=cwd, read_only=True)
 
 
 def log(cwd: str | Path = ".", *, count: int = 10, oneline: bool = True) -> str:
     """Return ``git log`` output."""
     args = ["log", f"-{count}"]
     if oneline:
-        args.append("--oneline")
-    return _run_git(args, cwd=cwd)
+        # Explicit format: same text as --oneline, without decoration lookups
+        args.append("--format=%h %s")
+    return _run_git(args, cwd=cwd, read_only=True)
 
 
 def branch(cwd: str | Path = ".") -> str:
     """Return ``git branch`` output."""
-    return _run_git(["branch", "-a"], cwd=cwd)
+    return _run_git(["branch", "-a"], cwd=cwd, read_only=True)
 
 
 def checkout(target: str, *, cwd: str | Path = ".", create: bool = False) -> str:
@@ -81,7 +133,10 @@ def checkout(target: str, *, cwd: str | Path = ".", create: bool = False) -> str
     if create:
         args.append("-b")
     args.append(target)
-    return _run_git(args, cwd=cwd)
+    try:
+        return _run_git(args, cwd=cwd)
+    finally:
+        clear_repo_cache()
 
 
 def add(files: list[str] | str = ".", *, cwd: str | Path = ".") -> str:
@@ -93,7 +148,10 @@ def add(files: list[str] | str = ".", *, cwd: str | Path = ".") -> str:
 
 def commit(message: str, *, cwd: str | Path = ".") -> str:
     """Create a commit with the given message."""
-    return _run_git(["commit", "-m", message], cwd=cwd)
+    try:
+        return _run_git(["commit", "-m", message], cwd=cwd)
+    finally:
+        clear_repo_cache()
 
 
 def push(
@@ -119,7 +177,10 @@ def pull(
     args = ["pull", remote]
     if branch_name:
         args.append(branch_name)
-    return _run_git(args, cwd=cwd)
+    try:
+        return _run_git(args, cwd=cwd)
+    finally:
+        clear_repo_cache()
 
 
 def stash(action: str = "push", *, cwd: str | Path = ".") -> str:
@@ -129,7 +190,10 @@ def stash(action: str = "push", *, cwd: str | Path = ".") -> str:
 
 def init(cwd: str | Path = ".") -> str:
     """Initialize a new git repository."""
-    return _run_git(["init"], cwd=cwd)
+    try:
+        return _run_git(["init"], cwd=cwd)
+    finally:
+        clear_repo_cache()
 
 
 _SAFE_CLONE_SCHEMES = ("https://", "http://", "git://", "ssh://", "git@")
@@ -149,17 +213,20 @@ def clone(url: str, dest: str = "", *, cwd: str | Path = ".") -> str:
     args = ["clone", url]
     if dest:
         args.append(dest)
-    return _run_git(args, cwd=cwd)
+    try:
+        return _run_git(args, cwd=cwd)
+    finally:
+        clear_repo_cache()
 
 
 def remote_list(cwd: str | Path = ".") -> str:
     """List remotes."""
-    return _run_git(["remote", "-v"], cwd=cwd)
+    return _run_git(["remote", "-v"], cwd=cwd, read_only=True)
 
 
 def show(ref: str = "HEAD", *, cwd: str | Path = ".") -> str:
     """Show a commit."""
-    return _run_git(["show", "--stat", ref], cwd=cwd)
+    return _run_git(["show", "--stat", ref], cwd=cwd, read_only=True)
 
 
 # ---------------------------------------------------------------------------
@@ -169,35 +236,62 @@ def show(ref: str = "HEAD", *, cwd: str | Path = ".") -> str:
 
 def is_git_repo(cwd: str | Path = ".") -> bool:
     """Check if the given directory is inside a git repository."""
-    try:
-        _run_git(["rev-parse", "--is-inside-work-tree"], cwd=cwd)
-        return True
-    except GitError:
-        return False
+
+    def fetch() -> bool:
+        try:
+            _run_git(["rev-parse", "--is-inside-work-tree"], cwd=cwd, read_only=True)
+            return True
+        except GitError:
+            return False
+
+    result: bool = _repo_cached("is_git_repo", cwd, fetch)
+    return result
 
 
 def current_branch(cwd: str | Path = ".") -> str:
     """Return the current branch name."""
-    return _run_git(["rev-parse", "--abbrev-ref", "HEAD"], cwd=cwd).strip()
+    branch_name: str = _repo_cached(
+        "current_branch",
+        cwd,
+        lambda: _run_git(["rev-parse", "--abbrev-ref", "HEAD"], cwd=cwd, read_only=True).strip(),
+    )
+    return branch_name
+
+
+def _branch_from_status(status_output: str) -> str:
+    """Pull the branch name out of ``status --short --branch`` output.
+
+    The first line is ``## <branch>[...<upstream>] [ahead N]``, ``## No commits
+    yet on <branch>`` or ``## HEAD (no branch)``.  Branch names can't contain
+    ``..``, so splitting on ``...`` is safe.
+    """
+    header = status_output.partition("\n")[0]
+    if not header.startswith("## "):
+        raise GitError("git status output has no branch header")
+    head = header[3:]
+    if head.startswith("No commits yet on "):
+        return head[len("No commits yet on ") :]
+    if head.startswith("HEAD (no branch)"):
+        return "HEAD"
+    return head.split("...", 1)[0].split(" ", 1)[0]
 
 
 def summary(cwd: str | Path = ".") -> str:
     """Return a short summary: branch, status, recent commits."""
-    parts: list[str] = []
-    try:
-        parts.append(f"Branch: {current_branch(cwd)}")
-    except GitError:
-        return "[not a git repository]"
+    # status --branch carries the branch name too, so two commands cover all
+    # three sections; they're independent, so run them side by side
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        status_future = pool.submit(status, cwd)
+        log_future = pool.submit(log, cwd, count=5)
 
     try:
-        st = status(cwd)
-        parts.append(f"Status:\n{st}")
+        st = status_future.result()
+        parts = [f"Branch: {_branch_from_status(st)}", f"Status:\n{st}"]
     except GitError:
-        pass
+        return "[not a git repository]"
 
     try:
-        lg = log(cwd, count=5)
-        parts.append(f"Recent commits:\n{lg}")
+        parts.append(f"Recent commits:\n{log_future.result()}")
     except GitError:
         pass
 
@@ -2,42 +2,49 @@
 
 from __future__ import annotations
 
+import io
 import logging
+import os
+import re
+import shlex
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import fields
+from functools import lru_cache, partial
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import typer
-from rich.console import Console
-from rich.markdown import Markdown
+from rich.console import Console, Group
+from rich.markup import escape
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 
 from grok_mccodin import __version__
-from grok_mccodin.client import GrokClient, GrokAPIError, SYSTEM_PROMPT
-from grok_mccodin.config import Config
-from grok_mccodin.editor import (
-    _safe_resolve,
-    apply_create,
-    apply_delete,
-    apply_edit,
-    extract_code_blocks,
-    extract_commands,
-    extract_creates,
-    extract_deletes,
+from grok_mccodin.config import Config, reload_dotenv
+from grok_mccodin.executor import _confirm, is_safe, run_shell, spawn_agent, spawn_agents
+from grok_mccodin.utils import (
+    FolderIndex,
+    flush_receipts,
+    index_folder,
+    json_loads,
+    log_receipt,
+    read_file_safe,
+    take_screenshot,
 )
-from grok_mccodin.database import DatabaseError, SQLiteDB
-from grok_mccodin.docker import DockerError
-from grok_mccodin.docker import summary as docker_summary
-from grok_mccodin.executor import _confirm, run_shell, spawn_agent
-from grok_mccodin.git import GitError
-from grok_mccodin.git import summary as git_summary
-from grok_mccodin.mcp import MCPError, MCPRegistry
-from grok_mccodin.packages import PackageError, pip_install, npm_install
-from grok_mccodin.memory import ConversationMemory, estimate_tokens
-from grok_mccodin.rag import search_codebase
-from grok_mccodin.social import post_to_x, search_giphy
-from grok_mccodin.utils import index_folder, log_receipt, read_file_safe, take_screenshot
-from grok_mccodin.web import web_fetch, web_search
+
+# Subsystems (and the requests/markdown stacks behind them) are imported where
+# they're used, so `version`, `index` and simple slash commands start fast
+if TYPE_CHECKING:
+    from grok_mccodin.client import GrokClient
+    from grok_mccodin.database import SQLiteDB
+    from grok_mccodin.mcp import MCPRegistry
+    from grok_mccodin.memory import ConversationMemory
 
 app = typer.Typer(
     name="grok-mccodin",
@@ -45,7 +52,8 @@ app = typer.Typer(
     add_completion=False,
     rich_markup_mode="rich",
 )
-console = Console()
+# Output is styled through explicit markup; skip the regex repr-highlighter on every print
+console = Console(highlight=False)
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -63,12 +71,14 @@ BANNER = r"""
 SLASH_COMMANDS = {
     "/help": "Show available commands",
     "/safelock": "Toggle Safe Lock (blocks execution)",
+    "/nocache": "Toggle reusing cached replies for repeated prompts",
     "/index": "Re-index the working folder",
     "/screenshot": "Take a screenshot",
     "/giphy <query>": "Search Giphy for a GIF",
     "/post <text>": "Post to X/Twitter",
     "/run <cmd>": "Run a shell command",
-    "/agent <task>": "Spawn a background agent task",
+    "/agent <task>": "Spawn a background agent task (';;' runs several in parallel)",
+    "/spawn <task>": "Run a task in the background without an LLM turn",
     "/read <file>": "Read and display a file",
     "/search <query>": "Search the web (DuckDuckGo)",
     "/browse <url>": "Fetch and display a web page",
@@ -79,23 +89,30 @@ SLASH_COMMANDS = {
     "/docker [cmd]": "Docker container management",
     "/rag <query>": "Semantic code search (RAG)",
     "/mcp [cmd]": "MCP server management",
-    "/log": "Show the receipt log",
+    "/log [N|all]": "Show the last N lines of the receipt log (default 200)",
     "/save [name]": "Save conversation session",
     "/load <name>": "Load a saved session",
     "/sessions": "List saved sessions",
     "/memory": "Show memory stats",
+    "/reload": "Re-read .env and rebuild the API client",
     "/clear": "Clear conversation history and memory",
     "/quit": "Exit the CLI",
 }
 
 
-def _print_help() -> None:
+@lru_cache(maxsize=1)
+def _help_table() -> Table:
+    """Build the help table once; SLASH_COMMANDS never changes at runtime."""
     table = Table(title="Grok McCodin Commands", border_style="cyan")
     table.add_column("Command", style="bold green")
     table.add_column("Description")
     for cmd, desc in SLASH_COMMANDS.items():
         table.add_row(cmd, desc)
-    console.print(table)
+    return table
+
+
+def _print_help() -> None:
+    console.print(_help_table())
 
 
 # Global MCP registry (lazily initialized)
@@ -104,11 +121,16 @@ _mcp_registry: MCPRegistry | None = None
 # Global conversation memory (lazily initialized)
 _current_memory: ConversationMemory | None = None
 
+# SQLite handle kept open across /sql calls so its page cache and mmap survive
+_sql_db: SQLiteDB | None = None
+
 
 def _get_memory(config: Config) -> ConversationMemory:
     """Get or create the conversation memory instance."""
     global _current_memory
     if _current_memory is None:
+        from grok_mccodin.memory import ConversationMemory
+
         _current_memory = ConversationMemory(
             token_budget=config.token_budget,
             keep_recent=config.keep_recent,
@@ -122,6 +144,8 @@ def _get_mcp_registry(folder: Path) -> MCPRegistry:
     """Get or create the MCP registry, loading config from project."""
     global _mcp_registry
     if _mcp_registry is None:
+        from grok_mccodin.mcp import MCPRegistry
+
         _mcp_registry = MCPRegistry()
         config_path = folder / "mcp_servers.json"
         _mcp_registry.load_config(config_path)
@@ -130,6 +154,8 @@ def _get_mcp_registry(folder: Path) -> MCPRegistry:
 
 def _handle_mcp(arg: str, config: Config, folder: Path) -> None:
     """Handle /mcp subcommands."""
+    from grok_mccodin.mcp import MCPError
+
     registry = _get_mcp_registry(folder)
 
     if not arg or arg == "list":
@@ -153,8 +179,20 @@ def _handle_mcp(arg: str, config: Config, folder: Path) -> None:
 
     try:
         if sub_cmd == "connect" and sub_arg:
-            client = registry.connect(sub_arg)
-            console.print(f"[green]Connected to MCP server: {sub_arg}[/green]")
+            names = registry.server_names if sub_arg == "all" else sub_arg.split()
+            if len(names) != 1:
+                # Several servers start concurrently; one failing doesn't stop the rest
+                failed = registry.connect_all(names)
+                for name in names:
+                    if name in failed:
+                        console.print(f"[red]{name}: {failed[name]}[/red]")
+                    else:
+                        console.print(f"[green]Connected to MCP server: {name}[/green]")
+                if not names:
+                    console.print("[yellow]No MCP servers configured.[/yellow]")
+                return
+            client = registry.connect(names[0])
+            console.print(f"[green]Connected to MCP server: {names[0]}[/green]")
             tools = client.list_tools()
             if tools:
                 console.print(f"  Available tools: {len(tools)}")
@@ -187,9 +225,7 @@ def _handle_mcp(arg: str, config: Config, folder: Path) -> None:
                     f"[red]Server not connected: {server_name}. Use /mcp connect first.[/red]"
                 )
                 return None
-            import json
-
-            tool_args = json.loads(tool_args_str)
+            tool_args = json_loads(tool_args_str)
             result = client.call_tool(tool_name, tool_args)
             for block in result:
                 if block.get("type") == "text":
@@ -198,7 +234,7 @@ def _handle_mcp(arg: str, config: Config, folder: Path) -> None:
                     console.print(str(block))
         else:
             console.print(
-                "[red]Usage: /mcp list | connect <name> | disconnect <name> | "
+                "[red]Usage: /mcp list | connect <name...|all> | disconnect <name> | "
                 "tools | call <server>.<tool> [json_args][/red]"
             )
     except MCPError as exc:
@@ -227,15 +263,39 @@ def _cmd_safelock(arg: str, config: Config, folder: Path) -> str | None:
     return None
 
 
+def _cmd_nocache(arg: str, config: Config, folder: Path) -> str | None:
+    config.use_cache = not config.use_cache
+    state = "ON" if config.use_cache else "OFF (fresh replies; still cached)"
+    console.print(f"[bold]Reply cache: {state}[/bold]")
+    return None
+
+
 def _cmd_index(arg: str, config: Config, folder: Path) -> str | None:
     idx = index_folder(folder)
-    console.print(Panel(idx, title="Project Index", border_style="blue"))
+    console.print(Panel(Text(idx), title="Project Index", border_style="blue"))
     return None
 
 
+def _in_background(name: str, work: Callable[[], None]) -> None:
+    """Run *work* on a daemon thread so the prompt comes straight back."""
+
+    def _target() -> None:
+        try:
+            work()
+        except Exception as exc:
+            logger.exception("Background task %s failed", name)
+            console.print(f"[red]{name} failed: {escape(str(exc))}[/red]")
+
+    threading.Thread(target=_target, name=name, daemon=True).start()
+
+
 def _cmd_screenshot(arg: str, config: Config, folder: Path) -> str | None:
-    path = take_screenshot()
-    console.print(f"Screenshot saved: {path}")
+    def _capture() -> None:
+        path = take_screenshot()
+        console.print(Text(f"Screenshot saved: {path}"))
+
+    # pyautogui's first import and the PNG encode take a second or two
+    _in_background("screenshot", _capture)
     return None
 
 
@@ -243,12 +303,19 @@ def _cmd_giphy(arg: str, config: Config, folder: Path) -> str | None:
     if not arg:
         console.print("[red]Usage: /giphy <search query>[/red]")
         return None
-    results = search_giphy(arg, config)
-    if results:
-        for i, r in enumerate(results, 1):
-            console.print(f"  {i}. {r['title']}: {r['url']}")
-    else:
-        console.print("[yellow]No results found.[/yellow]")
+
+    def _search() -> None:
+        from grok_mccodin.social import search_giphy
+
+        results = search_giphy(arg, config)
+        if results:
+            rows = [f"  {i}. {r['title']}: {r['url']}" for i, r in enumerate(results, 1)]
+            console.print(Text("\n".join([f"Giphy: {arg}", *rows])))
+        else:
+            console.print(f"[yellow]No Giphy results for: {escape(arg)}[/yellow]")
+
+    _in_background("giphy", _search)
+    console.print("[dim]Searching Giphy in the background...[/dim]")
     return None
 
 
@@ -256,9 +323,16 @@ def _cmd_post(arg: str, config: Config, folder: Path) -> str | None:
     if not arg:
         console.print("[red]Usage: /post <tweet text>[/red]")
         return None
-    result = post_to_x(arg, config)
-    console.print(result)
-    log_receipt(config.log_file, action="x_post", detail=result)
+
+    def _post() -> None:
+        from grok_mccodin.social import post_to_x
+
+        result = post_to_x(arg, config)
+        console.print(result)
+        log_receipt(config.log_file, action="x_post", detail=result)
+
+    _in_background("x-post", _post)
+    console.print("[dim]Posting to X in the background...[/dim]")
     return None
 
 
@@ -277,26 +351,103 @@ def _cmd_run(arg: str, config: Config, folder: Path) -> str | None:
 
 def _cmd_agent(arg: str, config: Config, folder: Path) -> str | None:
     if not arg:
-        console.print("[red]Usage: /agent <task>[/red]")
+        console.print("[red]Usage: /agent <task> [;; <task> ...][/red]")
         return None
-    agent_out = spawn_agent(arg, cwd=folder)
-    if agent_out["stdout"]:
-        console.print(agent_out["stdout"])
-    if agent_out["stderr"]:
-        console.print(f"[red]{agent_out['stderr']}[/red]")
+    tasks = [t.strip() for t in arg.split(";;") if t.strip()]
+    if len(tasks) == 1:
+        results = iter([(tasks[0], spawn_agent(tasks[0], cwd=folder))])
+    else:
+        results = spawn_agents(tasks, cwd=folder)
+    for task, agent_out in results:
+        if len(tasks) > 1:
+            console.print(f"\n[bold cyan]{task}[/bold cyan] (exit {agent_out['returncode']})")
+        if agent_out["stdout"]:
+            console.print(agent_out["stdout"])
+        if agent_out["stderr"]:
+            console.print(f"[red]{agent_out['stderr']}[/red]")
     return None
 
 
+def _parse_spawn_args(arg: str) -> tuple[str, str]:
+    """Split ``/spawn`` input into ``(label, task)``.
+
+    Leading options are tokenized with shlex (so labels may be quoted); the
+    task is everything after them, passed through untouched.  Raises
+    ValueError on an unknown option, a missing value, or an empty task.
+    """
+    label = ""
+    rest = arg.strip()
+    while rest.startswith("--"):
+        stream = io.StringIO(rest)
+        lex = shlex.shlex(stream, posix=True)
+        lex.whitespace_split = True
+        flag = lex.get_token() or ""
+        if flag == "--label":
+            value = lex.get_token()
+        elif flag.startswith("--label="):
+            value = flag[len("--label=") :]
+        else:
+            raise ValueError(f"unknown option {flag}")
+        if not value:
+            raise ValueError("--label needs a value")
+        label = value
+        # shlex has consumed the option and one separator; the task is the rest
+        rest = stream.read().strip()
+    if not rest:
+        raise ValueError("no task given")
+    return label, rest
+
+
+def _cmd_spawn(arg: str, config: Config, folder: Path) -> str | None:
+    try:
+        label, arg = _parse_spawn_args(arg)
+    except ValueError as exc:
+        console.print(f"[red]{escape(str(exc))}. Usage: /spawn [--label <name>] <task>[/red]")
+        return None
+    if config.safe_lock:
+        console.print(f"[yellow][Safe Lock] Skipping spawn: {arg}[/yellow]")
+        return None
+    if not is_safe(arg):
+        console.print(f"[red][BLOCKED] Dangerous command: {arg}[/red]")
+        return None
+    label = label or arg
+
+    def _run() -> None:
+        out = spawn_agent(arg, cwd=folder, confirm=False)
+        status = "done" if out["returncode"] == 0 else f"exit {out['returncode']}"
+        console.print(Text(f"[spawn] {label}: {status}", style="bold cyan"))
+        output = f"{out['stdout']}{out['stderr']}".strip()
+        if output:
+            console.print(Text(output))
+        log_receipt(config.log_file, action="spawn", detail=f"{label}: {status}\n{output[-2000:]}")
+
+    # No confirmation prompt and no LLM turn: the task runs while chat continues
+    _in_background(f"spawn-{label}", _run)
+    console.print(f"[dim]Spawned in background: {label}[/dim]")
+    return None
+
+
+_PANEL_MAX_CHARS = 64 * 1024
+
+
 def _cmd_read(arg: str, config: Config, folder: Path) -> str | None:
     if not arg:
         console.print("[red]Usage: /read <filepath>[/red]")
         return None
+    from grok_mccodin.editor import _safe_resolve
+
     resolved = _safe_resolve(arg, folder)
     if resolved is None:
         console.print(f"[red]Blocked: path escapes project folder: {arg}[/red]")
         return None
     content = read_file_safe(resolved)
-    console.print(Panel(content, title=arg, border_style="green"))
+    if len(content) > _PANEL_MAX_CHARS:
+        # Laying out a panel around a huge file is slow; print it raw instead
+        console.rule(arg, style="green")
+        console.out(content)
+    else:
+        # Text() keeps file contents from being parsed as console markup
+        console.print(Panel(Text(content), title=arg, border_style="green"))
     return None
 
 
@@ -304,16 +455,25 @@ def _cmd_search(arg: str, config: Config, folder: Path) -> str | None:
     if not arg:
         console.print("[red]Usage: /search <query>[/red]")
         return None
-    results = web_search(arg)
-    if results:
-        for i, r in enumerate(results, 1):
-            console.print(f"  {i}. [bold]{r['title']}[/bold]")
-            console.print(f"     {r['url']}")
-            if r.get("snippet"):
-                console.print(f"     [dim]{r['snippet'][:120]}[/dim]")
-    else:
-        console.print("[yellow]No search results found.[/yellow]")
-    log_receipt(config.log_file, action="web_search", detail=arg)
+
+    def _search() -> None:
+        from grok_mccodin.web import web_search
+
+        results = web_search(arg)
+        if results:
+            lines = [f"Search: {escape(arg)}"]
+            for i, r in enumerate(results, 1):
+                lines.append(f"  {i}. [bold]{escape(r['title'])}[/bold]")
+                lines.append(f"     {escape(r['url'])}")
+                if r.get("snippet"):
+                    lines.append(f"     [dim]{escape(r['snippet'][:120])}[/dim]")
+            console.print("\n".join(lines))
+        else:
+            console.print(f"[yellow]No search results for: {escape(arg)}[/yellow]")
+        log_receipt(config.log_file, action="web_search", detail=arg)
+
+    _in_background("web-search", _search)
+    console.print("[dim]Searching the web in the background...[/dim]")
     return None
 
 
@@ -321,23 +481,30 @@ def _cmd_browse(arg: str, config: Config, folder: Path) -> str | None:
     if not arg:
         console.print("[red]Usage: /browse <url>[/red]")
         return None
-    page = web_fetch(arg)
-    if page["error"]:
-        console.print(f"[red]Error: {page['error']}[/red]")
-    else:
-        title = page["title"] or page["url"]
-        console.print(Panel(page["text"][:3000], title=title, border_style="blue"))
-    log_receipt(config.log_file, action="web_browse", detail=arg)
+
+    def _browse() -> None:
+        from grok_mccodin.web import web_fetch
+
+        page = web_fetch(arg)
+        if page["error"]:
+            console.print(f"[red]Error: {escape(page['error'])}[/red]")
+        else:
+            title = escape(page["title"] or page["url"])
+            console.print(Panel(Text(page["text"][:3000]), title=title, border_style="blue"))
+        log_receipt(config.log_file, action="web_browse", detail=arg)
+
+    _in_background("web-browse", _browse)
+    console.print("[dim]Fetching page in the background...[/dim]")
     return None
 
 
 def _cmd_git(arg: str, config: Config, folder: Path) -> str | None:
+    from grok_mccodin import git as git_mod
+
     try:
         if not arg:
-            console.print(Panel(git_summary(folder), title="Git Summary", border_style="green"))
+            console.print(Panel(git_mod.summary(folder), title="Git Summary", border_style="green"))
         else:
-            from grok_mccodin import git as git_mod
-
             sub_parts = arg.split(maxsplit=1)
             sub_cmd = sub_parts[0]
             sub_arg = sub_parts[1] if len(sub_parts) > 1 else ""
@@ -368,7 +535,7 @@ def _cmd_git(arg: str, config: Config, folder: Path) -> str | None:
                 console.print(git_mod.stash(sub_arg or "push", cwd=folder))
             else:
                 console.print(f"[red]Unknown git subcommand: {sub_cmd}[/red]")
-    except GitError as exc:
+    except git_mod.GitError as exc:
         console.print(f"[red]Git error: {exc}[/red]")
     log_receipt(config.log_file, action="git", detail=arg)
     return None
@@ -378,6 +545,8 @@ def _cmd_pip(arg: str, config: Config, folder: Path) -> str | None:
     if not arg:
         console.print("[red]Usage: /pip install <pkg> | /pip list | /pip show <pkg>[/red]")
         return None
+    from grok_mccodin import packages as pkg_mod
+
     try:
         sub_parts = arg.split(maxsplit=1)
         sub_cmd = sub_parts[0]
@@ -386,27 +555,21 @@ def _cmd_pip(arg: str, config: Config, folder: Path) -> str | None:
             if not _confirm(f"Install pip package: {sub_arg}?"):
                 console.print("[dim]Install cancelled.[/dim]")
                 return None
-            output = pip_install(sub_arg, cwd=folder)
+            output = pkg_mod.pip_install(sub_arg, cwd=folder)
             console.print(output)
         elif sub_cmd == "list":
-            from grok_mccodin.packages import pip_list
-
-            pkgs = pip_list(cwd=folder)
+            pkgs = pkg_mod.pip_list(cwd=folder)
             for pkg in pkgs[:50]:
                 console.print(f"  {pkg['name']}=={pkg['version']}")
             if len(pkgs) > 50:
                 console.print(f"  ... and {len(pkgs) - 50} more")
         elif sub_cmd == "show" and sub_arg:
-            from grok_mccodin.packages import pip_show
-
-            console.print(pip_show(sub_arg, cwd=folder))
+            console.print(pkg_mod.pip_show(sub_arg, cwd=folder))
         elif sub_cmd == "freeze":
-            from grok_mccodin.packages import pip_freeze
-
-            console.print(pip_freeze(cwd=folder))
+            console.print(pkg_mod.pip_freeze(cwd=folder))
         else:
             console.print("[red]Usage: /pip install <pkg> | /pip list | /pip show <pkg>[/red]")
-    except PackageError as exc:
+    except pkg_mod.PackageError as exc:
         console.print(f"[red]pip error: {exc}[/red]")
     log_receipt(config.log_file, action="pip", detail=arg)
     return None
@@ -416,6 +579,8 @@ def _cmd_npm(arg: str, config: Config, folder: Path) -> str | None:
     if not arg:
         console.print("[red]Usage: /npm install [pkg] | /npm list | /npm run <script>[/red]")
         return None
+    from grok_mccodin import packages as pkg_mod
+
     try:
         sub_parts = arg.split(maxsplit=1)
         sub_cmd = sub_parts[0]
@@ -425,24 +590,45 @@ def _cmd_npm(arg: str, config: Config, folder: Path) -> str | None:
             if not _confirm(f"Install npm package: {label}?"):
                 console.print("[dim]Install cancelled.[/dim]")
                 return None
-            output = npm_install(sub_arg or None, cwd=folder)
+            output = pkg_mod.npm_install(sub_arg or None, cwd=folder)
             console.print(output)
         elif sub_cmd == "list":
-            from grok_mccodin.packages import npm_list
-
-            console.print(npm_list(cwd=folder))
+            console.print(pkg_mod.npm_list(cwd=folder))
         elif sub_cmd == "run" and sub_arg:
-            from grok_mccodin.packages import npm_run
-
-            console.print(npm_run(sub_arg, cwd=folder))
+            console.print(pkg_mod.npm_run(sub_arg, cwd=folder))
         else:
             console.print("[red]Usage: /npm install [pkg] | /npm list | /npm run <script>[/red]")
-    except PackageError as exc:
+    except pkg_mod.PackageError as exc:
         console.print(f"[red]npm error: {exc}[/red]")
     log_receipt(config.log_file, action="npm", detail=arg)
     return None
 
 
+def _get_sql_db(db_path: str, *, must_exist: bool) -> SQLiteDB | None:
+    """Return the session's SQLite handle for *db_path*, opening it on first use.
+
+    The file is only checked for existence when a new handle is opened;
+    returns None if *must_exist* and it is missing.
+    """
+    global _sql_db
+    if _sql_db is not None and _sql_db.db_path == db_path:
+        return _sql_db
+    if must_exist and not os.path.isfile(db_path):
+        return None
+    from grok_mccodin.database import SQLiteDB
+
+    _close_sql_db()
+    _sql_db = SQLiteDB(db_path)
+    return _sql_db
+
+
+def _close_sql_db() -> None:
+    global _sql_db
+    if _sql_db is not None:
+        _sql_db.close()
+        _sql_db = None
+
+
 def _cmd_sql(arg: str, config: Config, folder: Path) -> str | None:
     if not arg:
         console.print(
@@ -450,53 +636,60 @@ def _cmd_sql(arg: str, config: Config, folder: Path) -> str | None:
         )
         return None
     db_path = str(folder / config.db_path)
-    is_read = (
-        arg.strip().upper().startswith("SELECT")
-        or arg.strip().upper().startswith("PRAGMA")
-        or arg.strip().upper() in ("SCHEMA", "TABLES")
-    )
-    if is_read and not Path(db_path).is_file():
+    # Classify from a short uppercased prefix rather than upper-casing the whole query
+    stripped = arg.strip()
+    head = stripped[:7].upper()
+    if head.startswith(("SELECT", "PRAGMA")):
+        kind = "QUERY"
+    elif head in ("SCHEMA", "TABLES"):
+        kind = head
+    else:
+        kind = "WRITE"
+    db = _get_sql_db(db_path, must_exist=kind != "WRITE")
+    if db is None:
         console.print(f"[yellow]Database not found: {db_path}[/yellow]")
         return None
+    from grok_mccodin.database import DatabaseError
+
     try:
-        db = SQLiteDB(db_path)
-        if arg.strip().upper().startswith("SELECT") or arg.strip().upper().startswith("PRAGMA"):
-            rows = db.query(arg)
+        if kind == "QUERY":
+            # Only the displayed rows are ever fetched from the cursor
+            rows = list(islice(db.iter_query(arg), 100))
             if rows:
                 tbl = Table(border_style="blue")
                 for col in rows[0]:
                     tbl.add_column(col)
-                for row in rows[:100]:
+                for row in rows:
                     tbl.add_row(*(str(v) for v in row.values()))
                 console.print(tbl)
             else:
                 console.print("[dim]No rows returned.[/dim]")
-        elif arg.strip().upper() == "SCHEMA":
+        elif kind == "SCHEMA":
             console.print(Panel(db.schema() or "[empty]", title="Schema", border_style="blue"))
-        elif arg.strip().upper() == "TABLES":
+        elif kind == "TABLES":
             for t in db.tables():
                 console.print(f"  {t}")
         else:
             if not _confirm(f"Execute SQL write: {arg[:80]}?"):
                 console.print("[dim]SQL execution cancelled.[/dim]")
-                db.close()
                 return None
             affected = db.execute(arg)
             console.print(f"[green]OK, {affected} row(s) affected.[/green]")
-        db.close()
     except DatabaseError as exc:
         console.print(f"[red]SQL error: {exc}[/red]")
+        # The file may have been replaced or removed; reopen (and re-check) next time
+        _close_sql_db()
     log_receipt(config.log_file, action="sql", detail=arg[:200])
     return None
 
 
 def _cmd_docker(arg: str, config: Config, folder: Path) -> str | None:
+    from grok_mccodin import docker as docker_mod
+
     try:
         if not arg:
-            console.print(Panel(docker_summary(folder), title="Docker", border_style="cyan"))
+            console.print(Panel(docker_mod.summary(folder), title="Docker", border_style="cyan"))
         else:
-            from grok_mccodin import docker as docker_mod
-
             sub_parts = arg.split(maxsplit=1)
             sub_cmd = sub_parts[0]
             sub_arg = sub_parts[1] if len(sub_parts) > 1 else ""
@@ -533,7 +726,7 @@ def _cmd_docker(arg: str, config: Config, folder: Path) -> str | None:
                 console.print(docker_mod.compose_down(cwd=folder))
             else:
                 console.print(f"[red]Unknown docker subcommand: {sub_cmd}[/red]")
-    except DockerError as exc:
+    except docker_mod.DockerError as exc:
         console.print(f"[red]Docker error: {exc}[/red]")
     log_receipt(config.log_file, action="docker", detail=arg)
     return None
@@ -543,6 +736,8 @@ def _cmd_rag(arg: str, config: Config, folder: Path) -> str | None:
     if not arg:
         console.print("[red]Usage: /rag <search query>[/red]")
         return None
+    from grok_mccodin.rag import search_codebase
+
     console.print("[dim]Searching codebase...[/dim]")
     rag_output = search_codebase(folder, arg)
     console.print(Panel(rag_output, title="RAG Search Results", border_style="magenta"))
@@ -555,12 +750,30 @@ def _cmd_mcp(arg: str, config: Config, folder: Path) -> str | None:
     return None
 
 
+_LOG_TAIL_LINES = 200
+
+
 def _cmd_log(arg: str, config: Config, folder: Path) -> str | None:
+    flush_receipts()
     log_path = Path(config.log_file)
-    if log_path.is_file():
-        console.print(log_path.read_text(encoding="utf-8"))
-    else:
+    if not log_path.is_file():
         console.print("[yellow]No log entries yet.[/yellow]")
+        return None
+    arg = arg.strip()
+    if arg == "all":
+        # Page the whole file through in fixed-size chunks
+        with console.pager(), open(log_path, encoding="utf-8", errors="replace") as fh:
+            for chunk in iter(lambda: fh.read(65536), ""):
+                console.out(chunk, end="")
+        return None
+    try:
+        lines = int(arg) if arg else _LOG_TAIL_LINES
+    except ValueError:
+        console.print("[red]Usage: /log [N|all][/red]")
+        return None
+    with open(log_path, encoding="utf-8", errors="replace") as fh:
+        tail = deque(fh, maxlen=max(lines, 1))
+    console.out("".join(tail).rstrip("\n"))
     return None
 
 
@@ -624,6 +837,28 @@ def _cmd_memory(arg: str, config: Config, folder: Path) -> str | None:
     return None
 
 
+# Session state that /reload leaves alone
+_RUNTIME_FIELDS = frozenset({"safe_lock", "use_cache", "log_file", "working_dir"})
+
+# Config fields set from command-line options; /reload must not undo them
+_cli_overrides: set[str] = set()
+
+
+def _apply_cli_override(config: Config, name: str, value: Any) -> None:
+    setattr(config, name, value)
+    _cli_overrides.add(name)
+
+
+def _cmd_reload(arg: str, config: Config, folder: Path) -> str | None:
+    reload_dotenv()
+    fresh = Config.from_env()
+    for f in fields(Config):
+        if f.name not in _RUNTIME_FIELDS and f.name not in _cli_overrides:
+            setattr(config, f.name, getattr(fresh, f.name))
+    console.print(f"[dim]Configuration reloaded (model: {config.grok_model}).[/dim]")
+    return "__RELOAD__"
+
+
 def _cmd_clear(arg: str, config: Config, folder: Path) -> str | None:
     return "__CLEAR__"
 
@@ -636,12 +871,14 @@ def _cmd_quit(arg: str, config: Config, folder: Path) -> str | None:
 _SLASH_DISPATCH: dict[str, Any] = {
     "/help": _cmd_help,
     "/safelock": _cmd_safelock,
+    "/nocache": _cmd_nocache,
     "/index": _cmd_index,
     "/screenshot": _cmd_screenshot,
     "/giphy": _cmd_giphy,
     "/post": _cmd_post,
     "/run": _cmd_run,
     "/agent": _cmd_agent,
+    "/spawn": _cmd_spawn,
     "/read": _cmd_read,
     "/search": _cmd_search,
     "/browse": _cmd_browse,
@@ -657,6 +894,7 @@ _SLASH_DISPATCH: dict[str, Any] = {
     "/load": _cmd_load,
     "/sessions": _cmd_sessions,
     "/memory": _cmd_memory,
+    "/reload": _cmd_reload,
     "/clear": _cmd_clear,
     "/quit": _cmd_quit,
 }
@@ -680,17 +918,118 @@ def _handle_slash(
     return None
 
 
-def _process_response(
-    reply: str,
-    config: Config,
-    folder: Path,
-) -> None:
-    """Parse Grok's reply, render as Markdown, and apply actions."""
-    # Show the reply as rendered markdown
-    console.print(Markdown(reply))
+# Minimum seconds between Markdown re-renders while a reply streams in
+_STREAM_RENDER_INTERVAL = 0.05
+
 
-    # Apply file/command actions
-    _process_actions(reply, config, folder)
+# A fence opener/closer: ``` or ~~~ at the start of a line (up to 3 spaces in)
+_FENCE_RE = re.compile(r"^ {0,3}(```|~~~)", re.MULTILINE)
+
+
+def _inside_fence(text: str, end: int) -> bool:
+    """Return True if ``text[:end]`` leaves a code fence open.
+
+    A fence only closes on the same marker that opened it, so a ``~~~`` line
+    inside a ``` block is content, not a closer.
+    """
+    fence: str | None = None
+    for match in _FENCE_RE.finditer(text, 0, end):
+        marker = match.group(1)
+        if fence is None:
+            fence = marker
+        elif marker == fence:
+            fence = None
+    return fence is not None
+
+
+def _settled_prefix(text: str) -> int:
+    """Return the length of *text* up to its last paragraph break outside a code fence.
+
+    Everything before that point renders the same however the reply
+    continues, so it can be printed once and dropped from the live view.
+    """
+    pos = text.rfind("\n\n")
+    while pos != -1:
+        if not _inside_fence(text, pos):
+            return pos + 2
+        pos = text.rfind("\n\n", 0, pos)
+    return 0
+
+
+def _stream_reply(client: GrokClient, messages: list[dict[str, str]]) -> tuple[str, bool]:
+    """Stream a reply, rendering it as Markdown as tokens arrive.
+
+    Finished paragraphs are printed once above the live region, which only
+    re-renders the paragraph still being written.
+
+    Returns ``(reply, interrupted)``.  GrokAPIError propagates.
+    """
+    from rich.live import Live
+    from rich.markdown import Markdown
+
+    # Token objects are dropped as they arrive instead of being held until a final join
+    buf = io.StringIO()
+    pending = ""
+    interrupted = False
+    last_render = 0.0
+    with Live(
+        Markdown(""), console=console, auto_refresh=False, vertical_overflow="visible"
+    ) as live:
+        try:
+            for token in client.chat_stream(messages):
+                buf.write(token)
+                pending += token
+                now = time.monotonic()
+                if now - last_render >= _STREAM_RENDER_INTERVAL:
+                    cut = _settled_prefix(pending)
+                    if cut:
+                        # The blank line stands in for the gap Markdown puts between blocks
+                        live.console.print(Markdown(pending[:cut]), "")
+                        pending = pending[cut:]
+                    live.update(Markdown(pending), refresh=True)
+                    last_render = now
+        except KeyboardInterrupt:
+            interrupted = True
+        live.update(Markdown(pending), refresh=True)
+    if interrupted:
+        console.print("[dim](interrupted)[/dim]")
+    return buf.getvalue(), interrupted
+
+
+_FILE_OP_WORKERS = 8
+
+
+def _run_file_ops(ops: list[tuple[str, str, Callable[[], str]]]) -> list[str]:
+    """Run file operations concurrently and return their statuses in input order.
+
+    Operations on the same path run one after another in reply order (an
+    edit followed by a delete must not race); distinct paths run in parallel.
+    """
+    chains: dict[str, list[int]] = {}
+    for i, (_, target, _) in enumerate(ops):
+        chains.setdefault(os.path.normpath(target), []).append(i)
+
+    statuses: list[str] = [""] * len(ops)
+
+    def run_chain(indices: list[int]) -> None:
+        for i in indices:
+            action, target, op = ops[i]
+            try:
+                statuses[i] = op()
+            except (OSError, ValueError) as exc:  # one bad file must not sink the rest
+                logger.warning("%s %s failed: %s", action, target, exc)
+                statuses[i] = f"[error] {action} {target}: {exc}"
+
+    if len(chains) <= 1:
+        for indices in chains.values():
+            run_chain(indices)
+        return statuses
+
+    with ThreadPoolExecutor(max_workers=min(_FILE_OP_WORKERS, len(chains))) as pool:
+        futures = [pool.submit(run_chain, indices) for indices in chains.values()]
+        for future in as_completed(futures):
+            future.result()
+    return statuses
 
 
 def _process_actions(
@@ -700,39 +1039,51 @@ def _process_actions(
 ) -> None:
     """Apply file edits, creates, deletes, and commands from Grok's reply.
 
-    Unlike _process_response, this does NOT render the reply text
-    (used when streaming has already printed it).
+    The reply text itself is not rendered; streaming has already printed it.
     """
-    # Apply file edits (code blocks with filenames)
-    for block in extract_code_blocks(reply):
+    from grok_mccodin.editor import apply_create, apply_delete, apply_edit, extract_all
+
+    actions = extract_all(reply)
+
+    # Collect file operations in reply order: edits, then creates, then deletes
+    file_ops: list[tuple[str, str, Callable[[], str]]] = []
+    for block in actions["blocks"]:
         if block["filename"]:
             if config.safe_lock:
                 console.print(f"[yellow][Safe Lock] Skipping edit: {block['filename']}[/yellow]")
                 continue
-            status = apply_edit(block["filename"], block["code"], base_dir=folder)
-            console.print(f"  -> {status}")
-            log_receipt(config.log_file, action="edit", detail=block["filename"])
-
-    # Apply creates
-    for create in extract_creates(reply):
+            file_ops.append(
+                (
+                    "edit",
+                    block["filename"],
+                    partial(apply_edit, block["filename"], block["code"], base_dir=folder),
+                )
+            )
+    for create in actions["creates"]:
         if config.safe_lock:
             console.print(f"[yellow][Safe Lock] Skipping create: {create['path']}[/yellow]")
             continue
-        status = apply_create(create["path"], create["code"], base_dir=folder)
-        console.print(f"  -> {status}")
-        log_receipt(config.log_file, action="create", detail=create["path"])
-
-    # Apply deletes
-    for delete_path in extract_deletes(reply):
+        file_ops.append(
+            (
+                "create",
+                create["path"],
+                partial(apply_create, create["path"], create["code"], base_dir=folder),
+            )
+        )
+    for delete_path in actions["deletes"]:
         if config.safe_lock:
             console.print(f"[yellow][Safe Lock] Skipping delete: {delete_path}[/yellow]")
             continue
-        status = apply_delete(delete_path, base_dir=folder)
-        console.print(f"  -> {status}")
-        log_receipt(config.log_file, action="delete", detail=delete_path)
+        file_ops.append(
+            ("delete", delete_path, partial(apply_delete, delete_path, base_dir=folder))
+        )
+
+    for (action, target, _), status in zip(file_ops, _run_file_ops(file_ops)):
+        console.print(f"  -> {escape(status)}")
+        log_receipt(config.log_file, action=action, detail=target)
 
     # Execute RUN commands
-    for command in extract_commands(reply):
+    for command in actions["commands"]:
         if config.safe_lock:
             console.print(f"[yellow][Safe Lock] Skipping run: {command}[/yellow]")
             continue
@@ -769,8 +1120,9 @@ def chat(
 
     # Config
     config = Config.from_env()
+    _cli_overrides.clear()
     if model:
-        config.grok_model = model
+        _apply_cli_override(config, "grok_model", model)
 
     folder_path = Path(folder).resolve()
     if not folder_path.is_dir():
@@ -789,18 +1141,31 @@ def chat(
         )
         raise typer.Exit(1)
 
-    # Banner
-    console.print(f"[bold cyan]{BANNER}[/bold cyan]")
+    # Banner — one render pass, styled Text so nothing goes through the markup parser
     console.print(
-        f"[dim]v{__version__}  |  model: {config.grok_model}  |  folder: {folder_path}[/dim]"
+        Group(
+            Text(BANNER, style="bold cyan"),
+            Text(
+                f"v{__version__}  |  model: {config.grok_model}  |  folder: {folder_path}",
+                style="dim",
+            ),
+            Text("Type /help for commands, /quit to exit.\n", style="dim"),
+        )
     )
-    console.print("[dim]Type /help for commands, /quit to exit.[/dim]\n")
 
     # Build context and state — reset memory singleton so each chat() starts fresh
+    from grok_mccodin.client import SYSTEM_PROMPT, GrokAPIError, GrokClient
+    from grok_mccodin.memory import estimate_tokens
+
     global _current_memory
     _current_memory = None
     client = GrokClient(config)
     memory = _get_memory(config)
+    project_index = FolderIndex(folder_path)
+    # Walk the tree while the user types, so the render at the top of each
+    # turn finds its directory listings and line counts already cached
+    prefetch = threading.Thread(target=project_index.render, name="index-prefetch", daemon=True)
+    prefetch.start()
 
     # Main loop
     while True:
@@ -819,6 +1184,10 @@ def chat(
             if result == "__QUIT__":
                 console.print("[dim]Goodbye![/dim]")
                 break
+            if result == "__RELOAD__":
+                # The client captures the key, base URL and tuning at construction
+                client.close()
+                client = GrokClient(config)
             if result == "__CLEAR__":
                 msg_count = memory.stats["total_messages"]
                 memory.clear()
@@ -826,7 +1195,8 @@ def chat(
             continue
 
         # Re-index folder each turn so Grok sees recent file changes
-        folder_index = index_folder(folder_path)
+        prefetch.join()
+        folder_index = project_index.render()
 
         # Record user message BEFORE the API call so it's:
         # 1. Indexed for TF-IDF recall immediately
@@ -841,21 +1211,14 @@ def chat(
             + estimate_tokens(user_input)
         )
         ctx = memory.build_context(user_input, reserved_tokens=reserved)
+        # The recent window already ends with this turn (added above), and
+        # build_messages appends it too; drop ours so it isn't sent twice
+        if ctx and ctx[-1] == {"role": "user", "content": user_input}:
+            ctx.pop()
         messages = client.build_messages([], user_input, context=folder_index, memory_context=ctx)
 
         try:
-            # Stream response tokens in real time
-            chunks: list[str] = []
-            interrupted = False
-            try:
-                for token in client.chat_stream(messages):
-                    console.print(token, end="", highlight=False)
-                    chunks.append(token)
-            except KeyboardInterrupt:
-                interrupted = True
-                console.print("\n[dim](interrupted)[/dim]")
-            console.print()  # Final newline after streaming
-            reply = "".join(chunks)
+            reply, interrupted = _stream_reply(client, messages)
         except GrokAPIError as exc:
             console.print(f"[bold red]API Error:[/bold red] {exc}")
             continue
@@ -876,6 +1239,10 @@ def chat(
         # Log the exchange
         log_receipt(config.log_file, action="chat", user_input=user_input, detail=reply[:200])
 
+        # Re-warm the index caches now that this turn's edits have landed
+        prefetch = threading.Thread(target=project_index.render, name="index-prefetch", daemon=True)
+        prefetch.start()
+
     # Auto-save session on exit
     if _current_memory is not None and _current_memory.stats["total_messages"] > 0:
         try:
@@ -884,9 +1251,14 @@ def chat(
         except OSError as exc:
             logger.warning("Failed to auto-save session: %s", exc)
 
+    # One client (and connection pool) serves the whole session
+    client.close()
+    flush_receipts()
+
     # Cleanup MCP servers on exit
     if _mcp_registry is not None:
         _mcp_registry.disconnect_all()
+    _close_sql_db()
 
 
 @app.command()
@@ -905,7 +1277,7 @@ def index(
         console.print(f"[red]Not a directory: {folder_path}[/red]")
         raise typer.Exit(1)
     idx = index_folder(folder_path)
-    console.print(Panel(idx, title=str(folder_path), border_style="blue"))
+    console.print(Panel(Text(idx), title=str(folder_path), border_style="blue"))
 
 
 @app.command()
@@ -914,6 +1286,8 @@ def post(
     media: str = typer.Option(None, "--media", "-m", help="Path to media file to attach."),
 ) -> None:
     """Post a message to X/Twitter."""
+    from grok_mccodin.social import post_to_x
+
     config = Config.from_env()
     result = post_to_x(text, config, media_path=media)
     console.print(result)
@@ -2,20 +2,67 @@
 
 from __future__ import annotations
 
+import itertools
 import json
 import logging
+import queue
 import subprocess
 import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from grok_mccodin.utils import json_dumps, json_loads
+
 logger = logging.getLogger(__name__)
 
+# Linux pipes default to 64 KiB; a large tools/list or resources/read reply
+# then makes the server block until we drain it. 1 MiB is the default
+# /proc/sys/fs/pipe-max-size, so unprivileged processes may request it.
+_PIPE_SIZE = 1 << 20
+
+# Userspace buffer for the pipe file objects; readline() on the 8 KiB
+# default takes one read() per 8 KiB of a large response line
+_IO_BUFFER = 1 << 16
+
+# stderr lines kept for the error raised when a server dies
+_STDERR_TAIL = 64
+
+# Seconds a server gets to exit on stdin EOF before stop() sends SIGTERM
+_EOF_GRACE = 0.2
+
+
+def _grow_pipe(pipe: Any) -> None:
+    """Best-effort raise of *pipe*'s kernel buffer to ``_PIPE_SIZE`` (Linux only)."""
+    try:
+        import fcntl
+
+        fcntl.fcntl(pipe.fileno(), fcntl.F_SETPIPE_SZ, _PIPE_SIZE)
+    except (ImportError, AttributeError, OSError) as exc:
+        logger.debug("Could not resize MCP pipe: %s", exc)
+
 
 class MCPError(Exception):
     """Raised when an MCP operation fails."""
 
 
+@dataclass(slots=True)
+class PendingList:
+    """A ``<kind>/list`` started by :meth:`MCPClient.begin_list`.
+
+    *items* is set when the cached listing was still valid and no request
+    went out; otherwise *req_id* names the request awaiting its reply.
+    """
+
+    kind: str
+    gen: int
+    req_id: int | None = None
+    items: list[dict[str, Any]] | None = None
+
+
 class MCPClient:
     """Lightweight MCP client using JSON-RPC 2.0 over stdio transport.
 
@@ -32,9 +79,18 @@ class MCPClient:
         self.command = command
         self.args = args or []
         self._proc: subprocess.Popen[bytes] | None = None
-        self._request_id = 0
+        # count.__next__ is a single C call, so ids are unique without taking _lock
+        self._request_ids = itertools.count(1)
         self._lock = threading.Lock()
         self._initialized = False
+        # stdout lines from the reader thread; None marks end of stream
+        self._lines: queue.Queue[bytes | None] = queue.Queue()
+        self._stderr_tail: deque[str] = deque(maxlen=_STDERR_TAIL)
+        self._stderr_thread: threading.Thread | None = None
+        # Last tools/resources/prompts listing, dropped on <kind>/list_changed;
+        # the generation guards against storing a listing fetched across one
+        self._listings: dict[str, tuple[dict[str, Any], ...]] = {}
+        self._listings_gen = 0
 
     # ------------------------------------------------------------------
     # Lifecycle
@@ -50,11 +106,16 @@ class MCPClient:
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
+                bufsize=_IO_BUFFER,
             )
         except FileNotFoundError as exc:
             raise MCPError(f"MCP server command not found: {self.command}") from exc
         except OSError as exc:
             raise MCPError(f"Failed to start MCP server: {exc}") from exc
+        _grow_pipe(self._proc.stdin)
+        _grow_pipe(self._proc.stdout)
+        self._listings.clear()
+        self._start_reader()
 
         # Send initialize request
         result = self._request(
@@ -74,17 +135,25 @@ class MCPClient:
         return result
 
     def stop(self) -> None:
-        """Shut down the MCP server process."""
+        """Shut down the MCP server process.
+
+        Follows the MCP stdio shutdown sequence: close the server's stdin so
+        it sees EOF, then escalate to SIGTERM and SIGKILL if it lingers.
+        """
         if self._proc and self._proc.poll() is None:
             try:
-                self._notify("notifications/cancelled", {"reason": "client shutdown"})
-            except MCPError:
-                pass
-            self._proc.terminate()
+                if self._proc.stdin:
+                    self._proc.stdin.close()
+            except OSError:
+                pass  # already gone (broken pipe on the final flush)
             try:
-                self._proc.wait(timeout=5)
+                self._proc.wait(timeout=_EOF_GRACE)
             except subprocess.TimeoutExpired:
-                self._proc.kill()
+                self._proc.terminate()
+                try:
+                    self._proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    self._proc.kill()
         self._proc = None
         self._initialized = False
         logger.info("MCP server stopped")
@@ -99,10 +168,7 @@ class MCPClient:
 
     def list_tools(self) -> list[dict[str, Any]]:
         """Discover available tools from the server."""
-        self._ensure_running()
-        result = self._request("tools/list", {})
-        tools: list[dict[str, Any]] = result.get("tools", [])
-        return tools
+        return self._list("tools")
 
     def call_tool(
         self, name: str, arguments: dict[str, Any] | None = None, timeout: int = 30
@@ -122,10 +188,7 @@ class MCPClient:
 
     def list_resources(self) -> list[dict[str, Any]]:
         """List available resources from the server."""
-        self._ensure_running()
-        result = self._request("resources/list", {})
-        resources: list[dict[str, Any]] = result.get("resources", [])
-        return resources
+        return self._list("resources")
 
     def read_resource(self, uri: str) -> list[dict[str, Any]]:
         """Read a specific resource by URI."""
@@ -136,10 +199,7 @@ class MCPClient:
 
     def list_prompts(self) -> list[dict[str, Any]]:
         """List available prompt templates."""
-        self._ensure_running()
-        result = self._request("prompts/list", {})
-        prompts: list[dict[str, Any]] = result.get("prompts", [])
-        return prompts
+        return self._list("prompts")
 
     def get_prompt(self, name: str, arguments: dict[str, str] | None = None) -> dict[str, Any]:
         """Retrieve a prompt template with optional arguments."""
@@ -149,6 +209,48 @@ class MCPClient:
         )
         return prompt
 
+    def begin_list(self, kind: str) -> PendingList:
+        """Send ``<kind>/list`` without waiting, unless the cached listing is still valid.
+
+        Pass the result to :meth:`finish_list`; starting several before
+        finishing any lets their servers answer concurrently.
+        """
+        self._ensure_running()
+        with self._lock:
+            cached, gen = self._listings.get(kind), self._listings_gen
+        if cached is not None:
+            return PendingList(kind, gen, items=list(cached))
+        return PendingList(kind, gen, req_id=self._send_request(f"{kind}/list", {}))
+
+    def finish_list(self, pending: PendingList, timeout: int = 15) -> list[dict[str, Any]]:
+        """Wait for a listing started by :meth:`begin_list` and cache it."""
+        if pending.items is not None:
+            return pending.items
+        assert pending.req_id is not None
+        items: list[dict[str, Any]] = self._response(pending.req_id, timeout=timeout).get(
+            pending.kind, []
+        )
+        with self._lock:
+            if pending.gen == self._listings_gen:
+                self._listings[pending.kind] = tuple(items)
+        return items
+
+    def _list(self, kind: str) -> list[dict[str, Any]]:
+        """Return ``<kind>/list``, cached until ``notifications/<kind>/list_changed``."""
+        return self.finish_list(self.begin_list(kind))
+
+    def _list_changed(self, line: bytes) -> None:
+        """Drop the cached listing named by a ``<kind>/list_changed`` notification."""
+        try:
+            method = json_loads(line).get("method", "")
+        except (ValueError, AttributeError):
+            return
+        if method.startswith("notifications/") and method.endswith("/list_changed"):
+            kind = method[len("notifications/") : -len("/list_changed")]
+            with self._lock:
+                self._listings.pop(kind, None)
+                self._listings_gen += 1
+
     # ------------------------------------------------------------------
     # JSON-RPC 2.0 transport
     # ------------------------------------------------------------------
@@ -158,57 +260,114 @@ class MCPClient:
             raise MCPError("MCP server is not running. Call start() first.")
 
     def _next_id(self) -> int:
-        with self._lock:
-            self._request_id += 1
-            return self._request_id
+        return next(self._request_ids)
 
     def _send(self, message: dict[str, Any]) -> None:
         """Write a JSON-RPC message to the server's stdin."""
         if not self._proc or not self._proc.stdin:
             raise MCPError("MCP server stdin not available")
-        raw = json.dumps(message) + "\n"
-        self._proc.stdin.write(raw.encode("utf-8"))
+        self._proc.stdin.write(json_dumps(message) + b"\n")
         self._proc.stdin.flush()
         logger.debug("MCP send: %s", message.get("method", "response"))
 
-    def _recv(self, timeout: int = 15) -> dict[str, Any]:
+    def _start_reader(self) -> None:
+        """Forward stdout lines to ``_lines`` and drain stderr, on daemon threads.
+
+        A blocking readline() can't honour a timeout (and select() doesn't
+        work on pipes on Windows), so _recv waits on the queue instead.
+        stderr must be read continuously too: a chatty server that fills
+        the pipe blocks on its next log write and stops answering.
+        """
+        if not self._proc or not self._proc.stdout:
+            raise MCPError("MCP server stdout not available")
+        stdout = self._proc.stdout
+        lines: queue.Queue[bytes | None] = queue.Queue()
+        self._lines = lines
+
+        def _read() -> None:
+            try:
+                for line in iter(stdout.readline, b""):
+                    # Handled here, not in _recv, so it lands even between requests
+                    if b"list_changed" in line:
+                        self._list_changed(line)
+                    lines.put(line)
+            except (OSError, ValueError):  # pipe closed by stop()
+                pass
+            lines.put(None)
+
+        threading.Thread(target=_read, name=f"mcp-{self.command}", daemon=True).start()
+
+        stderr = self._proc.stderr
+        if stderr is None:
+            return
+        tail: deque[str] = deque(maxlen=_STDERR_TAIL)
+        self._stderr_tail = tail
+
+        def _drain() -> None:
+            try:
+                for raw in iter(stderr.readline, b""):
+                    text = raw.decode("utf-8", errors="replace").rstrip()
+                    tail.append(text)
+                    logger.debug("MCP %s stderr: %s", self.command, text)
+            except (OSError, ValueError):  # pipe closed by stop()
+                pass
+
+        self._stderr_thread = threading.Thread(
+            target=_drain, name=f"mcp-{self.command}-stderr", daemon=True
+        )
+        self._stderr_thread.start()
+
+    def _recv(self, timeout: float = 15, expect_id: int | None = None) -> dict[str, Any]:
         """Read a JSON-RPC response from the server's stdout.
 
-        Skips notification messages and returns the first result/error.
+        Skips notification messages (and, if *expect_id* is given, stale
+        responses to earlier requests that timed out) and returns the first
+        result/error.  Raises MCPError if none arrives within *timeout* seconds.
         """
         if not self._proc or not self._proc.stdout:
             raise MCPError("MCP server stdout not available")
 
-        deadline_lines = 100  # Safety: don't read forever
-        for _ in range(deadline_lines):
-            line = self._proc.stdout.readline()
-            if not line:
-                stderr_out = ""
-                if self._proc.stderr:
-                    stderr_out = self._proc.stderr.read().decode("utf-8", errors="replace")[:500]
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                line = self._lines.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                raise MCPError(f"MCP server did not respond within {timeout}s") from None
+            if line is None:
+                self._lines.put(None)  # later calls fail fast too
+                if self._stderr_thread is not None:
+                    self._stderr_thread.join(timeout=1)  # let the last lines land
+                stderr_out = "\n".join(self._stderr_tail)[-500:]
                 raise MCPError(f"MCP server closed stdout. stderr: {stderr_out}")
 
-            line_str = line.decode("utf-8", errors="replace").strip()
-            if not line_str:
+            # Both JSON parsers skip surrounding whitespace, so the line is parsed as read
+            if line.isspace():
                 continue
 
             try:
-                msg: dict[str, Any] = json.loads(line_str)
+                msg: dict[str, Any] = json_loads(line)
             except json.JSONDecodeError:
-                logger.debug("MCP non-JSON line: %s", line_str[:200])
+                if logger.isEnabledFor(logging.DEBUG):
+                    text = line[:200].decode("utf-8", errors="replace").rstrip()
+                    logger.debug("MCP non-JSON line: %s", text)
                 continue
 
             # Skip notifications (no "id" field)
             if "id" not in msg:
                 logger.debug("MCP notification: %s", msg.get("method", "unknown"))
                 continue
+            if expect_id is not None and msg["id"] != expect_id:
+                logger.debug("MCP late response to request %s", msg["id"])
+                continue
 
             return msg
 
-        raise MCPError("MCP: exceeded max read attempts without a response")
-
     def _request(self, method: str, params: dict[str, Any], timeout: int = 15) -> dict[str, Any]:
         """Send a JSON-RPC request and wait for the response."""
+        return self._response(self._send_request(method, params), timeout=timeout)
+
+    def _send_request(self, method: str, params: dict[str, Any]) -> int:
+        """Send a JSON-RPC request without waiting; returns its id for :meth:`_response`."""
         req_id = self._next_id()
         message = {
             "jsonrpc": "2.0",
@@ -217,7 +376,11 @@ class MCPClient:
             "params": params,
         }
         self._send(message)
-        response = self._recv(timeout=timeout)
+        return req_id
+
+    def _response(self, req_id: int, timeout: int = 15) -> dict[str, Any]:
+        """Wait for the response to request *req_id* and return its result."""
+        response = self._recv(timeout=timeout, expect_id=req_id)
 
         if "error" in response:
             err = response["error"]
@@ -294,7 +457,7 @@ class MCPRegistry:
             logger.info("No MCP config found at %s", path)
             return
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
+            data = json_loads(path.read_bytes())
             if isinstance(data, dict):
                 validated = _validate_mcp_configs(data)
                 self._servers = validated
@@ -312,8 +475,9 @@ class MCPRegistry:
 
     def connect(self, name: str, timeout: int = 15) -> MCPClient:
         """Start and connect to a named MCP server."""
-        if name in self._clients and self._clients[name].is_running:
-            return self._clients[name]
+        existing = self._clients.get(name)
+        if existing is not None and existing.is_running:
+            return existing
 
         if name not in self._servers:
             raise MCPError(f"Unknown MCP server: {name}. Available: {self.server_names}")
@@ -324,6 +488,27 @@ class MCPRegistry:
         self._clients[name] = client
         return client
 
+    def connect_all(self, names: list[str], timeout: int = 15) -> dict[str, MCPError]:
+        """Start several servers concurrently; returns the error for each that failed.
+
+        Each start pays a process spawn (often an ``npx`` cold start) plus the
+        initialize handshake, so they overlap instead of adding up.
+        """
+        failed: dict[str, MCPError] = {}
+        # A repeated name would race two starts of the same server
+        unique = list(dict.fromkeys(names))
+        if not unique:
+            return failed
+        with ThreadPoolExecutor(max_workers=len(unique)) as pool:
+            futures = {name: pool.submit(self.connect, name, timeout) for name in unique}
+        for name, future in futures.items():
+            exc = future.exception()
+            if isinstance(exc, MCPError):
+                failed[name] = exc
+            elif exc is not None:
+                raise exc
+        return failed
+
     def get_client(self, name: str) -> MCPClient | None:
         """Get an already-connected client, or None."""
         client = self._clients.get(name)
@@ -338,18 +523,32 @@ class MCPRegistry:
             client.stop()
 
     def disconnect_all(self) -> None:
-        """Stop all MCP servers."""
-        for name in list(self._clients.keys()):
-            self.disconnect(name)
+        """Stop all MCP servers (concurrently, as each may wait up to 5s to exit)."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        if not clients:
+            return
+        with ThreadPoolExecutor(max_workers=len(clients)) as pool:
+            list(pool.map(MCPClient.stop, clients))
 
     def list_all_tools(self) -> dict[str, list[dict[str, Any]]]:
-        """List tools from all connected servers."""
+        """List tools from all connected servers.
+
+        Every ``tools/list`` request goes out before any reply is awaited, so
+        the servers answer concurrently and the wait is the slowest one's.
+        """
         result: dict[str, list[dict[str, Any]]] = {}
+        pending: dict[str, PendingList] = {}
         for name, client in self._clients.items():
             if client.is_running:
+                result[name] = []
                 try:
-                    result[name] = client.list_tools()
+                    pending[name] = client.begin_list("tools")
                 except MCPError as exc:
                     logger.error("Failed to list tools from %s: %s", name, exc)
-                    result[name] = []
+        for name, started in pending.items():
+            try:
+                result[name] = self._clients[name].finish_list(started)
+            except MCPError as exc:
+                logger.error("Failed to list tools from %s: %s", name, exc)
         return result
@@ -48,6 +48,9 @@ _IMPORTANCE_THRESHOLD = 0.7
 # Chunk size for TF-IDF indexing — large because individual messages are short
 _INDEX_CHUNK_LINES = 200
 
+_WHITESPACE_RE = re.compile(r"\s+")
+_UNSAFE_FILENAME_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
 
 # ---------------------------------------------------------------------------
 # Token estimation
@@ -72,6 +75,11 @@ class ScoredMessage:
     content: str
     importance: float
     timestamp: str
+    tokens: int = 0  # estimate_tokens(content), filled in once on creation
+
+    def __post_init__(self) -> None:
+        if not self.tokens:
+            self.tokens = estimate_tokens(self.content)
 
 
 def score_importance(role: str, content: str, index: int, total: int) -> float:
@@ -172,7 +180,7 @@ def _distill_facts(messages: list[dict[str, str]]) -> str:
     seen: set[str] = set()
     unique: list[str] = []
     for fact in facts:
-        normalized = re.sub(r"\s+", " ", fact.strip().lower())
+        normalized = _WHITESPACE_RE.sub(" ", fact.strip().lower())
         if normalized not in seen:
             seen.add(normalized)
             unique.append(fact)
@@ -221,8 +229,8 @@ def _sanitize_filename(name: str) -> str:
     If sanitization removes all characters, falls back to a short hash
     of the original name to prevent collisions from distinct inputs.
     """
-    cleaned = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "", name)
-    cleaned = re.sub(r"\s+", "_", cleaned.strip())
+    cleaned = _UNSAFE_FILENAME_RE.sub("", name)
+    cleaned = _WHITESPACE_RE.sub("_", cleaned.strip())
     if not cleaned:
         # Use hash of original name so different bad inputs don't collide
         short_hash = hashlib.sha256(name.encode()).hexdigest()[:8]
@@ -303,13 +311,16 @@ class ConversationMemory:
         parts: list[dict[str, str]] = []
         budget_remaining = max(_CONTEXT_TOKEN_BUDGET - reserved_tokens, 200)
 
-        # 1. Recent messages first (highest priority — always included)
-        recent = self._messages[-self._keep_recent :]
+        # 1. Recent messages first (highest priority).  Walk back from the
+        # newest message and stop once the next one would overrun the budget;
+        # the newest is always kept.  Dropped messages stay reachable via recall.
         recent_parts: list[dict[str, str]] = []
-        for msg in recent:
-            tokens = estimate_tokens(msg.content)
-            budget_remaining -= tokens
+        for msg in reversed(self._messages[-self._keep_recent :]):
+            if recent_parts and msg.tokens > budget_remaining:
+                break
+            budget_remaining -= msg.tokens
             recent_parts.append({"role": msg.role, "content": msg.content})
+        recent_parts.reverse()
 
         # 2. Compressed summaries (oldest context)
         if self._summaries and budget_remaining > 200:
@@ -326,7 +337,7 @@ class ConversationMemory:
 
         # 3. TF-IDF recalled content (semantically relevant old messages)
         if budget_remaining > 200:
-            recalled = self._recall(user_input)
+            recalled = self._recall(user_input, [p["content"] for p in recent_parts])
             if recalled:
                 recalled_tokens = estimate_tokens(recalled)
                 if recalled_tokens > budget_remaining:
@@ -481,7 +492,7 @@ class ConversationMemory:
 
     def _maybe_compress(self) -> None:
         """Compress oldest messages when the recent window exceeds the token budget."""
-        total_tokens = sum(estimate_tokens(m.content) for m in self._messages)
+        total_tokens = sum(m.tokens for m in self._messages)
         if total_tokens <= self._token_budget:
             return
 
@@ -538,7 +549,7 @@ class ConversationMemory:
                 f"msg_{self._message_count}", msg.content, chunk_lines=_INDEX_CHUNK_LINES
             )
 
-    def _recall(self, query: str) -> str:
+    def _recall(self, query: str, recent_texts: list[str] | None = None) -> str:
         """Search the TF-IDF index for relevant old context, deduplicating against recent.
 
         Uses substring containment for dedup because TF-IDF chunks may not
@@ -548,13 +559,17 @@ class ConversationMemory:
         stale content at equal relevance.  The decay factor is
         ``1 / (1 + age_ratio * 0.5)`` where *age_ratio* is how far back the
         chunk's index key sits relative to total message count.
+
+        *recent_texts* defaults to the recent window; ``build_context`` passes
+        only the messages it actually included.
         """
         results = self._index.search(query, top_k=self._top_k + self._keep_recent)
         if not results:
             return ""
 
         # Build recent content for substring-based deduplication
-        recent_texts = [m.content for m in self._messages[-self._keep_recent :]]
+        if recent_texts is None:
+            recent_texts = [m.content for m in self._messages[-self._keep_recent :]]
 
         # Apply time-decay: chunks indexed later (higher msg_N) get a boost
         total = max(self._message_count, 1)
@@ -7,6 +7,8 @@ import logging
 import subprocess
 from pathlib import Path
 
+from grok_mccodin.utils import json_loads
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = 120  # Package installs can be slow
@@ -71,7 +73,7 @@ def pip_list(*, cwd: str | Path = ".") -> list[dict[str, str]]:
     """List installed Python packages. Returns [{"name": ..., "version": ...}]."""
     output = _run_cmd(["pip", "list", "--format=json"], cwd=cwd)
     try:
-        data: list[dict[str, str]] = json.loads(output)
+        data: list[dict[str, str]] = json_loads(output)
         return data
     except json.JSONDecodeError:
         return []
@@ -27,18 +27,22 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 
+# Identifiers and words; underscored identifiers stay together
+_IDENT_RE = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
+# camelCase / PascalCase / digit boundaries within one identifier
+_SUBWORD_RE = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?=[A-Z][a-z]|\d|\b)|[a-z]+|\d+")
+
+
 def _tokenize(text: str) -> list[str]:
     """Split text into lowercase tokens (identifiers + words)."""
-    # Split on non-alphanumeric, keep underscored identifiers together
-    tokens = re.findall(r"[a-zA-Z_][a-zA-Z0-9_]*", text)
     result: list[str] = []
-    for token in tokens:
+    for token in _IDENT_RE.findall(text):
         # Also split camelCase into sub-tokens
-        parts = re.findall(r"[A-Z]?[a-z]+|[A-Z]+(?=[A-Z][a-z]|\d|\b)|[a-z]+|\d+", token)
-        result.append(token.lower())
-        for part in parts:
+        whole = token.lower()
+        result.append(whole)
+        for part in _SUBWORD_RE.findall(token):
             lower = part.lower()
-            if lower != token.lower():
+            if lower != whole:
                 result.append(lower)
     return result
 
@@ -2,12 +2,25 @@
 
 from __future__ import annotations
 
+import atexit
 import hashlib
 import json
 import logging
+import os
+import queue
 import tempfile
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:  # Optional speedup — stdlib json is the fallback
+    _HAS_ORJSON = False
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +82,114 @@ def _should_skip_dir(name: str) -> bool:
     return any(name.endswith(s) for s in SKIP_DIR_SUFFIXES)
 
 
+# index_folder line counts, keyed by path and valid while (mtime_ns, size)
+# match, so unchanged files aren't re-read on every chat turn
+_LINE_COUNTS: dict[str, tuple[int, int, int]] = {}
+_LINE_COUNTS_MAX = 20_000
+
+
+_READ_CHUNK = 1 << 20
+
+
+def _line_count(path: str, st: os.stat_result) -> int:
+    """Return the number of lines in *path*, reusing the count if unchanged."""
+    hit = _LINE_COUNTS.get(path)
+    if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return hit[2]
+    count = 0
+    last = b"\n"
+    try:
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(_READ_CHUNK), b""):
+                count += chunk.count(b"\n")
+                last = chunk[-1:]
+    except OSError:
+        count = 0
+    else:
+        if last != b"\n":
+            count += 1  # final line without a trailing newline
+    if len(_LINE_COUNTS) >= _LINE_COUNTS_MAX:
+        _LINE_COUNTS.clear()
+    _LINE_COUNTS[path] = (st.st_mtime_ns, st.st_size, count)
+    return count
+
+
+# A directory changed this recently may change again within the same mtime
+# tick, so its listing isn't trusted for reuse yet
+_LISTING_SETTLE_NS = 1_000_000_000
+
+
+class FolderIndex:
+    """Project index that re-reads only directories whose mtime has changed.
+
+    Adding, removing or renaming an entry bumps its directory's mtime, so an
+    unchanged directory's filtered, sorted listing is reused and a refresh
+    costs one ``stat()`` per directory and per code file (the latter feeds
+    the line-count cache).
+    """
+
+    def __init__(self, folder: str | Path, max_depth: int = 4) -> None:
+        self.folder = Path(folder)
+        self.max_depth = max_depth
+        # directory path -> (mtime_ns, [(name, is_file), ...]) of indexable entries
+        self._listings: dict[str, tuple[int, list[tuple[str, bool]]]] = {}
+
+    def _listing(self, path: str) -> list[tuple[str, bool]] | None:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        hit = self._listings.get(path)
+        if hit is not None and hit[0] == mtime:
+            return hit[1]
+        # scandir reports the entry type from the directory listing itself
+        try:
+            with os.scandir(path) as it:
+                entries = [e for e in it if not e.name.startswith(".") or e.name == ".env.example"]
+        except OSError:
+            return None
+        entries.sort(key=lambda e: (e.is_file(), e.name.lower()))
+        listing: list[tuple[str, bool]] = []
+        for entry in entries:
+            if entry.is_file():
+                if os.path.splitext(entry.name)[1] in CODE_EXTENSIONS:
+                    listing.append((entry.name, True))
+            elif entry.is_dir() and not _should_skip_dir(entry.name):
+                listing.append((entry.name, False))
+        if time.time_ns() - mtime > _LISTING_SETTLE_NS:
+            self._listings[path] = (mtime, listing)
+        return listing
+
+    def render(self) -> str:
+        """Return the tree-style index (see :func:`index_folder`)."""
+        if not self.folder.is_dir():
+            return f"[not a directory: {self.folder}]"
+
+        lines: list[str] = []
+
+        def _walk(current: str, depth: int) -> None:
+            if depth > self.max_depth:
+                return
+            listing = self._listing(current)
+            if listing is None:
+                return
+            indent = "  " * depth
+            for name, is_file in listing:
+                path = os.path.join(current, name)
+                if is_file:
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    lines.append(f"{indent}{name} ({_line_count(path, st)} lines)")
+                else:
+                    lines.append(f"{indent}{name}/")
+                    _walk(path, depth + 1)
+
+        _walk(str(self.folder), 0)
+        return "\n".join(lines) if lines else "[empty project]"
+
+
 def index_folder(folder: str | Path, max_depth: int = 4) -> str:
     """Build a tree-style index of a project folder.
 
@@ -79,58 +200,102 @@ def index_folder(folder: str | Path, max_depth: int = 4) -> str:
         tests/
           test_main.py (30 lines)
     """
-    folder = Path(folder)
-    if not folder.is_dir():
-        return f"[not a directory: {folder}]"
+    return FolderIndex(folder, max_depth).render()
 
-    lines: list[str] = []
-
-    def _walk(current: Path, depth: int) -> None:
-        if depth > max_depth:
-            return
-        try:
-            entries = sorted(current.iterdir(), key=lambda p: (p.is_file(), p.name.lower()))
-        except PermissionError:
-            return
 
-        for entry in entries:
-            if entry.name.startswith(".") and entry.name not in (".env.example",):
-                continue
-            if entry.is_dir():
-                if _should_skip_dir(entry.name):
-                    continue
-                indent = "  " * depth
-                lines.append(f"{indent}{entry.name}/")
-                _walk(entry, depth + 1)
-            elif entry.is_file() and entry.suffix in CODE_EXTENSIONS:
-                try:
-                    line_count = sum(1 for _ in entry.open(encoding="utf-8", errors="ignore"))
-                except OSError:
-                    line_count = 0
-                indent = "  " * depth
-                lines.append(f"{indent}{entry.name} ({line_count} lines)")
+_MAX_READ_CHARS = 256 * 1024
 
-    _walk(folder, 0)
-    return "\n".join(lines) if lines else "[empty project]"
 
+def read_file_safe(path: str | Path, max_lines: int = 500, max_chars: int = _MAX_READ_CHARS) -> str:
+    """Read a file, returning at most *max_lines* lines and *max_chars* characters.
 
-def read_file_safe(path: str | Path, max_lines: int = 500) -> str:
-    """Read a file, returning at most *max_lines* lines."""
+    Only that window is read from disk, so a huge file (or one enormous
+    minified line) costs no more than a small one.
+    """
     path = Path(path)
     if not path.is_file():
         return f"[file not found: {path}]"
     try:
         with path.open(encoding="utf-8", errors="replace") as fh:
-            content_lines = []
-            for i, line in enumerate(fh):
-                if i >= max_lines:
-                    content_lines.append(f"\n... truncated at {max_lines} lines ...")
-                    break
-                content_lines.append(line)
-        return "".join(content_lines)
+            content = fh.read(max_chars)
+            clipped = bool(fh.read(1))
+            size = os.fstat(fh.fileno()).st_size
     except OSError as exc:
         return f"[error reading {path}: {exc}]"
 
+    pos = -1
+    for _ in range(max_lines):
+        pos = content.find("\n", pos + 1)
+        if pos == -1:
+            break
+    else:
+        if pos + 1 < len(content) or clipped:
+            return content[: pos + 1] + f"\n... truncated at {max_lines} lines ..."
+    if clipped:
+        content += f"\n... truncated at {max_chars // 1024} KiB, file is {size} bytes ..."
+    return content
+
+
+_RECEIPTS: queue.Queue[tuple[Path, dict[str, str]]] = queue.Queue()
+_RECEIPT_WRITER: threading.Thread | None = None
+_RECEIPT_WRITER_LOCK = threading.Lock()
+
+
+def _write_receipts(log_file: Path, entries: list[dict[str, str]]) -> None:
+    """Append *entries* to the JSON log file (atomic write)."""
+    existing: list[dict] = []
+    if log_file.is_file():
+        try:
+            loaded = json_loads(log_file.read_bytes())
+        except (ValueError, OSError):
+            pass
+        else:
+            # Anything but a list is treated like an unreadable log and replaced
+            if isinstance(loaded, list):
+                existing = loaded
+            else:
+                logger.warning("Receipt log %s is not a JSON list; starting a new one", log_file)
+
+    existing.extend(entries)
+    data = json_dumps(existing, indent=True)
+
+    # Atomic write: write to temp file in same directory, then rename
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=str(log_file.parent), suffix=".tmp", prefix=".log_")
+        with open(fd, "wb") as fh:
+            fh.write(data)
+        Path(tmp_path).replace(log_file)
+    except OSError:
+        # Fallback to direct write if atomic fails (e.g. cross-device)
+        log_file.write_bytes(data)
+
+
+def _receipt_writer() -> None:
+    """Drain the receipt queue, rewriting each log file once per batch."""
+    while True:
+        batch = [_RECEIPTS.get()]
+        while True:
+            try:
+                batch.append(_RECEIPTS.get_nowait())
+            except queue.Empty:
+                break
+        by_file: dict[Path, list[dict[str, str]]] = {}
+        for log_file, entry in batch:
+            by_file.setdefault(log_file, []).append(entry)
+        try:
+            for log_file, entries in by_file.items():
+                try:
+                    _write_receipts(log_file, entries)
+                except (OSError, TypeError, ValueError) as exc:
+                    # I/O, unserializable entries, corrupt logs: none may kill the
+                    # writer, or flush_receipts() would hang
+                    logger.warning("Failed to write receipts to %s: %s", log_file, exc)
+                else:
+                    logger.debug("Logged %d receipt(s) to %s", len(entries), log_file)
+        finally:
+            for _ in batch:
+                _RECEIPTS.task_done()
+
 
 def log_receipt(
     log_file: str | Path,
@@ -139,35 +304,31 @@ def log_receipt(
     detail: str = "",
     user_input: str = "",
 ) -> None:
-    """Append a JSON receipt entry to the log file (atomic write)."""
-    log_file = Path(log_file)
+    """Queue a JSON receipt entry for the log file.
+
+    Entries are written by a background thread so the chat loop never waits
+    on the log; call :func:`flush_receipts` to wait for them to land.
+    """
+    global _RECEIPT_WRITER
     entry = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "action": action,
         "detail": detail,
         "input_hash": hashlib.sha256(user_input.encode()).hexdigest()[:16] if user_input else "",
     }
+    _RECEIPTS.put((Path(log_file), entry))
+    with _RECEIPT_WRITER_LOCK:
+        if _RECEIPT_WRITER is None:
+            _RECEIPT_WRITER = threading.Thread(
+                target=_receipt_writer, name="grok-receipts", daemon=True
+            )
+            _RECEIPT_WRITER.start()
+            atexit.register(flush_receipts)
 
-    existing: list[dict] = []
-    if log_file.is_file():
-        try:
-            existing = json.loads(log_file.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
-            pass
 
-    existing.append(entry)
-
-    # Atomic write: write to temp file in same directory, then rename
-    try:
-        fd, tmp_path = tempfile.mkstemp(dir=str(log_file.parent), suffix=".tmp", prefix=".log_")
-        with open(fd, "w", encoding="utf-8") as fh:
-            json.dump(existing, fh, indent=2)
-        Path(tmp_path).replace(log_file)
-    except OSError:
-        # Fallback to direct write if atomic fails (e.g. cross-device)
-        log_file.write_text(json.dumps(existing, indent=2), encoding="utf-8")
-
-    logger.debug("Logged receipt: %s", action)
+def flush_receipts() -> None:
+    """Block until every queued receipt has been written."""
+    _RECEIPTS.join()
 
 
 def take_screenshot(output_path: str = "screenshot.png") -> str:
@@ -184,6 +345,31 @@ def take_screenshot(output_path: str = "screenshot.png") -> str:
         return f"[screenshot failed: {exc}]"
 
 
+def json_loads(data: str | bytes | bytearray) -> Any:
+    """Parse JSON, using orjson when installed (accepts bytes without decoding)."""
+    if _HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, *, sort_keys: bool = False, indent: bool = False) -> bytes:
+    """Serialize *obj* to UTF-8 JSON bytes, using orjson when installed.
+
+    Output is compact unless *indent* is set, which indents by two spaces.
+    """
+    if _HAS_ORJSON:
+        option = (orjson.OPT_SORT_KEYS if sort_keys else 0) | (orjson.OPT_INDENT_2 if indent else 0)
+        raw: bytes = orjson.dumps(obj, option=option)
+        return raw
+    return json.dumps(
+        obj,
+        sort_keys=sort_keys,
+        indent=2 if indent else None,
+        separators=(",", ": ") if indent else (",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
 def file_hash(path: str | Path) -> str:
     """Return the SHA-256 hex digest of a file."""
     path = Path(path)
@@ -24,6 +24,26 @@ _session.headers.update(
 
 DEFAULT_TIMEOUT = 15
 
+# HTML scraping patterns, compiled once
+_TAG_RE = re.compile(r"<[^>]+>")
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.DOTALL | re.IGNORECASE)
+_SPACES_RE = re.compile(r"[ \t]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+# DDG Lite uses a table layout: result links are <a class="result-link">,
+# snippets follow in <td class="result-snippet">
+_DDG_LINK_RE = re.compile(
+    r'<a[^>]+class="result-link"[^>]*href="([^"]+)"[^>]*>(.*?)</a>',
+    re.DOTALL,
+)
+_DDG_SNIPPET_RE = re.compile(
+    r'<td[^>]+class="result-snippet"[^>]*>(.*?)</td>',
+    re.DOTALL,
+)
+# Fallback: any link that looks like an external result (not DDG internal)
+_EXTERNAL_LINK_RE = re.compile(
+    r'<a[^>]+href="(https?://(?!duckduckgo)[^"]+)"[^>]*>(.*?)</a>', re.DOTALL
+)
+
 
 # ---------------------------------------------------------------------------
 # Lightweight HTML-to-text extractor (no bs4 dependency required)
@@ -59,8 +79,8 @@ class _TextExtractor(HTMLParser):
     def get_text(self) -> str:
         raw = "".join(self._parts)
         # Collapse whitespace runs
-        raw = re.sub(r"[ \t]+", " ", raw)
-        raw = re.sub(r"\n{3,}", "\n\n", raw)
+        raw = _SPACES_RE.sub(" ", raw)
+        raw = _BLANK_LINES_RE.sub("\n\n", raw)
         return raw.strip()
 
 
@@ -101,26 +121,14 @@ def _parse_ddg_lite(html: str, max_results: int) -> list[dict[str, str]]:
     """Parse DuckDuckGo Lite HTML results into structured data."""
     results: list[dict[str, str]] = []
 
-    # DDG Lite uses a table layout with specific patterns
-    # Links are in <a> tags with class="result-link"
-    link_pattern = re.compile(
-        r'<a[^>]+class="result-link"[^>]*href="([^"]+)"[^>]*>(.*?)</a>',
-        re.DOTALL,
-    )
-    # Snippets follow in <td> with class="result-snippet"
-    snippet_pattern = re.compile(
-        r'<td[^>]+class="result-snippet"[^>]*>(.*?)</td>',
-        re.DOTALL,
-    )
-
-    links = link_pattern.findall(html)
-    snippets = snippet_pattern.findall(html)
+    links = _DDG_LINK_RE.findall(html)
+    snippets = _DDG_SNIPPET_RE.findall(html)
 
     for i, (href, title_html) in enumerate(links[:max_results]):
-        title = re.sub(r"<[^>]+>", "", title_html).strip()
+        title = _TAG_RE.sub("", title_html).strip()
         snippet = ""
         if i < len(snippets):
-            snippet = re.sub(r"<[^>]+>", "", snippets[i]).strip()
+            snippet = _TAG_RE.sub("", snippets[i]).strip()
         if href and title:
             results.append({"title": title, "url": href, "snippet": snippet})
 
@@ -134,11 +142,9 @@ def _parse_ddg_lite(html: str, max_results: int) -> list[dict[str, str]]:
 def _parse_ddg_fallback(html: str, max_results: int) -> list[dict[str, str]]:
     """Fallback parser for DDG results using generic link patterns."""
     results: list[dict[str, str]] = []
-    # Find all links that look like external results (not DDG internal)
-    link_re = re.compile(r'<a[^>]+href="(https?://(?!duckduckgo)[^"]+)"[^>]*>(.*?)</a>', re.DOTALL)
     seen: set[str] = set()
-    for href, title_html in link_re.findall(html):
-        title = re.sub(r"<[^>]+>", "", title_html).strip()
+    for href, title_html in _EXTERNAL_LINK_RE.findall(html):
+        title = _TAG_RE.sub("", title_html).strip()
         if href not in seen and title and len(title) > 3:
             seen.add(href)
             results.append({"title": title, "url": href, "snippet": ""})
@@ -221,9 +227,9 @@ def web_fetch(url: str, max_chars: int = 8000) -> dict[str, str]:
     if "text/html" in content_type or "application/xhtml" in content_type:
         text = html_to_text(resp.text)
         # Extract <title>
-        title_match = re.search(r"<title[^>]*>(.*?)</title>", resp.text, re.DOTALL | re.IGNORECASE)
+        title_match = _TITLE_RE.search(resp.text)
         if title_match:
-            result["title"] = re.sub(r"<[^>]+>", "", title_match.group(1)).strip()
+            result["title"] = _TAG_RE.sub("", title_match.group(1)).strip()
     elif "application/json" in content_type:
         text = resp.text
     else:
@@ -2,11 +2,23 @@
 
 from __future__ import annotations
 
+import json
+import socket
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from grok_mccodin.client import GrokAPIError, GrokClient
+from grok_mccodin.client import (
+    GrokAPIError,
+    GrokClient,
+    ResponseCache,
+    _AdaptiveLimiter,
+    _fingerprint,
+    _iter_sse_data,
+    _spinner,
+)
 
 
 class TestGrokClient:
@@ -28,17 +40,63 @@ class TestGrokClient:
         # Only system + user
         assert len(msgs) == 2
 
+    def test_build_messages_memory_context_replaces_history(self, config):
+        client = GrokClient(config)
+        history = [{"role": "user", "content": "old"}]
+        ctx = [{"role": "assistant", "content": "recalled"}]
+        msgs = client.build_messages(history, "new", memory_context=ctx)
+        assert [m["content"] for m in msgs[1:]] == ["recalled", "new"]
+        # The caller's list is not aliased into the result
+        assert msgs is not ctx and len(ctx) == 1
+
     @patch("grok_mccodin.client.requests.Session.request")
     def test_chat_success(self, mock_request, config):
         mock_resp = MagicMock()
         mock_resp.status_code = 200
-        mock_resp.json.return_value = {"choices": [{"message": {"content": "Hello from Grok!"}}]}
+        mock_resp.content = b'{"choices": [{"message": {"content": "Hello from Grok!"}}]}'
         mock_request.return_value = mock_resp
 
         client = GrokClient(config)
         reply = client.chat([{"role": "user", "content": "hi"}])
         assert reply == "Hello from Grok!"
 
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_chat_sends_serialized_body(self, mock_request, config):
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.content = b'{"choices": [{"message": {"content": "ok"}}]}'
+        mock_request.return_value = mock_resp
+
+        client = GrokClient(config)
+        client.chat([{"role": "user", "content": "hi"}])
+        body = mock_request.call_args.kwargs["data"]
+        assert isinstance(body, bytes)
+        assert json.loads(body)["messages"] == [{"role": "user", "content": "hi"}]
+
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_chat_malformed_body(self, mock_request, config):
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.content = b"<html>oops</html>"
+        mock_resp.text = "<html>oops</html>"
+        mock_request.return_value = mock_resp
+
+        client = GrokClient(config)
+        with pytest.raises(GrokAPIError, match="Malformed"):
+            client.chat([{"role": "user", "content": "hi"}])
+
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_chat_null_choices(self, mock_request, config):
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.content = b'{"choices": null}'
+        mock_resp.text = '{"choices": null}'
+        mock_request.return_value = mock_resp
+
+        client = GrokClient(config)
+        with pytest.raises(GrokAPIError, match="Malformed"):
+            client.chat([{"role": "user", "content": "hi"}])
+
     @patch("grok_mccodin.client.requests.Session.request")
     def test_chat_api_error(self, mock_request, config):
         mock_resp = MagicMock()
@@ -52,6 +110,50 @@ class TestGrokClient:
         assert exc_info.value.status_code == 401
 
 
+class TestConnectionPool:
+    def test_adapter_mounted(self, config):
+        client = GrokClient(config)
+        adapter = client.session.get_adapter("https://api.x.ai/v1")
+        assert adapter._pool_maxsize >= 10
+        assert adapter.max_retries.total == 0
+        client.close()
+
+    def test_socket_options(self, config):
+        client = GrokClient(config)
+        adapter = client.session.get_adapter("https://api.x.ai/v1")
+        opts = adapter.poolmanager.connection_pool_kw["socket_options"]
+        assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in opts
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in opts
+        assert len(opts) == len(set(opts))
+        client.close()
+
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_separate_connect_timeout(self, mock_request, config):
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.content = b'{"choices": [{"message": {"content": "ok"}}]}'
+        mock_request.return_value = mock_resp
+
+        GrokClient(config).chat([{"role": "user", "content": "hi"}])
+        connect, read = mock_request.call_args.kwargs["timeout"]
+        assert connect < read
+
+
+class TestSpinner:
+    def test_noop_when_not_a_tty(self):
+        with patch("grok_mccodin.client.sys.stderr") as mock_stderr:
+            mock_stderr.isatty.return_value = False
+            spinner = _spinner("Thinking")
+        assert type(spinner).__name__ == "nullcontext"
+
+    def test_tqdm_on_tty(self):
+        with patch("grok_mccodin.client.sys.stderr") as mock_stderr:
+            mock_stderr.isatty.return_value = True
+            with patch("tqdm.tqdm") as mock_tqdm:
+                _spinner("Thinking")
+        mock_tqdm.assert_called_once()
+
+
 class TestGrokAPIError:
     def test_message(self):
         err = GrokAPIError(500, "internal error")
@@ -65,13 +167,13 @@ class TestGrokClientStream:
         """Test that chat_stream yields content tokens from SSE chunks."""
         mock_resp = MagicMock()
         mock_resp.status_code = 200
-        mock_resp.iter_lines.return_value = iter(
+        mock_resp.iter_content.return_value = iter(
             [
-                'data: {"choices":[{"delta":{"role":"assistant"}}]}',
-                'data: {"choices":[{"delta":{"content":"Hello"}}]}',
-                'data: {"choices":[{"delta":{"content":" World"}}]}',
-                'data: {"choices":[{"delta":{"content":"!"}}]}',
-                "data: [DONE]",
+                b'data: {"choices":[{"delta":{"role":"assistant"}}]}\n\n',
+                b'data: {"choices":[{"delta":{"content":"Hello"}}]}\n\n',
+                b'data: {"choices":[{"delta":{"content":" World"}}]}\n\n',
+                b'data: {"choices":[{"delta":{"content":"!"}}]}\n\n',
+                b"data: [DONE]\n\n",
             ]
         )
         mock_request.return_value = mock_resp
@@ -98,11 +200,11 @@ class TestGrokClientStream:
         """Test that empty deltas are skipped gracefully."""
         mock_resp = MagicMock()
         mock_resp.status_code = 200
-        mock_resp.iter_lines.return_value = iter(
+        mock_resp.iter_content.return_value = iter(
             [
-                'data: {"choices":[{"delta":{}}]}',
-                'data: {"choices":[{"delta":{"content":"ok"}}]}',
-                "data: [DONE]",
+                b'data: {"choices":[{"delta":{}}]}\n\n',
+                b'data: {"choices":[{"delta":{"content":"ok"}}]}\n\n',
+                b"data: [DONE]\n\n",
             ]
         )
         mock_request.return_value = mock_resp
@@ -113,14 +215,15 @@ class TestGrokClientStream:
 
     @patch("grok_mccodin.client.requests.Session.request")
     def test_chat_stream_malformed_json(self, mock_request, config):
-        """Test that malformed JSON lines are skipped without error."""
+        """Test that malformed JSON and frames are skipped without error."""
         mock_resp = MagicMock()
         mock_resp.status_code = 200
-        mock_resp.iter_lines.return_value = iter(
+        mock_resp.iter_content.return_value = iter(
             [
-                "data: {invalid json",
-                'data: {"choices":[{"delta":{"content":"ok"}}]}',
-                "data: [DONE]",
+                b"data: {invalid json\n\n",
+                b'data: {"choices": null}\n\n',
+                b'data: {"choices":[{"delta":{"content":"ok"}}]}\n\n',
+                b"data: [DONE]\n\n",
             ]
         )
         mock_request.return_value = mock_resp
@@ -129,6 +232,54 @@ class TestGrokClientStream:
         chunks = list(client.chat_stream([{"role": "user", "content": "hi"}]))
         assert chunks == ["ok"]
 
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_chat_stream_fragmented_chunks(self, mock_request, config):
+        """Test that SSE lines split across network chunks are reassembled."""
+        body = (
+            'data: {"choices":[{"delta":{"content":"caf\u00e9"}}]}\n\n'
+            'data: {"choices":[{"delta":{"content":" ok"}}]}\n\n'
+            "data: [DONE]\n\n"
+        ).encode("utf-8")
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        # Split every 7 bytes — cuts through the prefix and the multibyte char
+        mock_resp.iter_content.return_value = iter(
+            [body[i : i + 7] for i in range(0, len(body), 7)]
+        )
+        mock_request.return_value = mock_resp
+
+        client = GrokClient(config)
+        chunks = list(client.chat_stream([{"role": "user", "content": "hi"}]))
+        assert chunks == ["caf\u00e9", " ok"]
+
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_chat_stream_releases_connection_on_early_exit(self, mock_request, config):
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.iter_content.return_value = iter(
+            [b'data: {"choices":[{"delta":{"content":"a"}}]}\n\n'] * 3
+        )
+        mock_request.return_value = mock_resp
+
+        client = GrokClient(config)
+        stream = client.chat_stream([{"role": "user", "content": "hi"}])
+        assert next(stream) == "a"
+        stream.close()
+        mock_resp.close.assert_called_once()
+
+
+class TestIterSSEData:
+    def test_skips_non_data_lines(self):
+        stream = [b": keep-alive\n", b"event: message\n", b"data: one\n\n", b"data:two\n"]
+        assert list(_iter_sse_data(stream)) == [b"one", b"two"]
+
+    def test_crlf_and_bom(self):
+        stream = [b"\xef\xbb", b"\xbfdata: a\r\n\r\ndata: b\r\n"]
+        assert list(_iter_sse_data(stream)) == [b"a", b"b"]
+
+    def test_unterminated_final_line(self):
+        assert list(_iter_sse_data([b"data: x\n", b"data: [DONE]"])) == [b"x", b"[DONE]"]
+
 
 class TestRetryLogic:
     @patch("grok_mccodin.client.time.sleep")
@@ -142,7 +293,7 @@ class TestRetryLogic:
 
         success_resp = MagicMock()
         success_resp.status_code = 200
-        success_resp.json.return_value = {"choices": [{"message": {"content": "Hello!"}}]}
+        success_resp.content = b'{"choices": [{"message": {"content": "Hello!"}}]}'
 
         mock_request.side_effect = [rate_limit_resp, success_resp]
 
@@ -153,6 +304,45 @@ class TestRetryLogic:
         assert mock_request.call_count == 2
         mock_sleep.assert_called_once()
 
+    @patch("grok_mccodin.client.time.sleep")
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_rate_limited_retries_are_serialized(self, mock_request, mock_sleep, config):
+        """Test that a 429 retry sleeps and retries while holding the single-flight lock."""
+        rate_limit_resp = MagicMock()
+        rate_limit_resp.status_code = 429
+        rate_limit_resp.headers = {}
+        success_resp = MagicMock()
+        success_resp.status_code = 200
+        success_resp.content = b'{"choices": [{"message": {"content": "ok"}}]}'
+        mock_request.side_effect = [rate_limit_resp, success_resp]
+
+        client = GrokClient(config)
+        lock_held: list[bool] = []
+        mock_sleep.side_effect = lambda _delay: lock_held.append(client._ratelimit_lock.locked())
+
+        client.chat([{"role": "user", "content": "hi"}])
+        assert lock_held == [True]
+        assert not client._ratelimit_lock.locked()
+        assert not client._ratelimited.is_set()  # cleared by the success
+
+    @patch("grok_mccodin.client.time.sleep")
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_5xx_retries_not_serialized(self, mock_request, mock_sleep, config):
+        error_resp = MagicMock()
+        error_resp.status_code = 502
+        error_resp.headers = {}
+        success_resp = MagicMock()
+        success_resp.status_code = 200
+        success_resp.content = b'{"choices": [{"message": {"content": "ok"}}]}'
+        mock_request.side_effect = [error_resp, success_resp]
+
+        client = GrokClient(config)
+        lock_held: list[bool] = []
+        mock_sleep.side_effect = lambda _delay: lock_held.append(client._ratelimit_lock.locked())
+
+        client.chat([{"role": "user", "content": "hi"}])
+        assert lock_held == [False]
+
     @patch("grok_mccodin.client.time.sleep")
     @patch("grok_mccodin.client.requests.Session.request")
     def test_retries_on_500(self, mock_request, mock_sleep, config):
@@ -164,7 +354,7 @@ class TestRetryLogic:
 
         success_resp = MagicMock()
         success_resp.status_code = 200
-        success_resp.json.return_value = {"choices": [{"message": {"content": "ok"}}]}
+        success_resp.content = b'{"choices": [{"message": {"content": "ok"}}]}'
 
         mock_request.side_effect = [error_resp, success_resp]
 
@@ -202,7 +392,7 @@ class TestRetryLogic:
 
         success_resp = MagicMock()
         success_resp.status_code = 200
-        success_resp.json.return_value = {"choices": [{"message": {"content": "ok"}}]}
+        success_resp.content = b'{"choices": [{"message": {"content": "ok"}}]}'
 
         mock_request.side_effect = [rate_limit_resp, success_resp]
 
@@ -229,10 +419,11 @@ class TestRetryLogic:
         assert mock_request.call_count == 1
         mock_sleep.assert_not_called()
 
+    @patch("grok_mccodin.client.random.uniform", side_effect=lambda lo, hi: hi)
     @patch("grok_mccodin.client.time.sleep")
     @patch("grok_mccodin.client.requests.Session.request")
-    def test_exponential_backoff_delays(self, mock_request, mock_sleep, config):
-        """Test that delays follow exponential backoff: 1s, 2s, 4s."""
+    def test_exponential_backoff_delays(self, mock_request, mock_sleep, mock_uniform, config):
+        """Test that the jitter ceiling follows exponential backoff: 1s, 2s, 4s."""
         error_resp = MagicMock()
         error_resp.status_code = 502
         error_resp.text = "bad gateway"
@@ -247,3 +438,324 @@ class TestRetryLogic:
         # Should have slept 3 times with exponential delays
         sleep_calls = [call.args[0] for call in mock_sleep.call_args_list]
         assert sleep_calls == [1.0, 2.0, 4.0]
+
+    @patch("grok_mccodin.client.time.sleep")
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_backoff_is_jittered(self, mock_request, mock_sleep, config):
+        """Test that each delay falls within [0, exponential cap]."""
+        error_resp = MagicMock()
+        error_resp.status_code = 502
+        error_resp.text = "bad gateway"
+        error_resp.headers = {}
+        mock_request.return_value = error_resp
+
+        client = GrokClient(config)
+        with pytest.raises(GrokAPIError):
+            client.chat([{"role": "user", "content": "hi"}])
+
+        sleep_calls = [call.args[0] for call in mock_sleep.call_args_list]
+        for attempt, delay in enumerate(sleep_calls):
+            assert 0 <= delay <= 2.0**attempt
+
+    @patch("grok_mccodin.client.time.sleep")
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_retry_after_honored_on_5xx(self, mock_request, mock_sleep, config):
+        error_resp = MagicMock()
+        error_resp.status_code = 503
+        error_resp.headers = {"Retry-After": "7"}
+        success_resp = MagicMock()
+        success_resp.status_code = 200
+        success_resp.content = b'{"choices": [{"message": {"content": "ok"}}]}'
+        mock_request.side_effect = [error_resp, success_resp]
+
+        client = GrokClient(config)
+        client.chat([{"role": "user", "content": "hi"}])
+        mock_sleep.assert_called_once_with(7.0)
+
+    @patch("grok_mccodin.client.time.sleep")
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_retry_after_clamped(self, mock_request, mock_sleep, config):
+        error_resp = MagicMock()
+        error_resp.status_code = 429
+        error_resp.headers = {"Retry-After": "3600"}
+        success_resp = MagicMock()
+        success_resp.status_code = 200
+        success_resp.content = b'{"choices": [{"message": {"content": "ok"}}]}'
+        mock_request.side_effect = [error_resp, success_resp]
+
+        client = GrokClient(config)
+        client.chat([{"role": "user", "content": "hi"}])
+        mock_sleep.assert_called_once_with(60.0)
+
+    @patch("grok_mccodin.client.time.sleep")
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_max_retries_from_config(self, mock_request, mock_sleep, config):
+        error_resp = MagicMock()
+        error_resp.status_code = 500
+        error_resp.text = "internal error"
+        error_resp.headers = {}
+        mock_request.return_value = error_resp
+
+        config.max_retries = 1
+        client = GrokClient(config)
+        with pytest.raises(GrokAPIError):
+            client.chat([{"role": "user", "content": "hi"}])
+        assert mock_request.call_count == 2
+
+
+class TestResponseCache:
+    def test_get_set(self):
+        cache = ResponseCache(max_size=4, default_ttl=60)
+        cache.set("k", "v")
+        assert cache.get("k") == "v"
+        assert cache.get("missing") is None
+
+    def test_expiry(self):
+        cache = ResponseCache(default_ttl=60)
+        cache.set("k", "v", ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_size=2, default_ttl=60)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", "3")
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
+        assert cache.get("c") == "3"
+
+    def test_stale_window(self):
+        cache = ResponseCache(default_ttl=60, stale_ttl=60)
+        cache.set("k", "v", ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get("k") is None
+        assert cache.lookup("k") == ("v", True)
+
+    def test_disabled(self):
+        cache = ResponseCache(default_ttl=0)
+        cache.set("k", "v")
+        assert not cache.enabled
+        assert cache.get("k") is None
+
+
+class TestChatCache:
+    @staticmethod
+    def _stream_resp(*tokens: str) -> MagicMock:
+        resp = MagicMock()
+        resp.status_code = 200
+        lines = [
+            b'data: {"choices":[{"delta":{"content":"' + t.encode() + b'"}}]}\n\n' for t in tokens
+        ]
+        resp.iter_content.return_value = iter([*lines, b"data: [DONE]\n\n"])
+        return resp
+
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_completed_stream_is_cached(self, mock_request, config):
+        mock_request.return_value = self._stream_resp("Hel", "lo")
+        client = GrokClient(config)
+        msgs = [{"role": "user", "content": "hi"}]
+        assert list(client.chat_stream(msgs)) == ["Hel", "lo"]
+        assert list(client.chat_stream(msgs)) == ["Hello"]
+        assert client.chat(msgs) == "Hello"  # shared with the blocking call
+        assert mock_request.call_count == 1
+
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_abandoned_stream_not_cached(self, mock_request, config):
+        mock_request.side_effect = [self._stream_resp("a", "b"), self._stream_resp("a", "b")]
+        client = GrokClient(config)
+        msgs = [{"role": "user", "content": "hi"}]
+        stream = client.chat_stream(msgs)
+        next(stream)
+        stream.close()
+        assert list(client.chat_stream(msgs)) == ["a", "b"]
+        assert mock_request.call_count == 2
+
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_use_cache_off_forces_refresh(self, mock_request, config):
+        first, second = MagicMock(), MagicMock()
+        first.status_code = second.status_code = 200
+        first.content = b'{"choices": [{"message": {"content": "old"}}]}'
+        second.content = b'{"choices": [{"message": {"content": "new"}}]}'
+        mock_request.side_effect = [first, second]
+
+        client = GrokClient(config)
+        msgs = [{"role": "user", "content": "hi"}]
+        assert client.chat(msgs) == "old"
+        config.use_cache = False
+        assert client.chat(msgs) == "new"
+        config.use_cache = True
+        assert client.chat(msgs) == "new"  # the refreshed reply replaced the old one
+        assert mock_request.call_count == 2
+
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_identical_requests_hit_cache(self, mock_request, config):
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.content = b'{"choices": [{"message": {"content": "cached"}}]}'
+        mock_request.return_value = mock_resp
+
+        client = GrokClient(config)
+        msgs = [{"role": "user", "content": "hi"}]
+        assert client.chat(msgs) == "cached"
+        assert client.chat(msgs) == "cached"
+        assert mock_request.call_count == 1
+
+        # A different payload is a different key
+        client.chat(msgs, temperature=0.1)
+        assert mock_request.call_count == 2
+
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_errors_not_cached(self, mock_request, config):
+        mock_resp = MagicMock()
+        mock_resp.status_code = 401
+        mock_resp.text = "unauthorized"
+        mock_request.return_value = mock_resp
+
+        client = GrokClient(config)
+        for _ in range(2):
+            with pytest.raises(GrokAPIError):
+                client.chat([{"role": "user", "content": "hi"}])
+        assert mock_request.call_count == 2
+
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_cache_disabled_by_config(self, mock_request, config):
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.content = b'{"choices": [{"message": {"content": "x"}}]}'
+        mock_request.return_value = mock_resp
+
+        config.cache_ttl = 0
+        client = GrokClient(config)
+        client.chat([{"role": "user", "content": "hi"}])
+        client.chat([{"role": "user", "content": "hi"}])
+        assert mock_request.call_count == 2
+
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_stale_entry_served_and_refreshed(self, mock_request, config):
+        refreshed = threading.Event()
+
+        def fresh_request(*args, **kwargs):
+            refreshed.set()
+            resp = MagicMock()
+            resp.status_code = 200
+            resp.content = b'{"choices": [{"message": {"content": "new"}}]}'
+            return resp
+
+        mock_request.side_effect = fresh_request
+        config.cache_stale_ttl = 60
+        client = GrokClient(config)
+        msgs = [{"role": "user", "content": "hi"}]
+        payload = {"model": "grok-3", "messages": msgs, "temperature": 0.7, "max_tokens": 4096}
+        key = _fingerprint(payload)
+        client.cache.set(key, "old", ttl=0)
+
+        assert client.chat(msgs) == "old"
+        assert refreshed.wait(timeout=5)
+        for _ in range(100):
+            if client.cache.get(key) == "new":
+                break
+            time.sleep(0.01)
+        assert client.chat(msgs) == "new"
+        assert mock_request.call_count == 1
+
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_concurrent_identical_requests_coalesce(self, mock_request, config):
+        release = threading.Event()
+
+        def slow_request(*args, **kwargs):
+            release.wait(timeout=5)
+            resp = MagicMock()
+            resp.status_code = 200
+            resp.content = b'{"choices": [{"message": {"content": "shared"}}]}'
+            return resp
+
+        mock_request.side_effect = slow_request
+
+        client = GrokClient(config)
+        msgs = [{"role": "user", "content": "hi"}]
+        results: list[str] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(client.chat(msgs))) for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert results == ["shared"] * 4
+        assert mock_request.call_count == 1
+
+
+class TestAdaptiveLimiter:
+    def test_halves_on_throttle_and_recovers(self):
+        limiter = _AdaptiveLimiter(max_concurrency=4)
+        limiter.record(429, 0.1)
+        assert limiter.concurrency == 2.0
+        limiter.record(503, 0.1)
+        limiter.record(None, 0.1)
+        assert limiter.concurrency == 1.0  # floor: single request at a time
+        limiter.record(200, 0.1)
+        assert limiter.concurrency == 1.5
+        for _ in range(10):
+            limiter.record(200, 0.1)
+        assert limiter.concurrency == 4.0
+
+    def test_slow_success_does_not_grow_window(self):
+        limiter = _AdaptiveLimiter(max_concurrency=4)
+        limiter.record(429, 0.1)
+        limiter.record(200, 999.0)
+        assert limiter.concurrency == 2.0
+
+    @patch("grok_mccodin.client.time.sleep")
+    def test_rpm_cap_blocks(self, mock_sleep):
+        limiter = _AdaptiveLimiter(rpm=2)
+        for _ in range(3):
+            limiter.acquire()
+            limiter.release()
+        mock_sleep.assert_called_once()
+        assert 0 < mock_sleep.call_args.args[0] <= 60.0
+
+    @patch("grok_mccodin.client.time.sleep")
+    def test_low_quota_headers_pause(self, mock_sleep):
+        limiter = _AdaptiveLimiter()
+        headers = {
+            "x-ratelimit-limit-requests": "100",
+            "x-ratelimit-remaining-requests": "5",
+            "x-ratelimit-reset-requests": "3s",
+        }
+        limiter.record(200, 0.1, headers)
+        limiter.acquire()
+        limiter.release()
+        mock_sleep.assert_called_once()
+        assert 2.5 < mock_sleep.call_args.args[0] <= 3.0
+
+    @patch("grok_mccodin.client.time.sleep")
+    def test_retry_after_pauses_other_requests(self, mock_sleep):
+        limiter = _AdaptiveLimiter()
+        limiter.record(429, 0.1, {"Retry-After": "2"})
+        limiter.acquire(retry=True)
+        limiter.release()
+        mock_sleep.assert_not_called()
+        limiter.acquire()
+        limiter.release()
+        mock_sleep.assert_called_once()
+
+    @patch("grok_mccodin.client.time.sleep")
+    @patch("grok_mccodin.client.requests.Session.request")
+    def test_client_shrinks_window_on_429(self, mock_request, mock_sleep, config):
+        rate_limit_resp = MagicMock()
+        rate_limit_resp.status_code = 429
+        rate_limit_resp.headers = {}
+        success_resp = MagicMock()
+        success_resp.status_code = 200
+        success_resp.content = b'{"choices": [{"message": {"content": "ok"}}]}'
+        mock_request.side_effect = [rate_limit_resp, success_resp]
+
+        client = GrokClient(config)
+        client.chat([{"role": "user", "content": "hi"}])
+        assert client._limiter.concurrency == 2.5
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import os
+import sys
 from unittest.mock import patch
 
+from grok_mccodin import config as config_mod
 from grok_mccodin.config import Config
 
 
@@ -34,3 +36,58 @@ class TestConfig:
         cfg = Config.from_env()
         assert cfg.grok_api_key == "env-key"
         assert cfg.grok_model == "grok-3-mini"
+
+    @patch.dict(os.environ, {"GROK_MODEL": "grok-3-mini"})
+    def test_from_env_interns_model(self):
+        # os.getenv decodes a fresh str each call; from_env must intern it
+        assert Config.from_env().grok_model is sys.intern("grok-3-mini")
+
+    @patch.dict(os.environ, {"GROK_MAX_RETRIES": "5", "GROK_RPM": "not-a-number"})
+    def test_from_env_client_tuning(self):
+        cfg = Config.from_env()
+        assert cfg.max_retries == 5
+        assert cfg.rate_limit_rpm == 0  # invalid value falls back to default
+
+
+class TestDotenvLoading:
+    def test_dotenv_walk_and_load_happen_once(self, tmp_path, monkeypatch):
+        (tmp_path / ".env").write_text("GROK_TEST_ONLY_VAR=from-dotenv\n")
+        sub = tmp_path / "pkg"
+        sub.mkdir()
+        monkeypatch.chdir(sub)
+        # setenv registers teardown so the value loaded from .env doesn't leak
+        monkeypatch.setenv("GROK_TEST_ONLY_VAR", "")
+        monkeypatch.delenv("GROK_TEST_ONLY_VAR")
+        config_mod._find_dotenv_from.cache_clear()
+
+        with patch.object(config_mod, "load_dotenv", wraps=config_mod.load_dotenv) as mock_load:
+            assert config_mod._find_dotenv() == tmp_path / ".env"
+            Config.from_env()
+            Config.from_env()
+        assert mock_load.call_count == 1
+        assert os.environ["GROK_TEST_ONLY_VAR"] == "from-dotenv"
+        assert config_mod._find_dotenv_from.cache_info().hits >= 2
+
+    def test_reload_picks_up_edits_but_not_over_shell(self, tmp_path, monkeypatch):
+        env = tmp_path / ".env"
+        env.write_text("GROK_TEST_RELOAD=one\nGROK_TEST_SHELL=dotenv\n")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("GROK_TEST_RELOAD", "")
+        monkeypatch.delenv("GROK_TEST_RELOAD")
+        monkeypatch.setenv("GROK_TEST_SHELL", "shell")
+        monkeypatch.setattr(config_mod, "_loaded_dotenvs", set())
+        monkeypatch.setattr(config_mod, "_shell_env", None)
+        config_mod._find_dotenv_from.cache_clear()
+
+        Config.from_env()
+        assert os.environ["GROK_TEST_RELOAD"] == "one"
+        env.write_text("GROK_TEST_RELOAD=two\nGROK_TEST_SHELL=dotenv\n")
+        config_mod.reload_dotenv()
+        assert os.environ["GROK_TEST_RELOAD"] == "two"
+        assert os.environ["GROK_TEST_SHELL"] == "shell"
+
+    def test_from_env_returns_independent_instances(self):
+        a = Config.from_env()
+        b = Config.from_env()
+        a.safe_lock = True
+        assert b.safe_lock is False
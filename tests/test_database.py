@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+import sqlite3
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
 import pytest
 
+from grok_mccodin import database
 from grok_mccodin.database import DatabaseError, SQLiteDB, run_query
 
 
@@ -20,6 +26,24 @@ class TestSQLiteDB:
             assert rows[0]["name"] == "Alice"
             assert rows[1]["age"] == 25
 
+    def test_iter_query_streams_rows(self, tmp_path):
+        db_path = tmp_path / "test.db"
+        with SQLiteDB(db_path) as db:
+            db.execute_script(
+                "CREATE TABLE n (v INTEGER);"
+                "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 1000)"
+                " INSERT INTO n SELECT x FROM c;"
+            )
+            it = db.iter_query("SELECT v FROM n ORDER BY v")
+            assert next(it) == {"v": 1}
+            rows = list(it)
+            assert len(rows) == 999
+            assert rows[-1] == {"v": 1000}
+
+    def test_iter_query_bad_sql(self, tmp_path):
+        with SQLiteDB(tmp_path / "test.db") as db, pytest.raises(DatabaseError, match="Query"):
+            next(db.iter_query("SELECT * FROM missing"))
+
     def test_tables(self, tmp_path):
         db_path = tmp_path / "test.db"
         with SQLiteDB(db_path) as db:
@@ -29,6 +53,13 @@ class TestSQLiteDB:
             assert "foo" in tables
             assert "bar" in tables
 
+    def test_tables_main_schema_only(self, tmp_path):
+        with SQLiteDB(tmp_path / "test.db") as db:
+            db.execute("CREATE TABLE foo (id INTEGER)")
+            db.execute("CREATE TEMP TABLE scratch (id INTEGER)")
+            db.execute("CREATE VIEW v AS SELECT id FROM foo")
+            assert db.tables() == ["foo"]
+
     def test_schema(self, tmp_path):
         db_path = tmp_path / "test.db"
         with SQLiteDB(db_path) as db:
@@ -53,6 +84,59 @@ class TestSQLiteDB:
             with pytest.raises(DatabaseError, match="not found"):
                 db.table_info("nonexistent")
 
+    def test_table_info_excludes_views(self, tmp_path):
+        db_path = tmp_path / "test.db"
+        with SQLiteDB(db_path) as db:
+            db.execute_script("CREATE TABLE t (id INTEGER); CREATE VIEW v AS SELECT id FROM t;")
+            assert db.table_info("t")[0]["name"] == "id"
+            with pytest.raises(DatabaseError, match="not found"):
+                db.table_info("v")
+
+    def test_table_info_quoted_name(self, tmp_path):
+        with SQLiteDB(tmp_path / "test.db") as db:
+            db.execute('CREATE TABLE "my table" (id INTEGER)')
+            assert [col["name"] for col in db.table_info("my table")] == ["id"]
+
+    def test_table_info_rejects_trailing_newline(self, tmp_path):
+        db_path = tmp_path / "test.db"
+        with SQLiteDB(db_path) as db:
+            db.execute("CREATE TABLE t (id INTEGER)")
+            with pytest.raises(DatabaseError):
+                db.table_info("t\n")
+
+    def test_connection_pragmas(self, tmp_path):
+        db_path = tmp_path / "test.db"
+        with SQLiteDB(db_path) as db:
+            assert db.query("PRAGMA journal_mode")[0]["journal_mode"] == "wal"
+            assert db.query("PRAGMA synchronous")[0]["synchronous"] == 1  # NORMAL
+            assert db.query("PRAGMA temp_store")[0]["temp_store"] == 2  # MEMORY
+
+    def test_existing_database_keeps_journal_mode(self, tmp_path):
+        db_path = tmp_path / "user.db"
+        sqlite3.connect(db_path).close()
+        with SQLiteDB(db_path) as db:
+            assert db.query("PRAGMA journal_mode")[0]["journal_mode"] == "delete"
+            assert db.query("PRAGMA synchronous")[0]["synchronous"] == 2  # FULL
+            assert db.query("PRAGMA temp_store")[0]["temp_store"] == 2  # MEMORY
+
+    def test_usable_from_other_thread(self, tmp_path):
+        db_path = tmp_path / "test.db"
+        with SQLiteDB(db_path) as db:
+            db.execute("CREATE TABLE t (id INTEGER)")
+            errors: list[DatabaseError] = []
+
+            def worker() -> None:
+                try:
+                    db.execute("INSERT INTO t VALUES (1)")
+                except DatabaseError as exc:  # e.g. "created in a different thread"
+                    errors.append(exc)
+
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+            assert not errors
+            assert db.query("SELECT COUNT(*) AS n FROM t")[0]["n"] == 1
+
     def test_execute_script(self, tmp_path):
         db_path = tmp_path / "test.db"
         with SQLiteDB(db_path) as db:
@@ -100,3 +184,43 @@ class TestRunQuery:
     def test_unsupported_prefix(self):
         with pytest.raises(DatabaseError, match="Unsupported"):
             run_query("redis://localhost", "PING")
+
+    def test_postgres_reuses_pool(self, monkeypatch):
+        fake_pg = MagicMock()
+        fake_pg.Error = type("Error", (Exception,), {})
+        pool = fake_pg.pool.ThreadedConnectionPool.return_value
+        cur = pool.getconn.return_value.cursor.return_value.__enter__.return_value
+        cur.description = [("n",)]
+        cur.fetchall.return_value = [{"n": 1}]
+        monkeypatch.setattr(database, "_PG_POOLS", {})
+        modules = {
+            "psycopg2": fake_pg,
+            "psycopg2.extras": fake_pg.extras,
+            "psycopg2.pool": fake_pg.pool,
+        }
+        with patch.dict(sys.modules, modules):
+            for _ in range(3):
+                assert run_query("postgresql://db/x", "SELECT 1 AS n") == [{"n": 1}]
+
+        fake_pg.pool.ThreadedConnectionPool.assert_called_once()
+        assert pool.getconn.call_count == 3
+        assert pool.putconn.call_count == 3
+
+    def test_mysql_opens_connections_lazily(self, monkeypatch):
+        fake_mysql = MagicMock()
+        fake_mysql.connector.Error = type("Error", (Exception,), {})
+        conn = fake_mysql.connector.connect.return_value
+        conn.is_connected.return_value = True
+        cursor = conn.cursor.return_value
+        cursor.description = [("n",)]
+        cursor.fetchall.return_value = [{"n": 1}]
+        monkeypatch.setattr(database, "_MYSQL_IDLE", {})
+        modules = {"mysql": fake_mysql, "mysql.connector": fake_mysql.connector}
+        with patch.dict(sys.modules, modules):
+            for _ in range(3):
+                assert run_query("mysql://u:p@db/x", "SELECT 1 AS n") == [{"n": 1}]
+
+        # One handshake, reused: no connections opened ahead of demand
+        fake_mysql.connector.connect.assert_called_once()
+        assert database._MYSQL_IDLE["mysql://u:p@db/x"] == [conn]
+        conn.close.assert_not_called()
@@ -10,12 +10,25 @@ import pytest
 from grok_mccodin.docker import (
     DockerError,
     _run_docker,
+    clear_cache,
+    exec_,
     is_docker_available,
     ps,
+    ps_columns,
     ps_json,
+    run,
+    stop,
+    summary,
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
 class TestRunDocker:
     @patch("grok_mccodin.docker.subprocess.run")
     def test_success(self, mock_run):
@@ -66,6 +79,15 @@ class TestPsJson:
         assert len(result) == 1
         assert result[0]["Image"] == "nginx"
 
+    @patch("grok_mccodin.docker.subprocess.run")
+    def test_ps_json_skips_bad_lines(self, mock_run):
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout='{"ID":"a"}\r\n  \nnot json\n{"ID":"b"}',
+            stderr="",
+        )
+        assert [c["ID"] for c in ps_json()] == ["a", "b"]
+
     @patch("grok_mccodin.docker.subprocess.run")
     def test_ps_json_empty(self, mock_run):
         mock_run.return_value = MagicMock(returncode=0, stdout="\n", stderr="")
@@ -73,6 +95,25 @@ class TestPsJson:
         assert result == []
 
 
+class TestPsColumns:
+    @patch("grok_mccodin.docker.subprocess.run")
+    def test_columns(self, mock_run):
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout='{"ID":"a","Image":"nginx","Names":"web"}\n{"ID":"b","Image":"redis"}\n',
+            stderr="",
+        )
+        cols = ps_columns(cols=("ID", "Names"))
+        assert cols == {"ID": ["a", "b"], "Names": ["web", None]}
+
+    @patch("grok_mccodin.docker.subprocess.run")
+    def test_shares_cache_with_ps_json(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout='{"ID":"a"}\n', stderr="")
+        ps_json()
+        assert ps_columns(cols=("ID",)) == {"ID": ["a"]}
+        assert mock_run.call_count == 1
+
+
 class TestIsDockerAvailable:
     @patch("grok_mccodin.docker.subprocess.run")
     def test_available(self, mock_run):
@@ -83,3 +124,103 @@ class TestIsDockerAvailable:
     def test_not_available(self, mock_run):
         mock_run.side_effect = FileNotFoundError()
         assert is_docker_available() is False
+
+
+class TestReadCache:
+    @patch("grok_mccodin.docker.subprocess.run")
+    def test_repeated_ps_reuses_output(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout="abc123\tnginx\n", stderr="")
+        assert ps() == ps()
+        assert mock_run.call_count == 1
+
+    @patch("grok_mccodin.docker.subprocess.run")
+    def test_key_includes_args(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        ps()
+        ps(all_=True)
+        assert mock_run.call_count == 2
+
+    @patch("grok_mccodin.docker.subprocess.run")
+    def test_mutation_invalidates(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        ps()
+        stop("web")
+        ps()
+        assert mock_run.call_count == 3
+
+    @patch("grok_mccodin.docker.subprocess.run")
+    def test_failures_not_cached(self, mock_run):
+        mock_run.side_effect = [
+            MagicMock(returncode=1, stdout="", stderr="daemon not running"),
+            MagicMock(returncode=0, stdout="ok", stderr=""),
+        ]
+        with pytest.raises(DockerError):
+            ps()
+        assert ps() == "ok"
+
+    @patch("grok_mccodin.docker.subprocess.run")
+    def test_ttl_zero_disables(self, mock_run, monkeypatch):
+        monkeypatch.setenv("GROK_DOCKER_TTL", "0")
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        ps()
+        ps()
+        assert mock_run.call_count == 2
+
+    @patch("grok_mccodin.docker.time.monotonic")
+    @patch("grok_mccodin.docker.subprocess.run")
+    def test_expired_entry_refetched(self, mock_run, mock_clock):
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        mock_clock.side_effect = [100.0, 100.5, 103.0, 103.0]
+        ps()  # miss, stored at 100.0
+        ps()  # hit at 100.5
+        ps()  # expired at 103.0
+        assert mock_run.call_count == 2
+
+
+class TestSummary:
+    @patch("grok_mccodin.docker.subprocess.run")
+    def test_summary(self, mock_run):
+        def fake_run(cmd, **kwargs):
+            out = "abc123\tnginx" if cmd[1] == "ps" else "nginx\tlatest"
+            return MagicMock(returncode=0, stdout=out, stderr="")
+
+        mock_run.side_effect = fake_run
+        result = summary()
+        assert result.index("Running containers") < result.index("Images")
+        assert "abc123" in result
+        assert "latest" in result
+
+    @patch("grok_mccodin.docker.subprocess.run")
+    def test_summary_without_images(self, mock_run):
+        def fake_run(cmd, **kwargs):
+            if cmd[1] == "images":
+                return MagicMock(returncode=1, stdout="", stderr="boom")
+            return MagicMock(returncode=0, stdout="abc123", stderr="")
+
+        mock_run.side_effect = fake_run
+        result = summary()
+        assert "abc123" in result
+        assert "Images" not in result
+
+    @patch("grok_mccodin.docker.subprocess.run")
+    def test_summary_unavailable(self, mock_run):
+        mock_run.side_effect = FileNotFoundError()
+        assert summary() == "[Docker not available]"
+
+
+class TestCommandArgv:
+    @patch("grok_mccodin.docker.subprocess.run")
+    def test_run_respects_quotes(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout="id\n", stderr="")
+        run("alpine", command='sh -c "echo hi there"')
+        assert mock_run.call_args.args[0][-3:] == ["sh", "-c", "echo hi there"]
+
+    @patch("grok_mccodin.docker.subprocess.run")
+    def test_exec_accepts_argv_list(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        exec_("web", ["ls", "-la", "/my dir"])
+        assert mock_run.call_args.args[0] == ["docker", "exec", "web", "ls", "-la", "/my dir"]
+
+    def test_unbalanced_quotes(self):
+        with pytest.raises(DockerError, match="Cannot parse"):
+            exec_("web", 'echo "oops')
@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
+import difflib
+import errno
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
 from grok_mccodin.editor import (
     _safe_resolve,
     apply_create,
     apply_delete,
     apply_edit,
+    extract_all,
     extract_code_blocks,
     extract_commands,
     extract_creates,
@@ -28,6 +37,23 @@ class TestSafeResolve:
     def test_blocks_absolute_escape(self, tmp_path):
         assert _safe_resolve("/etc/passwd", tmp_path) is None
 
+    @pytest.mark.skipif(sys.platform == "win32", reason="symlinks need privileges")
+    def test_blocks_symlink_escape(self, tmp_path):
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        base = tmp_path / "base"
+        base.mkdir()
+        (base / "link").symlink_to(outside)
+        assert _safe_resolve("link/secret.txt", base) is None
+
+    def test_relative_base_follows_cwd(self, tmp_path, monkeypatch):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        monkeypatch.chdir(tmp_path / "a")
+        assert _safe_resolve("f.py", ".") == (tmp_path / "a" / "f.py").resolve()
+        monkeypatch.chdir(tmp_path / "b")
+        assert _safe_resolve("f.py", ".") == (tmp_path / "b" / "f.py").resolve()
+
 
 class TestExtractCodeBlocks:
     def test_basic_block(self):
@@ -76,6 +102,37 @@ class TestExtractDeletes:
         assert deletes == ["old_file.py"]
 
 
+class TestExtractAll:
+    def test_matches_individual_extractors(self):
+        text = (
+            "Edit this:\n```python:src/a.py\nx = 1\n```\n"
+            "CREATE: src/new.py\n```python\nprint('new')\n```\n"
+            "```\nplain\n```\n"
+            "DELETE: old.py\nRUN: pytest -q\n"
+        )
+        actions = extract_all(text)
+        assert actions["blocks"] == extract_code_blocks(text)
+        assert [b["filename"] for b in actions["blocks"]] == ["src/a.py", "", ""]
+        assert actions["creates"] == [{"path": "src/new.py", "code": "print('new')"}]
+        assert actions["deletes"] == ["old.py"]
+        assert actions["commands"] == ["pytest -q"]
+
+    def test_directives_inside_fence_are_code(self):
+        text = "```yaml:ci.yml\nRUN: rm -rf build\nDELETE: x.py\n```\nRUN: make\n"
+        actions = extract_all(text)
+        assert actions["commands"] == ["make"]
+        assert actions["deletes"] == []
+        assert actions["blocks"][0]["code"] == "RUN: rm -rf build\nDELETE: x.py"
+
+    def test_empty(self):
+        assert extract_all("just prose") == {
+            "blocks": [],
+            "creates": [],
+            "deletes": [],
+            "commands": [],
+        }
+
+
 class TestShowDiff:
     def test_shows_changes(self):
         diff = show_diff("line1\nline2\n", "line1\nline2_changed\n", "test.py")
@@ -86,6 +143,27 @@ class TestShowDiff:
         diff = show_diff("same\n", "same\n")
         assert diff == ""
 
+    @pytest.mark.parametrize(
+        ("original", "modified"),
+        [
+            ("", "new\n"),
+            ("old\n", ""),
+            ("a\nb\nc\n", "a\nc\n"),
+            ("no newline", "no newline\nadded\n"),
+            ("".join(f"{i}\n" for i in range(40)), "".join(f"{i}\n" for i in range(40) if i % 9)),
+        ],
+    )
+    def test_matches_difflib(self, original, modified):
+        expected = "".join(
+            difflib.unified_diff(
+                original.splitlines(keepends=True),
+                modified.splitlines(keepends=True),
+                fromfile="a/f.py",
+                tofile="b/f.py",
+            )
+        )
+        assert show_diff(original, modified, "f.py") == expected
+
 
 class TestApplyEdit:
     def test_creates_new_file(self, tmp_path):
@@ -106,6 +184,27 @@ class TestApplyEdit:
         result = apply_edit("same.py", "content", base_dir=tmp_path)
         assert "No changes" in result
 
+    def test_identical_bytes_skip_diff_and_write(self, tmp_path):
+        target = tmp_path / "same.py"
+        target.write_text("x = 1\n")
+        with (
+            patch("grok_mccodin.editor.show_diff") as mock_diff,
+            patch.object(Path, "write_bytes") as mock_write,
+        ):
+            result = apply_edit("same.py", "x = 1\n", base_dir=tmp_path)
+        assert "No changes" in result
+        mock_diff.assert_not_called()
+        mock_write.assert_not_called()
+
+    def test_empty_file_unchanged(self, tmp_path):
+        (tmp_path / "empty.py").write_text("")
+        assert "No changes" in apply_edit("empty.py", "", base_dir=tmp_path)
+
+    def test_same_size_different_content(self, tmp_path):
+        (tmp_path / "f.py").write_text("aaaa")
+        assert apply_edit("f.py", "bbbb", base_dir=tmp_path) == "Updated f.py"
+        assert (tmp_path / "f.py").read_text() == "bbbb"
+
 
 class TestApplyCreate:
     def test_creates_file(self, tmp_path):
@@ -133,6 +232,16 @@ class TestApplyDelete:
         assert len(trash_files) == 1
         assert "doomed.py" in trash_files[0].name
 
+    def test_cross_device_falls_back_to_move(self, tmp_path):
+        (tmp_path / "doomed.py").write_text("bye")
+        exdev = OSError(errno.EXDEV, "Invalid cross-device link")
+        with (
+            patch("grok_mccodin.editor.os.replace", side_effect=exdev),
+            patch("grok_mccodin.editor.shutil.move") as mock_move,
+        ):
+            apply_delete("doomed.py", base_dir=tmp_path)
+        mock_move.assert_called_once()
+
     def test_skip_missing(self, tmp_path):
         result = apply_delete("nope.py", base_dir=tmp_path)
         assert "skip" in result
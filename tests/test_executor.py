@@ -2,7 +2,21 @@
 
 from __future__ import annotations
 
-from grok_mccodin.executor import is_safe, run_shell
+import os
+import shutil
+import sys
+
+import pytest
+
+from grok_mccodin.executor import (
+    BLOCKED_COMMANDS,
+    _py_worker,
+    _simple_argv,
+    is_safe,
+    run_python,
+    run_shell,
+    spawn_agents,
+)
 
 
 class TestIsSafe:
@@ -16,6 +30,24 @@ class TestIsSafe:
         assert not is_safe("rm -rf /*")
         assert not is_safe("mkfs.ext4 /dev/sda")
 
+    def test_blocks_case_insensitive_and_embedded(self):
+        assert not is_safe("  echo ok && RM -RF /tmp")
+        assert not is_safe(":(){:|:&};:")
+
+    def test_picks_up_added_entries(self, monkeypatch):
+        monkeypatch.setattr(
+            "grok_mccodin.executor.BLOCKED_COMMANDS", BLOCKED_COMMANDS | {"shutdown"}
+        )
+        assert not is_safe("sudo shutdown -h now")
+
+    def test_picks_up_in_place_additions(self):
+        BLOCKED_COMMANDS.add("halt")
+        try:
+            assert not is_safe("halt")
+        finally:
+            BLOCKED_COMMANDS.discard("halt")
+        assert is_safe("halt")
+
 
 class TestRunShell:
     def test_runs_echo(self):
@@ -46,3 +78,105 @@ class TestRunShell:
         result = run_shell("rm -rf /", confirm=False)
         assert result["returncode"] == -1
         assert "BLOCKED" in result["stderr"]
+
+
+class TestSpawnAgents:
+    def test_runs_all_tasks(self):
+        results = dict(spawn_agents(["echo one", "echo two"], confirm=False))
+        assert set(results) == {"echo one", "echo two"}
+        assert "one" in results["echo one"]["stdout"]
+        assert "two" in results["echo two"]["stdout"]
+
+    def test_declined_batch_skips_all(self, monkeypatch):
+        monkeypatch.setattr("grok_mccodin.executor._confirm", lambda prompt: False)
+        results = list(spawn_agents(["echo one", "echo two"]))
+        assert [r["returncode"] for _, r in results] == [-1, -1]
+        assert all("SKIPPED" in r["stderr"] for _, r in results)
+
+
+class TestSimpleArgv:
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX only")
+    def test_plain_command_split(self):
+        assert _simple_argv('pytest -k "a and b" tests/') == ["pytest", "-k", "a and b", "tests/"]
+
+    @pytest.mark.parametrize(
+        "command",
+        ["ls | wc -l", "echo hi > out.txt", "ls *.py", "echo $HOME", "a && b", "cd ~", "x\ny"],
+    )
+    def test_shell_syntax_needs_shell(self, command):
+        assert _simple_argv(command) is None
+
+    def test_unbalanced_quote_needs_shell(self):
+        assert _simple_argv('echo "oops') is None
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX only")
+    def test_builtin_falls_back_to_shell(self, tmp_path):
+        result = run_shell("FOO=bar env", cwd=tmp_path, confirm=False)
+        assert result["returncode"] == 0
+        assert "FOO=bar" in result["stdout"]
+
+    def test_pipeline_still_works(self):
+        result = run_shell("echo hello | tr a-z A-Z", confirm=False)
+        assert "HELLO" in result["stdout"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="persistent worker is POSIX only")
+class TestRunPython:
+    def test_output_and_cwd(self, tmp_path):
+        result = run_python("import os; print(os.getcwd())", cwd=tmp_path, confirm=False)
+        assert result["returncode"] == 0
+        assert result["stdout"].strip() == str(tmp_path.resolve())
+
+    def test_fresh_namespace_each_call(self):
+        run_python("leftover = 1", confirm=False)
+        result = run_python("print(leftover)", confirm=False)
+        assert result["returncode"] == 1
+        assert "NameError" in result["stderr"]
+
+    def test_exit_code(self):
+        assert run_python("import sys; sys.exit(3)", confirm=False)["returncode"] == 3
+
+    def test_timeout_restarts_worker(self):
+        result = run_python("import time; time.sleep(10)", timeout=1, confirm=False)
+        assert "TIMEOUT" in result["stderr"]
+        assert run_python("print('back')", confirm=False)["stdout"] == "back\n"
+
+    def test_worker_crash(self):
+        assert run_python("import os; os._exit(7)", confirm=False)["returncode"] == 7
+        assert run_python("print('back')", confirm=False)["stdout"] == "back\n"
+
+    def test_edited_module_is_reimported(self, tmp_path):
+        (tmp_path / "mymod.py").write_text("X = 1\n")
+        code = "import mymod; print(mymod.X)"
+        assert run_python(code, cwd=tmp_path, confirm=False)["stdout"] == "1\n"
+        (tmp_path / "mymod.py").write_text("X = 22\n")
+        assert run_python(code, cwd=tmp_path, confirm=False)["stdout"] == "22\n"
+
+    def test_child_process_output_captured(self):
+        code = "import subprocess; print('a', flush=True); subprocess.run(['echo', 'b'])"
+        assert run_python(code, confirm=False)["stdout"] == "a\nb\n"
+
+    def test_globals_do_not_leak(self):
+        run_python(
+            "import os, sys; os.environ['LEAK'] = '1'; sys.path.append('/leak')", confirm=False
+        )
+        result = run_python(
+            "import os, sys; print(os.environ.get('LEAK'), '/leak' in sys.path)", confirm=False
+        )
+        assert result["stdout"] == "None False\n"
+
+    def test_sees_current_environment(self, monkeypatch):
+        monkeypatch.setenv("GROK_TEST_VAR", "fresh")
+        result = run_python("import os; print(os.environ['GROK_TEST_VAR'])", confirm=False)
+        assert result["stdout"] == "fresh\n"
+
+    def test_uses_python_on_path(self):
+        result = run_python("import sys; print(sys.executable)", confirm=False)
+        expected = os.path.realpath(shutil.which("python"))
+        assert os.path.realpath(result["stdout"].strip()) == expected
+
+    def test_falls_back_when_worker_unavailable(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(_py_worker, "run", lambda *a, **kw: None)
+        result = run_python("print('via temp file')", cwd=tmp_path, confirm=False)
+        assert "via temp file" in result["stdout"]
+        assert not list(tmp_path.glob("*.py"))
@@ -3,13 +3,17 @@
 from __future__ import annotations
 
 import subprocess
+import sys
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from grok_mccodin.git import (
     GitError,
+    _branch_from_status,
     _run_git,
+    checkout,
+    clear_repo_cache,
     current_branch,
     is_git_repo,
     status,
@@ -17,6 +21,13 @@ from grok_mccodin.git import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_repo_cache():
+    clear_repo_cache()
+    yield
+    clear_repo_cache()
+
+
 class TestRunGit:
     @patch("grok_mccodin.git.subprocess.run")
     def test_success(self, mock_run):
@@ -43,6 +54,14 @@ class TestRunGit:
             _run_git(["log"])
 
 
+class TestSpawnOptions:
+    @patch("grok_mccodin.git.subprocess.run")
+    def test_close_fds_skipped_on_linux(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        _run_git(["status"])
+        assert mock_run.call_args.kwargs["close_fds"] is (sys.platform != "linux")
+
+
 class TestStatus:
     @patch("grok_mccodin.git.subprocess.run")
     def test_status(self, mock_run):
@@ -70,6 +89,35 @@ class TestCurrentBranch:
         assert current_branch("/tmp") == "feature-xyz"
 
 
+class TestRepoCache:
+    @patch("grok_mccodin.git.subprocess.run")
+    def test_is_git_repo_cached(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout="true\n", stderr="")
+        assert is_git_repo("/tmp") and is_git_repo("/tmp")
+        assert mock_run.call_count == 1
+
+    @patch("grok_mccodin.git.subprocess.run")
+    def test_checkout_invalidates_branch(self, mock_run):
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout="main\n", stderr=""),
+            MagicMock(returncode=0, stdout="", stderr=""),
+            MagicMock(returncode=0, stdout="feature\n", stderr=""),
+        ]
+        assert current_branch("/tmp") == "main"
+        checkout("feature", cwd="/tmp")
+        assert current_branch("/tmp") == "feature"
+
+    @patch("grok_mccodin.git.subprocess.run")
+    def test_errors_not_cached(self, mock_run):
+        mock_run.side_effect = [
+            MagicMock(returncode=128, stdout="", stderr="fatal"),
+            MagicMock(returncode=0, stdout="main\n", stderr=""),
+        ]
+        with pytest.raises(GitError):
+            current_branch("/tmp")
+        assert current_branch("/tmp") == "main"
+
+
 class TestSummary:
     @patch("grok_mccodin.git.subprocess.run")
     def test_summary_not_repo(self, mock_run):
@@ -79,7 +127,35 @@ class TestSummary:
 
     @patch("grok_mccodin.git.subprocess.run")
     def test_summary_with_data(self, mock_run):
-        # current_branch call, then status, then log
-        mock_run.return_value = MagicMock(returncode=0, stdout="main\n", stderr="")
+        # status (carrying the branch header), then log
+        mock_run.return_value = MagicMock(returncode=0, stdout="## main\n", stderr="")
         result = summary("/tmp")
         assert "Branch: main" in result
+
+    @patch("grok_mccodin.git.subprocess.run")
+    def test_summary_sections_in_order(self, mock_run):
+        outputs = {"status": "## main...origin/main [ahead 1]\n", "log": "abc123 init\n"}
+
+        def fake_run(cmd, **kwargs):
+            return MagicMock(returncode=0, stdout=outputs[cmd[1]], stderr="")
+
+        mock_run.side_effect = fake_run
+        result = summary("/tmp")
+        assert result == (
+            "Branch: main\nStatus:\n## main...origin/main [ahead 1]\n\n"
+            "Recent commits:\nabc123 init\n"
+        )
+        assert mock_run.call_count == 2
+        assert mock_run.call_args.kwargs["env"]["GIT_OPTIONAL_LOCKS"] == "0"
+
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("## main", "main"),
+            ("## feature/x...origin/feature/x [behind 2]", "feature/x"),
+            ("## No commits yet on trunk", "trunk"),
+            ("## HEAD (no branch)", "HEAD"),
+        ],
+    )
+    def test_branch_from_status(self, header, expected):
+        assert _branch_from_status(header + "\n M a.py\n") == expected
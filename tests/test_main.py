@@ -0,0 +1,171 @@
+"""Tests for grok_mccodin.main."""
+
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from grok_mccodin import main
+from grok_mccodin.main import (
+    _apply_cli_override,
+    _cmd_reload,
+    _cmd_spawn,
+    _parse_spawn_args,
+    _run_file_ops,
+    _settled_prefix,
+)
+
+
+class TestParseSpawnArgs:
+    def test_plain_task(self):
+        assert _parse_spawn_args("make test") == ("", "make test")
+
+    def test_label(self):
+        assert _parse_spawn_args("--label build make all") == ("build", "make all")
+
+    def test_quoted_label_and_untouched_task(self):
+        label, task = _parse_spawn_args('--label "nightly job" echo "a  b"')
+        assert label == "nightly job"
+        assert task == 'echo "a  b"'
+
+    def test_label_equals_form(self):
+        assert _parse_spawn_args("--label=x ls") == ("x", "ls")
+
+    @pytest.mark.parametrize(
+        "arg", ["", "--label", "--label foo", "--bogus ls", '--label "open ls']
+    )
+    def test_rejected(self, arg):
+        with pytest.raises(ValueError):
+            _parse_spawn_args(arg)
+
+
+class TestCmdSpawn:
+    @pytest.fixture()
+    def spawned(self):
+        """Run background work inline and record spawn_agent calls."""
+        result = {"stdout": "ok\n", "stderr": "", "returncode": 0}
+        with (
+            patch("grok_mccodin.main._in_background", lambda name, work: work()),
+            patch("grok_mccodin.main.spawn_agent", return_value=result) as spawn,
+            patch("grok_mccodin.main.log_receipt"),
+        ):
+            yield spawn
+
+    def test_runs_task(self, spawned, config, tmp_path, capsys):
+        _cmd_spawn("--label greet echo hi", config, tmp_path)
+        spawned.assert_called_once_with("echo hi", cwd=tmp_path, confirm=False)
+        assert "[spawn] greet: done" in capsys.readouterr().out
+
+    def test_label_without_task(self, spawned, config, tmp_path, capsys):
+        _cmd_spawn("--label foo", config, tmp_path)
+        spawned.assert_not_called()
+        assert "Usage: /spawn" in capsys.readouterr().out
+
+    def test_safe_lock_refuses(self, spawned, config, tmp_path, capsys):
+        config.safe_lock = True
+        _cmd_spawn("echo hi", config, tmp_path)
+        spawned.assert_not_called()
+        assert "Safe Lock" in capsys.readouterr().out
+
+    def test_blocked_command_refused(self, spawned, config, tmp_path, capsys):
+        _cmd_spawn("--label oops rm -rf /", config, tmp_path)
+        spawned.assert_not_called()
+        assert "BLOCKED" in capsys.readouterr().out
+
+
+class TestCmdReload:
+    @pytest.fixture(autouse=True)
+    def _isolated(self, monkeypatch):
+        monkeypatch.setattr(main, "_cli_overrides", set())
+        monkeypatch.setattr(main, "reload_dotenv", lambda: None)
+        monkeypatch.setenv("GROK_MODEL", "model-from-env")
+
+    def test_keeps_cli_model(self, config, tmp_path):
+        _apply_cli_override(config, "grok_model", "model-from-cli")
+        assert _cmd_reload("", config, tmp_path) == "__RELOAD__"
+        assert config.grok_model == "model-from-cli"
+
+    def test_picks_up_env_model(self, config, tmp_path):
+        config.grok_model = "stale"
+        _cmd_reload("", config, tmp_path)
+        assert config.grok_model == "model-from-env"
+
+
+class TestRunFileOps:
+    def test_statuses_in_input_order(self):
+        def op(name, delay):
+            def run():
+                time.sleep(delay)
+                return name
+
+            return run
+
+        ops = [
+            ("edit", "a.py", op("a", 0.05)),
+            ("edit", "b.py", op("b", 0)),
+            ("edit", "c.py", op("c", 0)),
+        ]
+        assert _run_file_ops(ops) == ["a", "b", "c"]
+
+    def test_same_path_runs_sequentially(self):
+        order: list[str] = []
+        lock = threading.Lock()
+
+        def op(name, delay):
+            def run():
+                time.sleep(delay)
+                with lock:
+                    order.append(name)
+                return name
+
+            return run
+
+        ops = [
+            ("edit", "x.py", op("edit", 0.05)),
+            ("edit", "y.py", op("other", 0)),
+            ("delete", "./x.py", op("delete", 0)),
+        ]
+        _run_file_ops(ops)
+        assert order.index("edit") < order.index("delete")
+
+    def test_failure_is_isolated(self):
+        def boom():
+            raise OSError("disk full")
+
+        ops = [
+            ("edit", "a.py", lambda: "Updated a.py"),
+            ("create", "b.py", boom),
+            ("delete", "c.py", lambda: "Deleted c.py"),
+        ]
+        statuses = _run_file_ops(ops)
+        assert statuses[0] == "Updated a.py"
+        assert statuses[1] == "[error] create b.py: disk full"
+        assert statuses[2] == "Deleted c.py"
+
+
+class TestSettledPrefix:
+    def test_no_break(self):
+        assert _settled_prefix("still typing") == 0
+
+    def test_break_outside_fence(self):
+        text = "first para\n\nsecond"
+        assert text[: _settled_prefix(text)] == "first para\n\n"
+
+    def test_break_inside_open_fence(self):
+        text = "intro\n\n```py\na = 1\n\nb = 2"
+        assert text[: _settled_prefix(text)] == "intro\n\n"
+
+    def test_break_after_closed_fence(self):
+        text = "```\ncode\n```\n\nafter"
+        assert _settled_prefix(text) == len("```\ncode\n```\n\n")
+
+    def test_tilde_fence(self):
+        text = "intro\n\n~~~\na\n\nb"
+        assert _settled_prefix(text) == len("intro\n\n")
+
+    def test_backticks_inside_tilde_fence(self):
+        text = "~~~\n```\n~~~\n\nafter"
+        assert _settled_prefix(text) == len("~~~\n```\n~~~\n\n")
@@ -2,12 +2,51 @@
 
 from __future__ import annotations
 
+import io
 import json
-from unittest.mock import patch
+import os
+import sys
+import time
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-from grok_mccodin.mcp import MCPClient, MCPError, MCPRegistry
+from grok_mccodin.mcp import _PIPE_SIZE, MCPClient, MCPError, MCPRegistry, _grow_pipe
+
+# A minimal stdio MCP server: answers every request after argv[1] seconds
+_SLOW_SERVER = """
+import json, sys, time
+for line in sys.stdin:
+    msg = json.loads(line)
+    if "id" in msg:
+        time.sleep(float(sys.argv[1]))
+        result = {"tools": [{"name": "echo"}]} if msg["method"] == "tools/list" else {}
+        print(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": result}), flush=True)
+"""
+
+# Numbers its tools/list answers; a tools/call announces that the list changed
+_COUNTING_SERVER = """
+import json, sys
+lists = 0
+for line in sys.stdin:
+    msg = json.loads(line)
+    if "id" not in msg:
+        continue
+    result = {}
+    if msg["method"] == "tools/list":
+        lists += 1
+        result = {"tools": [{"name": f"v{lists}"}]}
+    elif msg["method"] == "tools/call":
+        print(json.dumps({"jsonrpc": "2.0", "method": "notifications/tools/list_changed"}))
+    print(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": result}), flush=True)
+"""
+
+
+def _slow_servers(n: int, delay: float) -> dict[str, dict]:
+    return {
+        f"s{i}": {"command": sys.executable, "args": ["-c", _SLOW_SERVER, str(delay)]}
+        for i in range(n)
+    }
 
 
 class TestMCPClient:
@@ -35,6 +74,105 @@ class TestMCPClient:
         client.stop()
         assert not client.is_running
 
+    def test_list_tools_cached_until_list_changed(self):
+        client = MCPClient(sys.executable, ["-c", _COUNTING_SERVER])
+        client.start()
+        try:
+            assert client.list_tools() == [{"name": "v1"}]
+            assert client.list_tools() == [{"name": "v1"}]
+            client.call_tool("anything")
+            assert client.list_tools() == [{"name": "v2"}]
+        finally:
+            client.stop()
+
+    def test_begin_list_reuses_cache(self):
+        client = MCPClient(sys.executable, ["-c", _COUNTING_SERVER])
+        client.start()
+        try:
+            first = client.begin_list("tools")
+            assert first.req_id is not None
+            assert client.finish_list(first) == [{"name": "v1"}]
+            second = client.begin_list("tools")
+            assert second.req_id is None
+            assert client.finish_list(second) == [{"name": "v1"}]
+        finally:
+            client.stop()
+
+    def test_chatty_stderr_does_not_stall_server(self):
+        noisy = "import sys; sys.stderr.write('log line\\n' * 50000); sys.stderr.flush()\n"
+        client = MCPClient(sys.executable, ["-c", noisy + _SLOW_SERVER, "0"])
+        try:
+            client.start(timeout=5)
+            assert client.list_tools() == [{"name": "echo"}]
+            assert client._stderr_tail[-1] == "log line"
+        finally:
+            client.stop()
+
+    def test_stop_closes_stdin_before_terminating(self):
+        client = MCPClient(sys.executable, ["-c", _SLOW_SERVER, "0"])
+        client.start()
+        proc = client._proc
+        with patch.object(proc, "terminate") as terminate:
+            client.stop()
+        terminate.assert_not_called()
+        assert proc.returncode == 0
+
+    def test_recv_skips_noise_and_notifications(self):
+        client = MCPClient("echo")
+        client._proc = MagicMock(stderr=None)
+        client._proc.stdout = io.BytesIO(
+            b"starting up\n"
+            b"\n"
+            b'{"jsonrpc": "2.0", "method": "notifications/progress"}\n'
+            b'{"jsonrpc": "2.0", "id": 1, "result": {"ok": true}}\n'
+        )
+        client._start_reader()
+        assert client._recv() == {"jsonrpc": "2.0", "id": 1, "result": {"ok": True}}
+
+    def test_recv_skips_late_responses(self):
+        client = MCPClient("echo")
+        client._proc = MagicMock(stderr=None)
+        client._proc.stdout = io.BytesIO(
+            b'{"jsonrpc": "2.0", "id": 1, "result": {"late": true}}\n'
+            b'{"jsonrpc": "2.0", "id": 2, "result": {}}\n'
+        )
+        client._start_reader()
+        assert client._recv(expect_id=2)["id"] == 2
+
+    def test_recv_times_out(self):
+        r, w = os.pipe()
+        client = MCPClient("echo")
+        client._proc = MagicMock(stderr=None)
+        client._proc.stdout = os.fdopen(r, "rb")
+        try:
+            client._start_reader()
+            with pytest.raises(MCPError, match="did not respond"):
+                client._recv(timeout=0.05)
+        finally:
+            os.close(w)
+
+    def test_recv_server_exit(self):
+        client = MCPClient("echo")
+        client._proc = MagicMock(stderr=None)
+        client._proc.stdout = io.BytesIO(b"")
+        client._proc.stderr = io.BytesIO(b"boom")
+        client._start_reader()
+        with pytest.raises(MCPError, match="closed stdout.*boom"):
+            client._recv()
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="pipe sizing is Linux-only")
+    def test_grow_pipe(self):
+        import fcntl
+
+        r, w = os.pipe()
+        try:
+            with os.fdopen(r, "rb", closefd=False) as pipe:
+                _grow_pipe(pipe)
+            assert fcntl.fcntl(r, fcntl.F_GETPIPE_SZ) == _PIPE_SIZE
+        finally:
+            os.close(r)
+            os.close(w)
+
 
 class TestMCPRegistry:
     def test_empty_registry(self):
@@ -96,3 +234,37 @@ class TestMCPRegistry:
         reg = MCPRegistry()
         # Should not raise
         reg.disconnect_all()
+
+    def test_list_all_tools_overlaps_servers(self):
+        reg = MCPRegistry()
+        reg._servers = _slow_servers(3, 0.3)  # absolute interpreter path fails validation
+        try:
+            reg.connect_all(reg.server_names)
+            start = time.monotonic()
+            tools = reg.list_all_tools()
+            elapsed = time.monotonic() - start
+        finally:
+            reg.disconnect_all()
+        assert tools == {name: [{"name": "echo"}] for name in ("s0", "s1", "s2")}
+        assert elapsed < 0.8  # one server's delay, not three
+
+    def test_connect_all_overlaps_startup(self):
+        reg = MCPRegistry()
+        reg._servers = _slow_servers(3, 0.3)
+        try:
+            start = time.monotonic()
+            failed = reg.connect_all(["s0", "s1", "s2", "missing"])
+            elapsed = time.monotonic() - start
+            assert all(reg.get_client(name) for name in ("s0", "s1", "s2"))
+        finally:
+            reg.disconnect_all()
+        assert list(failed) == ["missing"]
+        assert elapsed < 0.8  # the initialize handshakes ran side by side
+        assert reg.get_client("s0") is None
+
+    def test_connect_all_starts_repeated_name_once(self):
+        reg = MCPRegistry()
+        reg._servers = _slow_servers(1, 0)
+        with patch.object(MCPRegistry, "connect") as connect:
+            assert reg.connect_all(["s0", "s0", "s0"]) == {}
+        connect.assert_called_once_with("s0", 15)
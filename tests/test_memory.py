@@ -144,6 +144,16 @@ class TestConversationMemory:
             "summary" in m.get("content", "").lower() for m in ctx if m["role"] == "system"
         )
 
+    def test_build_context_trims_recent_by_tokens(self, tmp_path):
+        """Older recent messages that overrun the budget are left out; newest stays."""
+        mem = ConversationMemory(token_budget=100000, keep_recent=10, memory_dir=str(tmp_path))
+        mem.add("user", "paste: " + "a" * 40000)
+        mem.add("assistant", "got it")
+        mem.add("user", "now what?")
+        ctx = mem.build_context("next question", reserved_tokens=11000)
+        contents = [m["content"] for m in ctx if m["role"] != "system"]
+        assert contents == ["got it", "now what?"]
+
     def test_compression_trigger(self, tmp_path):
         """Exceeding token budget triggers compression."""
         mem = ConversationMemory(
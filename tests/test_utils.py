@@ -3,8 +3,21 @@
 from __future__ import annotations
 
 import json
+import os
+from unittest.mock import patch
 
-from grok_mccodin.utils import file_hash, index_folder, log_receipt, read_file_safe
+import pytest
+
+from grok_mccodin.utils import (
+    FolderIndex,
+    file_hash,
+    flush_receipts,
+    index_folder,
+    json_dumps,
+    json_loads,
+    log_receipt,
+    read_file_safe,
+)
 
 
 class TestIndexFolder:
@@ -23,6 +36,36 @@ class TestIndexFolder:
         idx = index_folder("/nonexistent/path")
         assert "not a directory" in idx
 
+    def test_unchanged_files_not_reread(self, tmp_project):
+        index_folder(tmp_project)
+        with patch("builtins.open", side_effect=AssertionError("re-read")):
+            assert "main.py (1 lines)" in index_folder(tmp_project)
+
+    def test_edited_file_recounted(self, tmp_project):
+        assert "utils.py (2 lines)" in index_folder(tmp_project)
+        (tmp_project / "utils.py").write_text("a = 1\nb = 2\nc = 3\nd = 4\n")
+        assert "utils.py (4 lines)" in index_folder(tmp_project)
+
+
+class TestFolderIndex:
+    def test_matches_index_folder(self, tmp_project):
+        assert FolderIndex(tmp_project).render() == index_folder(tmp_project)
+
+    def test_unchanged_dirs_not_relisted(self, tmp_project):
+        for d in (tmp_project, tmp_project / "src"):
+            os.utime(d, ns=(0, 0))
+        fi = FolderIndex(tmp_project)
+        first = fi.render()
+        with patch("os.scandir", side_effect=AssertionError("relisted")):
+            assert fi.render() == first
+
+    def test_new_file_picked_up(self, tmp_project):
+        os.utime(tmp_project, ns=(0, 0))
+        fi = FolderIndex(tmp_project)
+        assert "new.py" not in fi.render()
+        (tmp_project / "new.py").write_text("x = 1\n")
+        assert "new.py (1 lines)" in fi.render()
+
 
 class TestReadFileSafe:
     def test_reads_existing(self, tmp_project):
@@ -39,11 +82,25 @@ class TestReadFileSafe:
         content = read_file_safe(big, max_lines=10)
         assert "truncated" in content
 
+    def test_exact_line_count_not_truncated(self, tmp_path):
+        f = tmp_path / "ten.txt"
+        f.write_text("".join(f"line {i}\n" for i in range(10)))
+        assert read_file_safe(f, max_lines=10) == f.read_text()
+
+    def test_long_line_capped_by_chars(self, tmp_path):
+        f = tmp_path / "minified.js"
+        f.write_text("x" * 5000)
+        content = read_file_safe(f, max_chars=1024)
+        assert content.startswith("x" * 1024)
+        assert "x" * 1025 not in content
+        assert "file is 5000 bytes" in content
+
 
 class TestLogReceipt:
     def test_creates_log(self, tmp_path):
         log_file = tmp_path / "test_log.json"
         log_receipt(log_file, action="test_action", detail="some detail")
+        flush_receipts()
         data = json.loads(log_file.read_text())
         assert len(data) == 1
         assert data[0]["action"] == "test_action"
@@ -52,9 +109,34 @@ class TestLogReceipt:
         log_file = tmp_path / "test_log.json"
         log_receipt(log_file, action="first")
         log_receipt(log_file, action="second")
+        flush_receipts()
         data = json.loads(log_file.read_text())
         assert len(data) == 2
 
+    def test_burst_keeps_order(self, tmp_path):
+        log_file = tmp_path / "test_log.json"
+        for i in range(50):
+            log_receipt(log_file, action=f"a{i}")
+        flush_receipts()
+        data = json.loads(log_file.read_text())
+        assert [e["action"] for e in data] == [f"a{i}" for i in range(50)]
+
+    def test_non_list_log_is_replaced(self, tmp_path):
+        log_file = tmp_path / "test_log.json"
+        log_file.write_text('{"not": "a list"}')
+        log_receipt(log_file, action="first")
+        flush_receipts()
+        assert [e["action"] for e in json.loads(log_file.read_text())] == ["first"]
+
+    def test_writer_survives_unexpected_errors(self, tmp_path):
+        log_file = tmp_path / "test_log.json"
+        with patch("grok_mccodin.utils.json_dumps", side_effect=TypeError("boom")):
+            log_receipt(log_file, action="lost")
+            flush_receipts()
+        log_receipt(log_file, action="kept")
+        flush_receipts()  # would hang if the writer thread had died
+        assert [e["action"] for e in json.loads(log_file.read_text())] == ["kept"]
+
 
 class TestFileHash:
     def test_deterministic(self, tmp_project):
@@ -65,3 +147,23 @@ class TestFileHash:
 
     def test_different_files(self, tmp_project):
         assert file_hash(tmp_project / "main.py") != file_hash(tmp_project / "utils.py")
+
+
+class TestJSONHelpers:
+    def test_round_trip(self):
+        obj = {"b": [1, 2.5, None], "a": "caf\u00e9"}
+        raw = json_dumps(obj)
+        assert isinstance(raw, bytes)
+        assert json_loads(raw) == obj
+        assert json_loads(raw.decode("utf-8")) == obj
+
+    def test_sort_keys(self):
+        assert json_dumps({"b": 1, "a": 2}, sort_keys=True) == b'{"a":2,"b":1}'
+
+    def test_indent_matches_stdlib(self):
+        obj = [{"action": "edit", "detail": "a.py"}]
+        assert json_dumps(obj, indent=True).decode() == json.dumps(obj, indent=2)
+
+    def test_invalid_raises_value_error(self):
+        with pytest.raises(ValueError):
+            json_loads(b"{not json")